@@ -79,6 +79,8 @@ class CreateRunRequest(BaseModel):
     token: Optional[str] = Field(default=None, description="Authentication token")
     endpoint_filter: Optional[str] = Field(default=None, description="Filter to run specific endpoints")
     test_case_filter: Optional[List[str]] = Field(default=None, description="Specific test case IDs to run")
+    concurrent: bool = Field(default=False, description="Run independent test cases concurrently")
+    max_concurrency: int = Field(default=16, ge=1, description="Maximum concurrent requests when concurrent is set")
 
 
 class RunResults(BaseModel):
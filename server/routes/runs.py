@@ -39,12 +39,15 @@ async def execute_test_run(db_manager: DatabaseManager, service_id: str, run_id:
             service = db_manager.get_service(service_id)
             if service:
                 kat_service = KATIntegrationService(service_id, service["name"])
-                # Run tests using SequenceRunner
-                test_result = kat_service.run_tests(
+                # Run tests using SequenceRunner; off the event loop, the runner blocks
+                test_result = await asyncio.to_thread(
+                    kat_service.run_tests,
                     base_url=run_config.get("base_url", "https://api.example.com"),
                     token=run_config.get("token"),
                     endpoint_filter=run_config.get("endpoint_filter"),
-                    out_file_name=run_id
+                    out_file_name=run_id,
+                    concurrent=run_config.get("concurrent", False),
+                    max_concurrency=run_config.get("max_concurrency", 16),
                 )
                 
                 if test_result.get("success"):
@@ -105,7 +108,9 @@ async def create_run(request: Request, service_id: str, run_request: CreateRunRe
             "base_url": run_request.base_url,
             "token": run_request.token,
             "endpoint_filter": run_request.endpoint_filter,
-            "test_case_filter": run_request.test_case_filter
+            "test_case_filter": run_request.test_case_filter,
+            "concurrent": run_request.concurrent,
+            "max_concurrency": run_request.max_concurrency,
         }
         
         # Create run in database
@@ -251,8 +251,9 @@ class KATIntegrationService:
     
     def run_tests(self, base_url: str, token: Optional[str] = None,
                    
-                  endpoint_filter: Optional[str] = None, out_file_name: Optional[str] = None ) -> Dict[str, Any]:
-        """Run tests using SequenceRunner"""
+                  endpoint_filter: Optional[str] = None, out_file_name: Optional[str] = None,
+                  concurrent: bool = False, max_concurrency: int = 16) -> Dict[str, Any]:
+        """Run tests using SequenceRunner (or AsyncSequenceRunner when concurrent=True)"""
         if not KAT_AVAILABLE:
             raise Exception("KAT components not available")
         
@@ -265,14 +266,19 @@ class KATIntegrationService:
                 dc.WORKING_DIRECTORY = str(self.service_dir)
             
             # Create and configure SequenceRunner
-            from sequence_runner.runner import SequenceRunner
-            runner = SequenceRunner(
+            runner_kwargs = dict(
                 service_name=self.service_name,
                 base_url=base_url,
                 token=token,
                 endpoint=endpoint_filter,
                 out_file_name=out_file_name
             )
+            if concurrent:
+                from sequence_runner.async_runner import AsyncSequenceRunner
+                runner = AsyncSequenceRunner(max_concurrency=max_concurrency, **runner_kwargs)
+            else:
+                from sequence_runner.runner import SequenceRunner
+                runner = SequenceRunner(**runner_kwargs)
             
             # Run tests
             out_dir_name = runner.run_all()
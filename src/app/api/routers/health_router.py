@@ -1,6 +1,7 @@
 # app/api/routers/health_router.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
 from typing import Dict, Any, List
 import os
 from pathlib import Path
@@ -12,6 +13,8 @@ from application.services.constraint_service import ConstraintService
 from application.services.validation_script_service import ValidationScriptService
 from application.services.test_data_service import TestDataService
 from application.services.test_execution_service import TestExecutionService
+from common.cache.cache_factory import CacheFactory
+from common.cache.cache_metrics import collect_cache_metrics, render_prometheus
 from infra.di.container import (
     dataset_service_dependency,
     endpoint_service_dependency,
@@ -344,6 +347,43 @@ async def check_storage_health() -> Dict[str, Any]:
     }
 
 
+@router.get(
+    "/caches",
+    status_code=status.HTTP_200_OK,
+    summary="Cache metrics",
+    description="Per-cache hit ratio, latency histograms, evictions, bytes used and key counts.",
+)
+def cache_metrics() -> Dict[str, Any]:
+    """Report metrics of all shared cache instances (sync: runs in the threadpool)."""
+    caches = {}
+    for name, cache in CacheFactory.get_cache_instances().items():
+        try:
+            caches[name] = collect_cache_metrics(name, cache)
+        except Exception as e:
+            caches[name] = {"error": str(e)}
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "cache_count": len(caches),
+        "caches": caches,
+    }
+
+
+@router.get(
+    "/caches/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Cache metrics (Prometheus)",
+    description="Cache metrics in the Prometheus text exposition format.",
+    response_class=PlainTextResponse,
+)
+def cache_metrics_prometheus() -> PlainTextResponse:
+    """Export cache metrics for Prometheus scraping."""
+    return PlainTextResponse(
+        render_prometheus(CacheFactory.get_cache_instances()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @router.get(
     "/ready",
     status_code=status.HTTP_200_OK,
@@ -12,8 +12,12 @@ from common.cache import (
     CacheStatus,
     CacheStats,
     InMemoryCache,
+    ShardedInMemoryCache,
     RedisCache,
     FileCache,
+    SegmentCache,
+    TieredCache,
+    TieredCacheStats,
     CacheFactory,
     CacheType,
     cache_result,
@@ -34,8 +38,12 @@ __all__ = [
     "CacheStatus",
     "CacheStats",
     "InMemoryCache",
+    "ShardedInMemoryCache",
     "RedisCache",
     "FileCache",
+    "SegmentCache",
+    "TieredCache",
+    "TieredCacheStats",
     "CacheFactory",
     "CacheType",
     "cache_result",
@@ -3,9 +3,13 @@
 
 from common.cache.cache_interface import CacheInterface, CacheStatus, CacheStats
 from common.cache.in_memory_cache import InMemoryCache
+from common.cache.sharded_memory_cache import ShardedInMemoryCache
 from common.cache.redis_cache import RedisCache
 from common.cache.file_cache import FileCache
+from common.cache.segment_cache import SegmentCache
+from common.cache.tiered_cache import TieredCache, TieredCacheStats
 from common.cache.cache_factory import CacheFactory, CacheType
+from common.cache.cache_keys import stable_hash
 from common.cache.decorators import cache_result, cache_property, cached_method
 
 __all__ = [
@@ -13,11 +17,16 @@ __all__ = [
     "CacheStatus",
     "CacheStats",
     "InMemoryCache",
+    "ShardedInMemoryCache",
     "RedisCache",
     "FileCache",
+    "SegmentCache",
+    "TieredCache",
+    "TieredCacheStats",
     "CacheFactory",
     "CacheType",
     "cache_result",
     "cache_property",
     "cached_method",
+    "stable_hash",
 ]
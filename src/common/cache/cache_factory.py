@@ -5,8 +5,12 @@ from enum import Enum
 
 from common.cache.cache_interface import CacheInterface
 from common.cache.in_memory_cache import InMemoryCache
+from common.cache.sharded_memory_cache import ShardedInMemoryCache
 from common.cache.redis_cache import RedisCache
 from common.cache.file_cache import FileCache
+from common.cache.segment_cache import SegmentCache
+from common.cache.tiered_cache import TieredCache
+from common.cache.cache_metrics import instrument_cache
 from common.logger import LoggerFactory, LoggerType, LogLevel
 
 # Create logger for cache factory
@@ -21,6 +25,8 @@ class CacheType(Enum):
     MEMORY = "memory"
     REDIS = "redis"
     FILE = "file"
+    SEGMENT = "segment"
+    TIERED = "tiered"
 
 
 class CacheFactory:
@@ -55,6 +61,8 @@ class CacheFactory:
                 cls._instances[cache_key] = cls.create_cache(
                     name=name, cache_type=cache_type, **kwargs
                 )
+                # Shared instances are timed for the metrics endpoint
+                instrument_cache(cls._instances[cache_key])
                 logger.info(f"Created cache instance: {cache_key}")
             except Exception as e:
                 logger.error(f"Failed to create cache instance {cache_key}: {e}")
@@ -66,6 +74,7 @@ class CacheFactory:
                         cls._instances[cache_key] = cls.create_cache(
                             name=fallback_key, cache_type=CacheType.MEMORY
                         )
+                        instrument_cache(cls._instances[cache_key])
                         logger.info(f"Created fallback memory cache for {cache_key}")
                     except Exception as fallback_error:
                         logger.error(
@@ -106,6 +115,10 @@ class CacheFactory:
                 cache_instance = cls._create_redis_cache(**kwargs)
             elif cache_type == CacheType.FILE:
                 cache_instance = cls._create_file_cache(**kwargs)
+            elif cache_type == CacheType.SEGMENT:
+                cache_instance = cls._create_segment_cache(**kwargs)
+            elif cache_type == CacheType.TIERED:
+                cache_instance = cls._create_tiered_cache(**kwargs)
             else:
                 raise ValueError(f"Unknown cache type: {cache_type}")
 
@@ -118,7 +131,7 @@ class CacheFactory:
 
     @classmethod
     def _create_memory_cache(cls, **kwargs) -> InMemoryCache:
-        """Create in-memory cache with default parameters"""
+        """Create in-memory cache with default parameters (sharded if shards > 1)"""
         defaults = {
             "max_size": None,
             "default_ttl": None,
@@ -126,7 +139,10 @@ class CacheFactory:
             "enable_lru": True,
         }
         defaults.update(kwargs)
-        logger.debug(f"Creating memory cache with params: {defaults}")
+        shards = defaults.pop("shards", 1) or 1
+        logger.debug(f"Creating memory cache with params: {defaults}, shards={shards}")
+        if shards > 1:
+            return ShardedInMemoryCache(shards=shards, **defaults)
         return InMemoryCache(**defaults)
 
     @classmethod
@@ -157,6 +173,10 @@ class CacheFactory:
             "ssl_ca_certs",
             "ssl_check_hostname",
             "max_connections",
+            "max_bytes",
+            "eviction_samples",
+            "compress_threshold",
+            "compression_level",
         }
         params = {k: v for k, v in kwargs.items() if k in allowed}
 
@@ -189,6 +209,40 @@ class CacheFactory:
         logger.debug(f"Creating file cache with params: {defaults}")
         return FileCache(**defaults)
 
+    @classmethod
+    def _create_segment_cache(cls, **kwargs) -> SegmentCache:
+        """Create segment-log cache with default parameters"""
+        defaults = {
+            "cache_dir": ".cache/segments",
+            "serialization": "pickle",
+            "max_segment_bytes": 64 * 1024 * 1024,
+            "compaction_threshold": 0.5,
+            "cleanup_interval": 300,
+        }
+        defaults.update(kwargs)
+        logger.debug(f"Creating segment cache with params: {defaults}")
+        return SegmentCache(**defaults)
+
+    @classmethod
+    def _create_tiered_cache(cls, **kwargs) -> TieredCache:
+        """Create near (memory LRU) / far tiered cache with default parameters"""
+        near_max_size = kwargs.pop("near_max_size", 1024)
+        near_ttl = kwargs.pop("near_ttl", 300)
+        far_type = kwargs.pop("far_type", CacheType.FILE)
+        far_options = dict(kwargs.pop("far_options", None) or {})
+        if isinstance(far_type, str):
+            far_type = CacheType(far_type)
+        if far_type in (CacheType.MEMORY, CacheType.TIERED):
+            raise ValueError(f"Unsupported far tier for tiered cache: {far_type.value}")
+
+        near = cls._create_memory_cache(max_size=near_max_size, default_ttl=near_ttl)
+        far = cls.create_cache(name="tiered_far", cache_type=far_type, **far_options)
+        logger.debug(
+            f"Creating tiered cache: near max_size={near_max_size}, "
+            f"far={far_type.value}, options={kwargs}"
+        )
+        return TieredCache(near=near, far=far, near_ttl=near_ttl, **kwargs)
+
     @classmethod
     def create_memory_cache(
         cls,
@@ -196,6 +250,8 @@ class CacheFactory:
         default_ttl: Optional[int] = None,
         cleanup_interval: int = 60,
         enable_lru: bool = True,
+        shards: int = 1,
+        max_bytes: Optional[int] = None,
     ) -> InMemoryCache:
         """
         Create in-memory cache with specific parameters
@@ -205,15 +261,19 @@ class CacheFactory:
             default_ttl: Default TTL in seconds
             cleanup_interval: Cleanup interval in seconds
             enable_lru: Enable LRU eviction
+            shards: Number of lock-striped shards (> 1 returns a ShardedInMemoryCache)
+            max_bytes: Byte budget (None for unlimited, GDSF eviction when set)
 
         Returns:
-            InMemoryCache instance
+            InMemoryCache (or ShardedInMemoryCache) instance
         """
-        return InMemoryCache(
+        return cls._create_memory_cache(
             max_size=max_size,
             default_ttl=default_ttl,
             cleanup_interval=cleanup_interval,
             enable_lru=enable_lru,
+            shards=shards,
+            max_bytes=max_bytes,
         )
 
     @classmethod
@@ -262,6 +322,7 @@ class CacheFactory:
         cleanup_interval: int = 300,
         create_subdirs: bool = True,
         safe_filenames: bool = True,
+        max_bytes: Optional[int] = None,
     ) -> FileCache:
         """
         Create file cache with specific parameters
@@ -274,6 +335,7 @@ class CacheFactory:
             cleanup_interval: Cleanup interval in seconds
             create_subdirs: Create subdirectories
             safe_filenames: Use safe filenames
+            max_bytes: Disk byte budget (None for unlimited)
 
         Returns:
             FileCache instance
@@ -286,6 +348,73 @@ class CacheFactory:
             cleanup_interval=cleanup_interval,
             create_subdirs=create_subdirs,
             safe_filenames=safe_filenames,
+            max_bytes=max_bytes,
+        )
+
+    @classmethod
+    def create_segment_cache(
+        cls,
+        cache_dir: str = ".cache/segments",
+        serialization: str = "pickle",
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        compaction_threshold: float = 0.5,
+        cleanup_interval: int = 300,
+        max_bytes: Optional[int] = None,
+    ) -> SegmentCache:
+        """
+        Create append-only segment-log cache with specific parameters
+
+        Args:
+            cache_dir: Directory holding the segment files
+            serialization: Serialization method ("pickle" or "json")
+            max_segment_bytes: Size at which the active segment is sealed
+            compaction_threshold: Garbage ratio that triggers compaction of a segment
+            cleanup_interval: Expiry/compaction interval in seconds
+            max_bytes: Byte budget for live values
+
+        Returns:
+            SegmentCache instance
+        """
+        return SegmentCache(
+            cache_dir=cache_dir,
+            serialization=serialization,
+            max_segment_bytes=max_segment_bytes,
+            compaction_threshold=compaction_threshold,
+            cleanup_interval=cleanup_interval,
+            max_bytes=max_bytes,
+        )
+
+    @classmethod
+    def create_tiered_cache(
+        cls,
+        far_type: CacheType = CacheType.FILE,
+        far_options: Optional[Dict[str, Any]] = None,
+        near_max_size: int = 1024,
+        near_ttl: Optional[int] = 300,
+        write_mode: str = "write-through",
+        negative_ttl: int = 0,
+    ) -> TieredCache:
+        """
+        Create tiered cache with a small in-process LRU in front of a far tier
+
+        Args:
+            far_type: Far tier type (file, segment or Redis)
+            far_options: Constructor arguments for the far tier
+            near_max_size: Maximum entries in the near tier
+            near_ttl: Upper bound for TTL of near entries
+            write_mode: "write-through" or "write-behind"
+            negative_ttl: Seconds to remember far misses (0 disables)
+
+        Returns:
+            TieredCache instance
+        """
+        return cls._create_tiered_cache(
+            far_type=far_type,
+            far_options=far_options,
+            near_max_size=near_max_size,
+            near_ttl=near_ttl,
+            write_mode=write_mode,
+            negative_ttl=negative_ttl,
         )
 
     @classmethod
@@ -294,6 +423,11 @@ class CacheFactory:
         logger.info(f"Clearing {len(cls._instances)} cached instances")
         cls._instances.clear()
 
+    @classmethod
+    def get_cache_instances(cls) -> Dict[str, CacheInterface]:
+        """Get a snapshot of the cached (shared) instances by key"""
+        return dict(cls._instances)
+
     @classmethod
     def get_cache_instance_info(cls) -> Dict[str, str]:
         """Get information about cached instances"""
@@ -1,7 +1,7 @@
 # common/cache/cache_interface.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 from enum import Enum
 import time
 
@@ -27,6 +27,7 @@ class CacheStats:
         self.deletes = 0
         self.clears = 0
         self.expired = 0
+        self.evictions = 0
         self.start_time = time.time()
 
     def record_hit(self):
@@ -47,6 +48,9 @@ class CacheStats:
     def record_expired(self):
         self.expired += 1
 
+    def record_eviction(self):
+        self.evictions += 1
+
     def get_hit_rate(self) -> float:
         total = self.hits + self.misses
         return self.hits / total if total > 0 else 0.0
@@ -192,3 +196,62 @@ class CacheInterface(ABC):
             Dictionary with memory usage details
         """
         pass
+
+    def get_many(self, keys: List[str], default: Any = None) -> Dict[str, Any]:
+        """
+        Retrieve several values at once
+
+        Backends with a batch protocol (e.g. Redis pipelines) override this;
+        the default falls back to one get per key.
+
+        Args:
+            keys: Cache keys
+            default: Value used for keys that are not found
+
+        Returns:
+            Dictionary mapping every requested key to its value or default
+        """
+        return {key: self.get(key, default) for key in keys}
+
+    def get_many_with_ttl(self, keys: List[str], default: Any = None) -> Dict[str, Tuple[Any, Optional[int]]]:
+        """
+        Retrieve several values together with their remaining TTLs
+
+        Remote backends override this to fetch both in one round trip;
+        the default asks get_ttl only for keys that were found.
+
+        Args:
+            keys: Cache keys
+            default: Value used for keys that are not found
+
+        Returns:
+            Dictionary mapping every requested key to (value or default, TTL or None)
+        """
+        values = self.get_many(keys, default)
+        return {key: (value, None if value is default else self.get_ttl(key)) for key, value in values.items()}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Store several values at once
+
+        Args:
+            mapping: Key -> value pairs
+            ttl: Time to live in seconds for every key (None for default)
+
+        Returns:
+            True if all values were stored
+        """
+        results = [self.set(key, value, ttl) for key, value in mapping.items()]
+        return all(results)
+
+    def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys at once
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of keys that were deleted
+        """
+        return sum(1 for key in keys if self.delete(key))
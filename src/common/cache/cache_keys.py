@@ -0,0 +1,160 @@
+# common/cache/cache_keys.py
+
+import dataclasses
+import hashlib
+import json
+import threading
+import weakref
+from enum import Enum
+from typing import Any, Dict, Optional
+
+DIGEST_SIZE = 16
+
+
+class _FingerprintMemo:
+    """
+    Per-object fingerprint memo keyed by id(), dropped when the object dies.
+
+    Only objects that are not mutated after being hashed (endpoint schemas,
+    specs) should be memoized: a mutation is not noticed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[int, str] = {}
+
+    def get(self, obj: Any) -> Optional[str]:
+        return self._fingerprints.get(id(obj))
+
+    def put(self, obj: Any, fingerprint: str) -> None:
+        key = id(obj)
+        try:
+            weakref.finalize(obj, self._fingerprints.pop, key, None)
+        except TypeError:
+            return  # not weak-referenceable, cannot tell when the id is reused
+        with self._lock:
+            self._fingerprints[key] = fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fingerprints.clear()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+_memo = _FingerprintMemo()
+
+
+def _object_fields(obj: Any) -> Optional[Dict[str, Any]]:
+    """Field values of Pydantic models, dataclasses and plain objects"""
+    model_fields = getattr(type(obj), "model_fields", None)
+    if model_fields is not None and hasattr(obj, "__dict__"):
+        # Pydantic v2: read field values directly instead of model_dump()
+        fields = {name: obj.__dict__.get(name) for name in model_fields}
+        extra = getattr(obj, "__pydantic_extra__", None)
+        if extra:
+            fields.update(extra)
+        return fields
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if hasattr(obj, "__dict__") and not callable(obj):
+        return vars(obj)
+    return None
+
+
+def _make_default(memoize: bool):
+    def default(obj: Any) -> Any:
+        if isinstance(obj, (set, frozenset)):
+            return {"__set__": sorted(stable_hash(item) for item in obj)}
+        if isinstance(obj, Enum):
+            return {"__enum__": type(obj).__qualname__, "value": _canonical(obj.value)}
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            return {"__bytes__": bytes(obj).hex()}
+        fields = _object_fields(obj)
+        if fields is None:
+            return {"__str__": str(obj)}
+        # Objects are always folded in as their own fingerprint, so memoized
+        # and non-memoized calls produce the same key
+        fingerprint = _memo.get(obj) if memoize else None
+        if fingerprint is None:
+            fingerprint = _hash_text(
+                f"{type(obj).__module__}.{type(obj).__qualname__}\0"
+                + _encode(fields, memoize)
+            )
+            if memoize:
+                _memo.put(obj, fingerprint)
+        return {"__obj__": fingerprint}
+
+    return default
+
+
+def _encoder(memoize: bool) -> json.JSONEncoder:
+    # One-shot encode() of a compact, non-indented encoder runs in C
+    return json.JSONEncoder(
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_make_default(memoize),
+    )
+
+
+_ENCODERS = {False: _encoder(False), True: _encoder(True)}
+
+# Tags of the encoder's default hook and _canonical all start with this
+_TAG_PREFIX = "__"
+
+
+def _plain_keys(obj: dict) -> bool:
+    return all(type(k) is str and not k.startswith(_TAG_PREFIX) for k in obj)
+
+
+def _canonical(obj: Any) -> Any:
+    """
+    Make containers JSON-unambiguous before encoding.
+
+    JSON alone would map (1, 2) and [1, 2], or {1: "a"} and {"1": "a"}, to the
+    same text, and a user dict with a "__obj__" key would look like a tagged
+    object. Tuples are tagged, and dicts with non-str or "__"-prefixed keys
+    become a tagged list of [key, value] pairs, so no tag can come from data.
+    """
+    if isinstance(obj, dict):
+        if _plain_keys(obj):
+            return {k: _canonical(v) for k, v in obj.items()}
+        items = [[_canonical(k), _canonical(v)] for k, v in obj.items()]
+        items.sort(key=lambda item: _ENCODERS[False].encode(item[0]))
+        return {"__items__": items}
+    if isinstance(obj, list):
+        return [_canonical(item) for item in obj]
+    if isinstance(obj, tuple):
+        return {"__tuple__": [_canonical(item) for item in obj]}
+    return obj
+
+
+def _encode(obj: Any, memoize: bool) -> str:
+    return _ENCODERS[memoize].encode(_canonical(obj))
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=DIGEST_SIZE
+    ).hexdigest()
+
+
+def stable_hash(*parts: Any, memoize: bool = False) -> str:
+    """
+    Canonical blake2b hash of ``parts``, stable across processes and hosts.
+
+    Parts are canonicalized (tuples and non-str / reserved dict keys tagged)
+    and encoded by the C JSON encoder (sorted keys, compact separators);
+    models, dataclasses and objects are read field by field instead of
+    through model_dump() and folded in as their own fingerprint.
+    With ``memoize=True`` each object's fingerprint is computed once and
+    reused while the object is alive.
+    """
+    return _hash_text(_encode(list(parts), memoize))
+
+
+def clear_fingerprint_memo() -> None:
+    """Forget memoized object fingerprints"""
+    _memo.clear()
@@ -0,0 +1,200 @@
+# common/cache/cache_metrics.py
+
+import functools
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common.cache.cache_interface import CacheInterface
+
+# Upper bounds in seconds (Prometheus "le" buckets); +Inf is implicit
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+)
+
+INSTRUMENTED_OPS = ("get", "set", "get_many", "set_many")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Updates are plain integer increments without a lock: under heavy thread
+    contention a few observations may be lost, which is acceptable for
+    monitoring and keeps the hot path to one bisect and three additions.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf"""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((repr(bound), running))
+        result.append(("+Inf", running + self.counts[-1]))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Bucket upper bound containing quantile q (None if empty or above the last bucket)"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_seconds": self.sum,
+            "avg_seconds": self.sum / self.count if self.count else 0.0,
+            "p50_seconds": self.quantile(0.5),
+            "p99_seconds": self.quantile(0.99),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+def _timed(method: Callable, histogram: LatencyHistogram) -> Callable:
+    perf_counter = time.perf_counter
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            histogram.observe(perf_counter() - start)
+
+    return wrapper
+
+
+def instrument_cache(cache: CacheInterface) -> Dict[str, LatencyHistogram]:
+    """
+    Time get/set (and batch) calls of ``cache`` into per-operation histograms.
+
+    The bound methods are shadowed on the instance, so the cache keeps its
+    type and any backend-specific API. Idempotent.
+    """
+    histograms = getattr(cache, "_latency_histograms", None)
+    if histograms is not None:
+        return histograms
+    histograms = {}
+    for op in INSTRUMENTED_OPS:
+        method = getattr(cache, op, None)
+        if method is None:
+            continue
+        histograms[op] = LatencyHistogram()
+        setattr(cache, op, _timed(method, histograms[op]))
+    cache._latency_histograms = histograms
+    return histograms
+
+
+def collect_cache_metrics(name: str, cache: CacheInterface) -> Dict[str, Any]:
+    """Snapshot of one cache: counters, hit ratio, size, bytes and latencies"""
+    stats = cache.get_stats()
+    metrics: Dict[str, Any] = {
+        "cache_type": type(cache).__name__,
+        "hits": stats.hits,
+        "misses": stats.misses,
+        "hit_ratio": stats.get_hit_rate(),
+        "sets": stats.sets,
+        "deletes": stats.deletes,
+        "evictions": getattr(stats, "evictions", 0),
+        "expired": stats.expired,
+        "uptime_seconds": stats.get_uptime(),
+    }
+    if hasattr(stats, "to_dict"):
+        metrics["tier_stats"] = stats.to_dict()
+
+    try:
+        usage = cache.get_memory_usage()
+    except Exception as e:
+        usage = {"error": str(e)}
+    metrics["entries"] = usage.get("entry_count", usage.get("file_count"))
+    metrics["bytes"] = usage.get("total_bytes")
+    metrics["max_bytes"] = usage.get("max_bytes")
+    if "error" in usage:
+        metrics["error"] = usage["error"]
+
+    histograms = getattr(cache, "_latency_histograms", {})
+    metrics["latency"] = {op: h.to_dict() for op, h in histograms.items()}
+    return metrics
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(caches: Dict[str, CacheInterface]) -> str:
+    """Render cache metrics in the Prometheus text exposition format (0.0.4)"""
+    counters = (
+        ("hits", "Cache hits"),
+        ("misses", "Cache misses"),
+        ("sets", "Cache writes"),
+        ("deletes", "Cache deletes"),
+        ("evictions", "Entries evicted for capacity"),
+        ("expired", "Entries expired by TTL"),
+    )
+    gauges = (
+        ("hit_ratio", "Hits / (hits + misses)"),
+        ("entries", "Current number of entries"),
+        ("bytes", "Bytes used by cached values"),
+        ("max_bytes", "Configured byte budget"),
+    )
+
+    snapshots = {name: collect_cache_metrics(name, c) for name, c in caches.items()}
+    lines: List[str] = []
+
+    for field, help_text in counters:
+        metric = f"cache_{field}_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, snap in snapshots.items():
+            lines.append(f'{metric}{{cache="{_escape_label(name)}"}} {snap[field] or 0}')
+
+    for field, help_text in gauges:
+        metric = f"cache_{field}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, snap in snapshots.items():
+            if snap.get(field) is not None:
+                lines.append(f'{metric}{{cache="{_escape_label(name)}"}} {snap[field]}')
+
+    metric = "cache_operation_duration_seconds"
+    lines.append(f"# HELP {metric} Cache operation latency")
+    lines.append(f"# TYPE {metric} histogram")
+    for name, cache in caches.items():
+        label = _escape_label(name)
+        for op, histogram in getattr(cache, "_latency_histograms", {}).items():
+            for le, count in histogram.cumulative():
+                lines.append(f'{metric}_bucket{{cache="{label}",op="{op}",le="{le}"}} {count}')
+            lines.append(f'{metric}_sum{{cache="{label}",op="{op}"}} {histogram.sum}')
+            lines.append(f'{metric}_count{{cache="{label}",op="{op}"}} {histogram.count}')
+
+    return "\n".join(lines) + "\n"
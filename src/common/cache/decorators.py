@@ -1,13 +1,13 @@
 # common/cache/decorators.py
 
 import functools
-import hashlib
-import json
 import asyncio
-from typing import Any, Optional, Callable
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from common.cache.cache_interface import CacheInterface
 from common.cache.cache_factory import CacheFactory, CacheType
+from common.cache.cache_keys import stable_hash
 from common.logger import LoggerFactory, LoggerType, LogLevel
 
 # Create logger for cache decorators
@@ -15,6 +15,82 @@ logger = LoggerFactory.get_logger(
     name="cache-decorators", logger_type=LoggerType.STANDARD, level=LogLevel.DEBUG
 )
 
+# Suffix of the marker key that keeps a stale-while-revalidate result fresh
+_FRESH_SUFFIX = ":fresh"
+
+
+class _Call:
+    """One in-flight synchronous computation"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class _SingleFlight:
+    """
+    Coalesces concurrent computations of the same cache key.
+
+    Sync callers block on the leader's Event; async callers await one shared
+    Task per (event loop, key), shielded so a cancelled caller does not
+    cancel the computation for everyone else.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], "asyncio.Task"] = {}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls or any(k[1] == key for k in self._tasks)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def do_async(self, key: str, coro_fn: Callable[[], Awaitable]) -> "asyncio.Task":
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = loop.create_task(coro_fn())
+                self._tasks[flight_key] = task
+                task.add_done_callback(
+                    lambda t: self._forget_task(flight_key, t)
+                )
+        return task
+
+    def _forget_task(self, flight_key: Tuple[int, str], task: "asyncio.Task") -> None:
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
+
 
 def cache_result(
     cache: Optional[CacheInterface] = None,
@@ -26,12 +102,24 @@ def cache_result(
     exclude_kwargs: Optional[list] = None,
     cache_type: CacheType = CacheType.REDIS,
     cache_name: str = "decorator_cache",
+    single_flight: bool = True,
+    stale_while_revalidate: Optional[int] = None,
+    memoize_key_args: bool = False,
     **cache_kwargs,
 ):
     """
     Decorator to cache function results with TTL support and enhanced logging.
     Supports both sync and async functions.
+
+    single_flight: concurrent callers missing on the same key wait for one
+        in-flight computation instead of each calling the function.
+    stale_while_revalidate: seconds after ``ttl`` during which an expired
+        result is still returned while one background refresh recomputes it
+        (requires ``ttl``).
+    memoize_key_args: memoize the key fingerprint of model/object arguments
+        per object; only for arguments that are not mutated between calls.
     """
+    swr = stale_while_revalidate if ttl is not None else None
 
     def decorator(func: Callable) -> Callable:
         # Get or create cache instance
@@ -56,137 +144,141 @@ def cache_result(
                 )
                 logger.warning(f"Using memory cache fallback for {func.__name__}")
 
+        flights = _SingleFlight()
+
+        def make_key(args, kwargs) -> Optional[str]:
+            try:
+                return _generate_cache_key(
+                    func=func,
+                    args=args,
+                    kwargs=kwargs,
+                    key_prefix=key_prefix,
+                    include_args=include_args,
+                    include_kwargs=include_kwargs,
+                    exclude_args=exclude_args or [],
+                    exclude_kwargs=exclude_kwargs or [],
+                    memoize=memoize_key_args,
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate cache key for {func.__name__}: {e}")
+                return None
+
+        def lookup(cache_key: str) -> Tuple[Any, bool]:
+            """Return (cached value or None, is_stale)"""
+            # Stored for ttl + swr seconds next to a marker that lives for ttl,
+            # so one get_many tells value and freshness apart without a TTL
+            # query. Keeping freshness out of the value lets SWR results go
+            # through the backend serializer exactly like plain ones.
+            fresh_key = cache_key + _FRESH_SUFFIX
+            try:
+                if swr is None:
+                    return cache_instance.get(cache_key), False
+                found = cache_instance.get_many([cache_key, fresh_key])
+            except Exception as e:
+                logger.error(f"Cache get failed for {func.__name__}: {e}")
+                return None, False
+            cached = found.get(cache_key)
+            return cached, cached is not None and found.get(fresh_key) is None
+
+        def store(cache_key: str, result: Any) -> None:
+            try:
+                cache_success = cache_instance.set(
+                    cache_key, result, ttl + swr if swr is not None else ttl
+                )
+                if cache_success and swr is not None:
+                    cache_success = cache_instance.set(
+                        cache_key + _FRESH_SUFFIX, True, ttl
+                    )
+                if not cache_success:
+                    logger.warning(
+                        f"Failed to cache result for {func.__name__}: {cache_key}"
+                    )
+            except Exception as cache_error:
+                logger.error(f"Cache set failed for {func.__name__}: {cache_error}")
+
         # Check if function is async
         is_async = asyncio.iscoroutinefunction(func)
 
         if is_async:
 
-            @functools.wraps(func)
-            async def async_wrapper(*args, **kwargs):
-                # Generate cache key
+            async def compute_async(cache_key, args, kwargs):
                 try:
-                    cache_key = _generate_cache_key(
-                        func=func,
-                        args=args,
-                        kwargs=kwargs,
-                        key_prefix=key_prefix,
-                        include_args=include_args,
-                        include_kwargs=include_kwargs,
-                        exclude_args=exclude_args or [],
-                        exclude_kwargs=exclude_kwargs or [],
-                    )
-                    logger.debug(
-                        f"Generated cache key for {func.__name__}: {cache_key}"
-                    )
+                    result = await func(*args, **kwargs)
                 except Exception as e:
-                    logger.error(
-                        f"Failed to generate cache key for {func.__name__}: {e}"
-                    )
+                    logger.error(f"Function execution failed for {func.__name__}: {e}")
+                    raise
+                store(cache_key, result)
+                return result
+
+            def refresh_async(cache_key, args, kwargs) -> None:
+                task = flights.do_async(
+                    cache_key, lambda: compute_async(cache_key, args, kwargs)
+                )
+                # Nobody awaits a background refresh; retrieve its error here
+                task.add_done_callback(
+                    lambda t: t.cancelled() or t.exception()
+                )
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = make_key(args, kwargs)
+                if cache_key is None:
                     # Execute function without caching
                     return await func(*args, **kwargs)
 
-                # Try to get from cache
-                try:
-                    cached_result = cache_instance.get(cache_key)
-                    if cached_result is not None:
-                        logger.debug(f"Cache hit for {func.__name__}: {cache_key}")
-                        return cached_result
-                    else:
-                        logger.debug(f"Cache miss for {func.__name__}: {cache_key}")
-                except Exception as e:
-                    logger.error(f"Cache get failed for {func.__name__}: {e}")
-                    # Continue to execute function
+                cached_result, stale = lookup(cache_key)
+                if cached_result is not None:
+                    if stale:
+                        refresh_async(cache_key, args, kwargs)
+                    return cached_result
 
-                # Execute function and cache result
-                try:
-                    result = await func(*args, **kwargs)
+                if not single_flight:
+                    return await compute_async(cache_key, args, kwargs)
+                task = flights.do_async(
+                    cache_key, lambda: compute_async(cache_key, args, kwargs)
+                )
+                return await asyncio.shield(task)
 
-                    # Try to cache the result
-                    try:
-                        cache_success = cache_instance.set(cache_key, result, ttl)
-                        if cache_success:
-                            logger.debug(
-                                f"Cached result for {func.__name__}: {cache_key} (TTL: {ttl})"
-                            )
-                        else:
-                            logger.warning(
-                                f"Failed to cache result for {func.__name__}: {cache_key}"
-                            )
-                    except Exception as cache_error:
-                        logger.error(
-                            f"Cache set failed for {func.__name__}: {cache_error}"
-                        )
-
-                    return result
+            wrapper = async_wrapper
+        else:
 
+            def compute(cache_key, args, kwargs):
+                try:
+                    result = func(*args, **kwargs)
                 except Exception as e:
                     logger.error(f"Function execution failed for {func.__name__}: {e}")
                     raise
+                store(cache_key, result)
+                return result
 
-            wrapper = async_wrapper
-        else:
+            def refresh(cache_key, args, kwargs) -> None:
+                if flights.in_flight(cache_key):
+                    return
+
+                def run():
+                    try:
+                        flights.do(cache_key, lambda: compute(cache_key, args, kwargs))
+                    except Exception:
+                        pass  # already logged by compute
+
+                threading.Thread(target=run, daemon=True).start()
 
             @functools.wraps(func)
             def sync_wrapper(*args, **kwargs):
-                # Generate cache key
-                try:
-                    cache_key = _generate_cache_key(
-                        func=func,
-                        args=args,
-                        kwargs=kwargs,
-                        key_prefix=key_prefix,
-                        include_args=include_args,
-                        include_kwargs=include_kwargs,
-                        exclude_args=exclude_args or [],
-                        exclude_kwargs=exclude_kwargs or [],
-                    )
-                    logger.debug(
-                        f"Generated cache key for {func.__name__}: {cache_key}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to generate cache key for {func.__name__}: {e}"
-                    )
+                cache_key = make_key(args, kwargs)
+                if cache_key is None:
                     # Execute function without caching
                     return func(*args, **kwargs)
 
-                # Try to get from cache
-                try:
-                    cached_result = cache_instance.get(cache_key)
-                    if cached_result is not None:
-                        logger.debug(f"Cache hit for {func.__name__}: {cache_key}")
-                        return cached_result
-                    else:
-                        logger.debug(f"Cache miss for {func.__name__}: {cache_key}")
-                except Exception as e:
-                    logger.error(f"Cache get failed for {func.__name__}: {e}")
-                    # Continue to execute function
-
-                # Execute function and cache result
-                try:
-                    result = func(*args, **kwargs)
+                cached_result, stale = lookup(cache_key)
+                if cached_result is not None:
+                    if stale:
+                        refresh(cache_key, args, kwargs)
+                    return cached_result
 
-                    # Try to cache the result
-                    try:
-                        cache_success = cache_instance.set(cache_key, result, ttl)
-                        if cache_success:
-                            logger.debug(
-                                f"Cached result for {func.__name__}: {cache_key} (TTL: {ttl})"
-                            )
-                        else:
-                            logger.warning(
-                                f"Failed to cache result for {func.__name__}: {cache_key}"
-                            )
-                    except Exception as cache_error:
-                        logger.error(
-                            f"Cache set failed for {func.__name__}: {cache_error}"
-                        )
-
-                    return result
-
-                except Exception as e:
-                    logger.error(f"Function execution failed for {func.__name__}: {e}")
-                    raise
+                if not single_flight:
+                    return compute(cache_key, args, kwargs)
+                return flights.do(cache_key, lambda: compute(cache_key, args, kwargs))
 
             wrapper = sync_wrapper
 
@@ -214,7 +306,11 @@ def cache_result(
             """Get cache information for this function"""
             try:
                 prefix = f"{key_prefix}{func.__module__}.{func.__name__}"
-                keys = cache_instance.keys(f"{prefix}*")
+                keys = [
+                    key
+                    for key in cache_instance.keys(f"{prefix}*")
+                    if not key.endswith(_FRESH_SUFFIX)
+                ]
                 stats = cache_instance.get_stats()
                 info = {
                     "cached_entries": len(keys),
@@ -244,6 +340,7 @@ def cache_result(
                     exclude_kwargs=exclude_kwargs or [],
                 )
                 result = cache_instance.delete(cache_key)
+                cache_instance.delete(cache_key + _FRESH_SUFFIX)
                 logger.debug(
                     f"Invalidated cache for {func.__name__}: {cache_key} (success: {result})"
                 )
@@ -270,55 +367,20 @@ def _generate_cache_key(
     include_kwargs: bool,
     exclude_args: list,
     exclude_kwargs: list,
+    memoize: bool = False,
 ) -> str:
-    """Generate cache key from function and arguments"""
+    """Generate cache key ``{prefix}{module}.{name}:{digest}`` from function and arguments"""
 
-    key_parts = [key_prefix, func.__module__, func.__name__]
-
-    # Include positional arguments
+    filtered_args: list = []
     if include_args and args:
         filtered_args = [arg for i, arg in enumerate(args) if i not in exclude_args]
-        if filtered_args:
-            # Serialize args safely for key generation
-            args_str = _serialize_for_key(filtered_args)
-            key_parts.append(f"args:{args_str}")
 
-    # Include keyword arguments
+    filtered_kwargs: dict = {}
     if include_kwargs and kwargs:
         filtered_kwargs = {k: v for k, v in kwargs.items() if k not in exclude_kwargs}
-        if filtered_kwargs:
-            # Sort kwargs for consistent key generation
-            sorted_kwargs = dict(sorted(filtered_kwargs.items()))
-            kwargs_str = _serialize_for_key(sorted_kwargs)
-            key_parts.append(f"kwargs:{kwargs_str}")
-
-    # Create final key
-    key = "|".join(str(part) for part in key_parts if part)
-
-    # Hash the key if it's too long
-    if len(key) > 200:
-        key_hash = hashlib.md5(key.encode("utf-8")).hexdigest()
-        final_key = f"{key_prefix}hash:{key_hash}"
-        logger.debug(f"Generated hashed cache key (original too long): {final_key}")
-        return final_key
-
-    return key
-
-
-def _serialize_for_key(obj: Any) -> str:
-    """Serialize object for use in cache key"""
-    try:
-        # Handle Pydantic models
-        if hasattr(obj, "model_dump"):
-            return json.dumps(obj.model_dump(), sort_keys=True, default=str)
-        # Handle dict-like objects
-        elif hasattr(obj, "__dict__"):
-            return json.dumps(obj.__dict__, sort_keys=True, default=str)
-        # Try JSON serialization first (fastest and most readable)
-        return json.dumps(obj, sort_keys=True, default=str)
-    except (TypeError, ValueError):
-        # Fallback to string representation
-        return str(obj)
+
+    args_hash = stable_hash(filtered_args, filtered_kwargs, memoize=memoize)
+    return f"{key_prefix}{func.__module__}.{func.__name__}:{args_hash}"
 
 
 def cache_property(
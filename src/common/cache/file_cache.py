@@ -12,13 +12,16 @@ from pathlib import Path
 from typing import Any, Optional, Dict, List, Union
 
 from common.cache.cache_interface import CacheInterface, CacheStats
+from common.cache.file_cache_index import FileCacheIndex
+from common.cache.size_policy import GDSFPolicy
 
 
 class FileCacheEntry:
     """File cache entry with metadata"""
 
-    def __init__(self, value: Any, ttl: Optional[int] = None):
+    def __init__(self, value: Any, ttl: Optional[int] = None, key: Optional[str] = None):
         self.value = value
+        self.key = key
         self.created_at = time.time()
         self.ttl = ttl
         self.expires_at = self.created_at + ttl if ttl else None
@@ -39,6 +42,7 @@ class FileCacheEntry:
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
+            "key": self.key,
             "value": self.value,
             "created_at": self.created_at,
             "ttl": self.ttl,
@@ -50,6 +54,7 @@ class FileCacheEntry:
         """Create from dictionary"""
         entry = cls.__new__(cls)
         entry.value = data["value"]
+        entry.key = data.get("key")
         entry.created_at = data["created_at"]
         entry.ttl = data["ttl"]
         entry.expires_at = data["expires_at"]
@@ -57,7 +62,20 @@ class FileCacheEntry:
 
 
 class FileCache(CacheInterface):
-    """File-based cache implementation with TTL support"""
+    """
+    File-based cache implementation with TTL support.
+
+    Values live in one file per key; a SQLite metadata index in the cache
+    directory (key, path, size, expiry, last access) answers capacity,
+    expiry, size and keys() queries without globbing or reading files.
+    """
+
+    INDEX_FILENAME = "index.sqlite3"
+    # 2: key-less legacy files are adopted on lookup instead of indexed by path
+    INDEX_VERSION = 2
+    # Access times are buffered and written to the index in batches
+    TOUCH_FLUSH_INTERVAL = 1.0
+    TOUCH_BATCH_SIZE = 256
 
     def __init__(
         self,
@@ -68,6 +86,7 @@ class FileCache(CacheInterface):
         cleanup_interval: int = 300,  # 5 minutes
         create_subdirs: bool = True,
         safe_filenames: bool = True,
+        max_bytes: Optional[int] = None,
     ):
         """
         Initialize file cache
@@ -80,6 +99,8 @@ class FileCache(CacheInterface):
             cleanup_interval: Interval for cleanup expired files in seconds
             create_subdirs: Create subdirectories based on key hash
             safe_filenames: Use safe filenames (hash-based)
+            max_bytes: Disk byte budget (None for unlimited); when set, files
+                are evicted in GDSF order (recency, frequency and file size)
         """
         self.cache_dir = Path(cache_dir).resolve()
         self.serialization = serialization
@@ -87,6 +108,7 @@ class FileCache(CacheInterface):
         self.cleanup_interval = cleanup_interval
         self.create_subdirs = create_subdirs
         self.safe_filenames = safe_filenames
+        self.max_bytes = max_bytes
 
         # Determine file extension
         if file_extension is None:
@@ -100,9 +122,26 @@ class FileCache(CacheInterface):
 
         self._lock = threading.RLock()
         self._stats = CacheStats()
+        self._pending_touches: Dict[str, float] = {}
+        self._last_touch_flush = time.monotonic()
+        # Files from before keys were stored in entries; adopted on first lookup
+        self._legacy_files = 0
 
-        # Create cache directory
+        # Create cache directory and open the metadata index
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index = FileCacheIndex(self.cache_dir / self.INDEX_FILENAME)
+        if self._index.count() == 0:
+            self._rebuild_index()
+        elif self._index.get_meta("version") < self.INDEX_VERSION:
+            self._drop_path_keyed_rows()
+        self._index.set_meta("version", self.INDEX_VERSION)
+        self._legacy_files = self._index.get_meta("legacy_files")
+
+        # Size accounting for the byte budget, seeded from the index
+        self._policy = GDSFPolicy() if max_bytes else None
+        if self._policy is not None:
+            for key, size in self._index.sizes():
+                self._policy.admit(key, size)
 
         # Start cleanup thread
         self._cleanup_thread = threading.Thread(
@@ -115,29 +154,126 @@ class FileCache(CacheInterface):
         while True:
             try:
                 time.sleep(self.cleanup_interval)
+                with self._lock:
+                    self._flush_touches()
                 self._remove_expired_files()
             except Exception:
                 # Continue running even if cleanup fails
                 pass
 
+    def _list_files(self) -> List[str]:
+        """List all cache files on disk"""
+        pattern = (
+            f"**/*{self.file_extension}"
+            if self.create_subdirs
+            else f"*{self.file_extension}"
+        )
+        return glob.glob(str(self.cache_dir / pattern), recursive=True)
+
+    def _rebuild_index(self) -> None:
+        """
+        Index cache files written before the index existed (one-time scan).
+
+        Legacy files that do not store their key cannot be indexed here; they
+        are counted and adopted by the first lookup that resolves to their
+        path (see _adopt_legacy).
+        """
+        rows = []
+        for file_path in self._list_files():
+            entry = self._load_entry(file_path)
+            if entry is None:
+                continue
+            if entry.key is None:
+                self._legacy_files += 1
+                continue
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                continue
+            rows.append((entry.key, file_path, size, entry.created_at, entry.expires_at, time.time()))
+        if rows:
+            self._index.bulk_upsert(rows)
+        self._index.set_meta("legacy_files", self._legacy_files)
+
+    def _drop_path_keyed_rows(self) -> None:
+        """Forget legacy files that an older index version keyed by their path"""
+        stale = []
+        for key, file_path in self._index.entries():
+            try:
+                rel_path = Path(file_path).relative_to(self.cache_dir)
+            except ValueError:
+                continue
+            if key in (str(rel_path.with_suffix("")), rel_path.stem):
+                entry = self._load_entry(file_path)
+                if entry is not None and entry.key is None:
+                    stale.append(key)
+        self._index.remove_many(stale)
+        self._index.set_meta("legacy_files", self._index.get_meta("legacy_files") + len(stale))
+
+    def _adopt_legacy(self, key: str):
+        """Index a pre-index file for ``key`` found at its computed path"""
+        file_path = self._make_filename(key)
+        if not os.path.exists(file_path):
+            return None
+        entry = self._load_entry(file_path)
+        if entry is None or entry.key not in (None, key):
+            return None
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return None
+        self._index.upsert(key, file_path, size, entry.created_at, entry.expires_at)
+        if self._policy is not None:
+            self._policy.admit(key, size)
+        self._legacy_files = max(0, self._legacy_files - 1)
+        self._index.set_meta("legacy_files", self._legacy_files)
+        return self._index.get(key)
+
+    def _touch(self, key: str) -> None:
+        """Buffer an access time; flushed in batches to keep hits write-free"""
+        self._pending_touches[key] = time.time()
+        if (
+            len(self._pending_touches) >= self.TOUCH_BATCH_SIZE
+            or time.monotonic() - self._last_touch_flush >= self.TOUCH_FLUSH_INTERVAL
+        ):
+            self._flush_touches()
+
+    def _flush_touches(self) -> None:
+        if self._pending_touches:
+            self._index.touch_many(list(self._pending_touches.items()))
+            self._pending_touches.clear()
+        self._last_touch_flush = time.monotonic()
+
+    def _remove_file(self, key: str, file_path: Union[str, Path]) -> None:
+        """Remove a cache file together with its index and size accounting"""
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        self._index.remove(key)
+        if self._policy is not None:
+            self._policy.remove(key)
+
+    def _ensure_bytes(self, incoming_bytes: int, key: str) -> None:
+        """Evict files in GDSF order until the new file fits in max_bytes"""
+        if self._policy is None:
+            return
+        self._policy.remove(key)  # an overwrite replaces the old size
+        while self._policy.total_bytes + incoming_bytes > self.max_bytes:
+            victim = self._policy.pop_victim()
+            if victim is None:
+                break
+            row = self._index.get(victim)
+            if row is not None:
+                self._remove_file(victim, row.path)
+            self._stats.record_eviction()
+
     def _remove_expired_files(self):
-        """Remove expired cache files"""
+        """Remove expired cache files (index query, no file reads)"""
         with self._lock:
-            pattern = (
-                f"**/*{self.file_extension}"
-                if self.create_subdirs
-                else f"*{self.file_extension}"
-            )
-            cache_files = glob.glob(str(self.cache_dir / pattern), recursive=True)
-
-            for file_path in cache_files:
-                try:
-                    entry = self._load_entry(file_path)
-                    if entry and entry.is_expired():
-                        os.remove(file_path)
-                        self._stats.record_expired()
-                except Exception:
-                    continue
+            for key, file_path in self._index.expired(time.time()):
+                self._remove_file(key, file_path)
+                self._stats.record_expired()
 
     def _make_filename(self, key: str) -> str:
         """Generate filename from cache key"""
@@ -192,13 +328,20 @@ class FileCache(CacheInterface):
         except Exception:
             return None
 
-    def _save_entry(self, file_path: Path, entry: FileCacheEntry) -> bool:
-        """Save cache entry to file"""
+    def _save_entry(
+        self,
+        key: str,
+        file_path: Path,
+        entry: FileCacheEntry,
+        serialized_data: Optional[bytes] = None,
+    ) -> bool:
+        """Save cache entry to file and record it in the index"""
         try:
             # Create parent directory if needed
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            serialized_data = self._serialize_entry(entry)
+            if serialized_data is None:
+                serialized_data = self._serialize_entry(entry)
 
             # Atomic write using temporary file
             temp_path = file_path.with_suffix(f"{self.file_extension}.tmp")
@@ -207,56 +350,69 @@ class FileCache(CacheInterface):
 
             # Atomic rename
             temp_path.rename(file_path)
+
+            self._index.upsert(
+                key,
+                str(file_path),
+                len(serialized_data),
+                entry.created_at,
+                entry.expires_at,
+            )
+            if self._policy is not None:
+                self._policy.admit(key, len(serialized_data))
             return True
         except Exception:
             return False
 
-    def _ensure_capacity(self):
+    def _ensure_capacity(self, key: str):
         """Ensure cache doesn't exceed max_files"""
         if self.max_files is None:
             return
 
-        pattern = (
-            f"**/*{self.file_extension}"
-            if self.create_subdirs
-            else f"*{self.file_extension}"
-        )
-        cache_files = glob.glob(str(self.cache_dir / pattern), recursive=True)
-
-        if len(cache_files) >= self.max_files:
-            # Remove oldest files
-            cache_files.sort(key=lambda x: os.path.getmtime(x))
-            files_to_remove = cache_files[: len(cache_files) - self.max_files + 1]
-
-            for file_path in files_to_remove:
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    continue
+        if self._index.get(key) is not None:
+            return  # overwrite, file count unchanged
+
+        excess = self._index.count() - self.max_files + 1
+        if excess > 0:
+            self._flush_touches()  # LRU order must see buffered accesses
+            # Remove least recently used files
+            for old_key, file_path in self._index.least_recently_used(excess):
+                self._remove_file(old_key, file_path)
+                self._stats.record_eviction()
+
+    def _live_row(self, key: str):
+        """Index row for a non-expired key; expired entries are removed"""
+        row = self._index.get(key)
+        if row is None and self._legacy_files:
+            row = self._adopt_legacy(key)
+        if row is None:
+            return None
+        if row.is_expired():
+            self._remove_file(key, row.path)
+            self._stats.record_expired()
+            return None
+        return row
 
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve value from cache"""
         with self._lock:
-            file_path = self._get_file_path(key)
-
-            if not file_path.exists():
+            row = self._live_row(key)
+            if row is None:
                 self._stats.record_miss()
                 return default
 
-            entry = self._load_entry(file_path)
+            entry = self._load_entry(row.path)
             if entry is None:
+                # File vanished or is corrupt: drop the stale index row
+                self._index.remove(key)
+                if self._policy is not None:
+                    self._policy.remove(key)
                 self._stats.record_miss()
                 return default
 
-            if entry.is_expired():
-                try:
-                    file_path.unlink()
-                    self._stats.record_expired()
-                except Exception:
-                    pass
-                self._stats.record_miss()
-                return default
-
+            self._touch(key)
+            if self._policy is not None:
+                self._policy.touch(key)
             self._stats.record_hit()
             return entry.value
 
@@ -264,12 +420,19 @@ class FileCache(CacheInterface):
         """Store value in cache"""
         with self._lock:
             try:
-                self._ensure_capacity()
+                self._ensure_capacity(key)
 
                 file_path = self._get_file_path(key)
-                entry = FileCacheEntry(value, ttl)
+                entry = FileCacheEntry(value, ttl, key=key)
+
+                # Serialize first so the real on-disk size is known
+                data = self._serialize_entry(entry)
+                if self.max_bytes is not None:
+                    if len(data) > self.max_bytes:
+                        return False
+                    self._ensure_bytes(len(data), key)
 
-                if self._save_entry(file_path, entry):
+                if self._save_entry(key, file_path, entry, data):
                     self._stats.record_set()
                     return True
                 return False
@@ -279,34 +442,29 @@ class FileCache(CacheInterface):
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         with self._lock:
-            file_path = self._get_file_path(key)
-
-            if file_path.exists():
-                try:
-                    file_path.unlink()
-                    self._stats.record_delete()
-                    return True
-                except Exception:
-                    return False
-            return False
+            row = self._index.get(key)
+            if row is None:
+                return False
+            self._remove_file(key, row.path)
+            self._stats.record_delete()
+            return True
 
     def clear(self) -> bool:
         """Clear all cache entries"""
         with self._lock:
             try:
-                pattern = (
-                    f"**/*{self.file_extension}"
-                    if self.create_subdirs
-                    else f"*{self.file_extension}"
-                )
-                cache_files = glob.glob(str(self.cache_dir / pattern), recursive=True)
-
-                for file_path in cache_files:
+                for file_path in self._list_files():
                     try:
                         os.remove(file_path)
                     except Exception:
                         continue
 
+                self._index.clear()
+                self._pending_touches.clear()
+                self._legacy_files = 0
+                self._index.set_meta("legacy_files", 0)
+                if self._policy is not None:
+                    self._policy.clear()
                 self._stats.record_clear()
                 return True
             except Exception:
@@ -315,66 +473,12 @@ class FileCache(CacheInterface):
     def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         with self._lock:
-            file_path = self._get_file_path(key)
-
-            if not file_path.exists():
-                return False
-
-            entry = self._load_entry(file_path)
-            if entry is None:
-                return False
-
-            if entry.is_expired():
-                try:
-                    file_path.unlink()
-                    self._stats.record_expired()
-                except Exception:
-                    pass
-                return False
-
-            return True
+            return self._live_row(key) is not None
 
     def keys(self, pattern: Optional[str] = None) -> List[str]:
-        """Get list of cache keys"""
+        """Get list of original cache keys (glob-style pattern with * and ?)"""
         with self._lock:
-            # Remove expired files first
-            self._remove_expired_files()
-
-            cache_files = []
-            file_pattern = (
-                f"**/*{self.file_extension}"
-                if self.create_subdirs
-                else f"*{self.file_extension}"
-            )
-            cache_files = glob.glob(str(self.cache_dir / file_pattern), recursive=True)
-
-            # For safe filenames, we can't reverse the hash, so return file paths
-            if self.safe_filenames:
-                keys = []
-                for file_path in cache_files:
-                    # Try to load entry to verify it's valid
-                    entry = self._load_entry(file_path)
-                    if entry and not entry.is_expired():
-                        # Use relative path as key for hashed filenames
-                        rel_path = Path(file_path).relative_to(self.cache_dir)
-                        key = str(rel_path.with_suffix(""))
-                        keys.append(key)
-                return keys
-            else:
-                # Extract keys from filenames
-                keys = []
-                for file_path in cache_files:
-                    filename = Path(file_path).stem
-                    keys.append(filename)
-
-                if pattern is None:
-                    return keys
-
-                # Simple pattern matching
-                regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-                compiled_pattern = re.compile(regex_pattern)
-
-                return [key for key in keys if compiled_pattern.match(key)]
+            return self._index.keys(time.time(), pattern)
 
     def get_stats(self) -> CacheStats:
         """Get cache statistics"""
@@ -383,94 +487,47 @@ class FileCache(CacheInterface):
     def get_ttl(self, key: str) -> Optional[int]:
         """Get remaining TTL for a key"""
         with self._lock:
-            file_path = self._get_file_path(key)
-
-            if not file_path.exists():
-                return None
-
-            entry = self._load_entry(file_path)
-            if entry is None:
-                return None
-
-            if entry.is_expired():
-                try:
-                    file_path.unlink()
-                    self._stats.record_expired()
-                except Exception:
-                    pass
+            row = self._live_row(key)
+            if row is None or row.expires_at is None:
                 return None
-
-            return entry.get_remaining_ttl()
+            return max(0, int(row.expires_at - time.time()))
 
     def set_ttl(self, key: str, ttl: int) -> bool:
         """Set TTL for existing key"""
         with self._lock:
-            file_path = self._get_file_path(key)
-
-            if not file_path.exists():
+            row = self._live_row(key)
+            if row is None:
                 return False
 
-            entry = self._load_entry(file_path)
+            entry = self._load_entry(row.path)
             if entry is None:
                 return False
 
-            if entry.is_expired():
-                try:
-                    file_path.unlink()
-                    self._stats.record_expired()
-                except Exception:
-                    pass
-                return False
-
             # Create new entry with same value but new TTL
-            new_entry = FileCacheEntry(entry.value, ttl)
-            return self._save_entry(file_path, new_entry)
+            new_entry = FileCacheEntry(entry.value, ttl, key=key)
+            return self._save_entry(key, Path(row.path), new_entry)
 
     def get_size(self) -> int:
         """Get current cache size"""
         with self._lock:
-            pattern = (
-                f"**/*{self.file_extension}"
-                if self.create_subdirs
-                else f"*{self.file_extension}"
-            )
-            cache_files = glob.glob(str(self.cache_dir / pattern), recursive=True)
-
-            # Filter out expired files
-            valid_files = 0
-            for file_path in cache_files:
-                entry = self._load_entry(file_path)
-                if entry and not entry.is_expired():
-                    valid_files += 1
-
-            return valid_files
+            return self._index.count(time.time())
 
     def get_memory_usage(self) -> Dict[str, Any]:
         """Get disk usage information"""
         with self._lock:
-            total_size = 0
-            file_count = 0
-
-            pattern = (
-                f"**/*{self.file_extension}"
-                if self.create_subdirs
-                else f"*{self.file_extension}"
-            )
-            cache_files = glob.glob(str(self.cache_dir / pattern), recursive=True)
-
-            for file_path in cache_files:
-                try:
-                    file_stat = os.stat(file_path)
-                    total_size += file_stat.st_size
-                    file_count += 1
-                except Exception:
-                    continue
+            total_size = self._index.total_bytes()
+            file_count = self._index.count()
 
             return {
                 "total_bytes": total_size,
                 "total_mb": total_size / (1024 * 1024),
                 "file_count": file_count,
+                "unindexed_legacy_files": self._legacy_files,
                 "cache_dir": str(self.cache_dir),
                 "max_files": self.max_files,
                 "utilization": file_count / self.max_files if self.max_files else 0,
+                "max_bytes": self.max_bytes,
+                "byte_utilization": total_size / self.max_bytes if self.max_bytes else 0,
+                "eviction_policy": "gdsf" if self._policy is not None else "lru",
+                "evictions": self._stats.evictions,
             }
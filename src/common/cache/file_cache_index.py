@@ -0,0 +1,187 @@
+# common/cache/file_cache_index.py
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+class IndexRow:
+    """Metadata for one cache file"""
+
+    __slots__ = ("key", "path", "size", "created_at", "expires_at", "last_access")
+
+    def __init__(self, key, path, size, created_at, expires_at, last_access):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.last_access = last_access
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return (now or time.time()) > self.expires_at
+
+
+class FileCacheIndex:
+    """
+    Persistent SQLite metadata index for FileCache.
+
+    Holds key -> (path, size, created_at, expires_at, last_access) so capacity
+    checks, expiry and key listing are queries instead of directory globs and
+    file reads. WAL mode lets several processes share one cache directory.
+    """
+
+    _COLUMNS = "key, path, size, created_at, expires_at, last_access"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def _exec(self, sql: str, params: Iterable = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).rowcount
+
+    def _exec_many(self, sql: str, rows: Iterable) -> None:
+        """Run one statement per row in a single transaction, rolled back on failure"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(sql, rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def upsert(
+        self,
+        key: str,
+        path: str,
+        size: int,
+        created_at: float,
+        expires_at: Optional[float],
+    ) -> None:
+        self._exec(
+            f"INSERT OR REPLACE INTO entries ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, path, size, created_at, expires_at, time.time()),
+        )
+
+    def bulk_upsert(self, rows: List[Tuple]) -> None:
+        self._exec_many(
+            f"INSERT OR REPLACE INTO entries ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def get(self, key: str) -> Optional[IndexRow]:
+        rows = self._query(f"SELECT {self._COLUMNS} FROM entries WHERE key = ?", (key,))
+        return IndexRow(*rows[0]) if rows else None
+
+    def touch(self, key: str) -> None:
+        self._exec("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+
+    def touch_many(self, accesses: List[Tuple[str, float]]) -> None:
+        """Record several (key, last_access) pairs in one transaction"""
+        if not accesses:
+            return
+        self._exec_many(
+            "UPDATE entries SET last_access = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in accesses],
+        )
+
+    def remove(self, key: str) -> bool:
+        return self._exec("DELETE FROM entries WHERE key = ?", (key,)) > 0
+
+    def remove_many(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        self._exec_many("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+
+    def clear(self) -> None:
+        self._exec("DELETE FROM entries")
+
+    def expired(self, now: float) -> List[Tuple[str, str]]:
+        return self._query(
+            "SELECT key, path FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (now,),
+        )
+
+    def least_recently_used(self, limit: int) -> List[Tuple[str, str]]:
+        return self._query(
+            "SELECT key, path FROM entries ORDER BY last_access ASC LIMIT ?", (limit,)
+        )
+
+    def count(self, now: Optional[float] = None) -> int:
+        if now is None:
+            return self._query("SELECT COUNT(*) FROM entries")[0][0]
+        return self._query(
+            "SELECT COUNT(*) FROM entries WHERE expires_at IS NULL OR expires_at >= ?",
+            (now,),
+        )[0][0]
+
+    def total_bytes(self) -> int:
+        return self._query("SELECT COALESCE(SUM(size), 0) FROM entries")[0][0]
+
+    def keys(self, now: float, pattern: Optional[str] = None) -> List[str]:
+        """Live keys, optionally filtered by a glob pattern (* and ?)"""
+        sql = "SELECT key FROM entries WHERE (expires_at IS NULL OR expires_at >= ?)"
+        params: List = [now]
+        if pattern is not None:
+            sql += " AND key GLOB ?"
+            params.append(pattern)
+        return [row[0] for row in self._query(sql, params)]
+
+    def sizes(self) -> List[Tuple[str, int]]:
+        return self._query("SELECT key, size FROM entries ORDER BY last_access ASC")
+
+    def set_expiry(self, key: str, expires_at: Optional[float], size: int) -> None:
+        self._exec(
+            "UPDATE entries SET expires_at = ?, size = ?, last_access = ? WHERE key = ?",
+            (expires_at, size, time.time(), key),
+        )
+
+    def get_meta(self, name: str, default: int = 0) -> int:
+        rows = self._query("SELECT value FROM meta WHERE name = ?", (name,))
+        return rows[0][0] if rows else default
+
+    def set_meta(self, name: str, value: int) -> None:
+        self._exec("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def entries(self) -> List[Tuple[str, str]]:
+        return self._query("SELECT key, path FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -8,13 +8,15 @@ from typing import Any, Optional, Dict, List
 from collections import OrderedDict
 
 from common.cache.cache_interface import CacheInterface, CacheStats
+from common.cache.size_policy import GDSFPolicy, estimate_size
 
 
 class CacheEntry:
     """Internal cache entry with TTL support"""
 
-    def __init__(self, value: Any, ttl: Optional[int] = None):
+    def __init__(self, value: Any, ttl: Optional[int] = None, size: int = 0):
         self.value = value
+        self.size = size
         self.created_at = time.time()
         self.ttl = ttl
         self.expires_at = self.created_at + ttl if ttl else None
@@ -42,6 +44,7 @@ class InMemoryCache(CacheInterface):
         default_ttl: Optional[int] = None,
         cleanup_interval: int = 60,
         enable_lru: bool = True,
+        max_bytes: Optional[int] = None,
     ):
         """
         Initialize in-memory cache
@@ -51,16 +54,21 @@ class InMemoryCache(CacheInterface):
             default_ttl: Default TTL in seconds (None for no expiration)
             cleanup_interval: Interval for cleanup expired entries in seconds
             enable_lru: Enable LRU eviction when max_size is reached
+            max_bytes: Byte budget (None for unlimited); when set, eviction
+                follows GDSF (recency, frequency and entry size)
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
         self.cleanup_interval = cleanup_interval
         self.enable_lru = enable_lru
+        self.max_bytes = max_bytes
 
         # Use OrderedDict for LRU support
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._lock = threading.RLock()
         self._stats = CacheStats()
+        self._bytes = 0
+        self._policy = GDSFPolicy() if max_bytes else None
 
         # Start cleanup thread
         self._cleanup_thread = threading.Thread(
@@ -87,31 +95,54 @@ class InMemoryCache(CacheInterface):
                     expired_keys.append(key)
 
             for key in expired_keys:
-                del self._cache[key]
+                self._drop(key)
                 self._stats.record_expired()
 
-    def _evict_lru(self):
-        """Evict least recently used entry"""
-        if self._cache:
-            self._cache.popitem(last=False)  # Remove first (oldest) item
-
-    def _evict_lru(self):
-        """Evict least recently used entry"""
-        if self._cache:
-            self._cache.popitem(last=False)  # Remove first (oldest) item
-
-    def _ensure_capacity(self):
-        """Ensure cache doesn't exceed max_size"""
-        if self.max_size is None:
+    def _drop(self, key: str) -> Optional[CacheEntry]:
+        """Remove an entry and its size accounting"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            if self._policy is not None:
+                self._policy.remove(key)
+        return entry
+
+    def _evict_one(self):
+        """Evict one entry: GDSF victim under a byte budget, else least recently used"""
+        if not self._cache:
             return
-
-        while len(self._cache) >= self.max_size:
-            if self.enable_lru:
-                self._evict_lru()
-            else:
-                # Remove oldest entry
-                if self._cache:
-                    self._cache.popitem(last=False)
+        if self._policy is not None:
+            while True:
+                key = self._policy.pop_victim()
+                if key is None:
+                    break
+                # The policy still tracks a key being overwritten; skip it
+                entry = self._cache.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry.size
+                    self._stats.record_eviction()
+                    return
+        key, entry = self._cache.popitem(last=False)  # Remove first (oldest) item
+        self._bytes -= entry.size
+        if self._policy is not None:
+            self._policy.remove(key)
+        self._stats.record_eviction()
+
+    def _entry_size(self, key: str, value: Any) -> int:
+        """Deep estimate under a byte budget, shallow size otherwise"""
+        if self.max_bytes is None:
+            return sys.getsizeof(key) + sys.getsizeof(value)
+        return sys.getsizeof(key) + estimate_size(value)
+
+    def _ensure_capacity(self, incoming_bytes: int = 0, new_key: bool = True):
+        """Ensure cache doesn't exceed max_size / max_bytes after adding an entry"""
+        if self.max_size is not None and new_key:
+            while self._cache and len(self._cache) >= self.max_size:
+                self._evict_one()
+
+        if self.max_bytes is not None:
+            while self._cache and self._bytes + incoming_bytes > self.max_bytes:
+                self._evict_one()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve value from cache"""
@@ -123,7 +154,7 @@ class InMemoryCache(CacheInterface):
                 return default
 
             if entry.is_expired():
-                del self._cache[key]
+                self._drop(key)
                 self._stats.record_expired()
                 self._stats.record_miss()
                 return default
@@ -131,6 +162,8 @@ class InMemoryCache(CacheInterface):
             # Move to end for LRU
             if self.enable_lru:
                 self._cache.move_to_end(key)
+            if self._policy is not None:
+                self._policy.touch(key)
 
             self._stats.record_hit()
             return entry.value
@@ -142,13 +175,23 @@ class InMemoryCache(CacheInterface):
                 # Use provided TTL or default TTL
                 effective_ttl = ttl if ttl is not None else self.default_ttl
 
+                # Measure once at set time; reject entries larger than the budget
+                size = self._entry_size(key, value)
+                if self.max_bytes is not None and size > self.max_bytes:
+                    return False
+
                 # Ensure capacity before adding new entry
-                if key not in self._cache:
-                    self._ensure_capacity()
+                old = self._cache.pop(key, None)
+                if old is not None:
+                    self._bytes -= old.size
+                self._ensure_capacity(size, new_key=old is None)
 
                 # Create cache entry
-                entry = CacheEntry(value, effective_ttl)
+                entry = CacheEntry(value, effective_ttl, size)
                 self._cache[key] = entry
+                self._bytes += size
+                if self._policy is not None:
+                    self._policy.admit(key, size)
 
                 # Move to end for LRU
                 if self.enable_lru:
@@ -163,7 +206,7 @@ class InMemoryCache(CacheInterface):
         """Delete key from cache"""
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._drop(key)
                 self._stats.record_delete()
                 return True
             return False
@@ -173,6 +216,9 @@ class InMemoryCache(CacheInterface):
         try:
             with self._lock:
                 self._cache.clear()
+                self._bytes = 0
+                if self._policy is not None:
+                    self._policy.clear()
                 self._stats.record_clear()
                 return True
         except Exception:
@@ -186,7 +232,7 @@ class InMemoryCache(CacheInterface):
                 return False
 
             if entry.is_expired():
-                del self._cache[key]
+                self._drop(key)
                 self._stats.record_expired()
                 return False
 
@@ -221,7 +267,7 @@ class InMemoryCache(CacheInterface):
                 return None
 
             if entry.is_expired():
-                del self._cache[key]
+                self._drop(key)
                 self._stats.record_expired()
                 return None
 
@@ -235,12 +281,12 @@ class InMemoryCache(CacheInterface):
                 return False
 
             if entry.is_expired():
-                del self._cache[key]
+                self._drop(key)
                 self._stats.record_expired()
                 return False
 
             # Create new entry with same value but new TTL
-            new_entry = CacheEntry(entry.value, ttl)
+            new_entry = CacheEntry(entry.value, ttl, entry.size)
             self._cache[key] = new_entry
 
             if self.enable_lru:
@@ -257,13 +303,8 @@ class InMemoryCache(CacheInterface):
     def get_memory_usage(self) -> Dict[str, Any]:
         """Get memory usage information"""
         with self._lock:
-            total_size = 0
-            for key, entry in self._cache.items():
-                # Rough estimation of memory usage
-                key_size = sys.getsizeof(key)
-                value_size = sys.getsizeof(entry.value)
-                entry_overhead = sys.getsizeof(entry)
-                total_size += key_size + value_size + entry_overhead
+            # Entry sizes are measured at set time, so this is O(1)
+            total_size = self._bytes
 
             return {
                 "total_bytes": total_size,
@@ -271,4 +312,8 @@ class InMemoryCache(CacheInterface):
                 "entry_count": len(self._cache),
                 "max_size": self.max_size,
                 "utilization": len(self._cache) / self.max_size if self.max_size else 0,
+                "max_bytes": self.max_bytes,
+                "byte_utilization": total_size / self.max_bytes if self.max_bytes else 0,
+                "eviction_policy": "gdsf" if self._policy is not None else "lru",
+                "evictions": self._stats.evictions,
             }
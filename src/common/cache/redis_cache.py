@@ -2,8 +2,8 @@
 
 import json
 import pickle
-import time
-from typing import Any, Optional, Dict, List
+import zlib
+from typing import Any, Optional, Dict, List, Tuple
 
 from common.cache.cache_interface import CacheInterface, CacheStats
 from common.logger import LoggerFactory, LoggerType, LogLevel
@@ -27,6 +27,67 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis library is not available. Install with: pip install redis")
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+SERIALIZATIONS = ("json", "pickle", "orjson", "msgpack")
+
+# Marks zlib-compressed payloads; cannot start a valid json/pickle/msgpack value
+_COMPRESSED_MAGIC = b"\x00zlib\x00"
+
+# Keys per SCAN/UNLINK round trip
+_SCAN_COUNT = 1000
+
+# Byte-budget bookkeeping runs server-side so reading a key's old size and
+# adjusting the shared total cannot interleave with another client.
+# KEYS: sizes hash, bytes counter, data keys...; ARGV: ttl ("" for none), values...
+_STORE_LUA = """
+local ttl = tonumber(ARGV[1])
+local delta = 0
+for i = 3, #KEYS do
+    local data = ARGV[i - 1]
+    if ttl then
+        redis.call('SET', KEYS[i], data, 'EX', ttl)
+    else
+        redis.call('SET', KEYS[i], data)
+    end
+    local old = tonumber(redis.call('HGET', KEYS[1], KEYS[i]) or 0)
+    redis.call('HSET', KEYS[1], KEYS[i], #data)
+    delta = delta + #data - old
+end
+redis.call('INCRBY', KEYS[2], delta)
+return #KEYS - 2
+"""
+
+# KEYS: sizes hash, bytes counter, data keys...; ARGV[1]: "1" to only forget
+# size records of keys that no longer exist. Returns {deleted, freed bytes}.
+_DELETE_LUA = """
+local only_missing = ARGV[1] == '1'
+local deleted, freed = 0, 0
+for i = 3, #KEYS do
+    if not only_missing or redis.call('EXISTS', KEYS[i]) == 0 then
+        if not only_missing then
+            deleted = deleted + redis.call('DEL', KEYS[i])
+        end
+        freed = freed + tonumber(redis.call('HGET', KEYS[1], KEYS[i]) or 0)
+        redis.call('HDEL', KEYS[1], KEYS[i])
+    end
+end
+redis.call('DECRBY', KEYS[2], freed)
+return {deleted, freed}
+"""
+
 
 class RedisCache(CacheInterface):
     """Redis-based cache implementation with comprehensive logging"""
@@ -54,8 +115,12 @@ class RedisCache(CacheInterface):
         ssl_ca_certs: Optional[str] = None,
         ssl_check_hostname: bool = False,
         max_connections: Optional[int] = None,
-        serialization: str = "json",  # "json" or "pickle"
+        serialization: str = "json",  # "json", "pickle", "orjson" or "msgpack"
         key_prefix: str = "",
+        max_bytes: Optional[int] = None,
+        eviction_samples: int = 16,
+        compress_threshold: Optional[int] = None,
+        compression_level: int = 1,
     ):
         """
         Initialize Redis cache
@@ -65,16 +130,38 @@ class RedisCache(CacheInterface):
             port: Redis server port
             db: Redis database number
             password: Redis password
-            serialization: Serialization method ("json" or "pickle")
+            serialization: Serialization method ("json", "pickle", "orjson" or
+                "msgpack"); orjson/msgpack need their optional packages
             key_prefix: Prefix for all cache keys
+            max_bytes: Byte budget for values stored under key_prefix (None for
+                unlimited). Sizes are tracked in Redis so the budget is shared
+                by all clients; eviction samples keys and drops the one with
+                the largest idle time x size.
+            eviction_samples: Number of keys sampled per eviction round
+            compress_threshold: zlib-compress serialized values of at least this
+                many bytes (None disables compression)
+            compression_level: zlib compression level
             **kwargs: Additional Redis connection parameters
         """
         if not REDIS_AVAILABLE:
             logger.error("Redis is not available. Install with: pip install redis")
             raise ImportError("Redis is not available. Install with: pip install redis")
 
+        if serialization not in SERIALIZATIONS:
+            raise ValueError(f"Unsupported serialization: {serialization}")
+        if serialization == "orjson" and not ORJSON_AVAILABLE:
+            raise ImportError("orjson is not available. Install with: pip install orjson")
+        if serialization == "msgpack" and not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack is not available. Install with: pip install msgpack")
+
         self.key_prefix = key_prefix
         self.serialization = serialization
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+        self.max_bytes = max_bytes
+        self.eviction_samples = eviction_samples
+        self._sizes_key = f"{key_prefix}__cache_meta__:sizes"
+        self._bytes_key = f"{key_prefix}__cache_meta__:bytes"
         self._stats = CacheStats()
         self._connection_info = {"host": host, "port": port, "db": db}
 
@@ -111,6 +198,8 @@ class RedisCache(CacheInterface):
         try:
             logger.debug(f"Creating Redis connection with params: {redis_params}")
             self.redis_client = redis.Redis(**redis_params)
+            self._store_script = self.redis_client.register_script(_STORE_LUA)
+            self._delete_script = self.redis_client.register_script(_DELETE_LUA)
 
             # Test connection
             ping_result = self.redis_client.ping()
@@ -136,33 +225,36 @@ class RedisCache(CacheInterface):
 
     def _make_key(self, key: str) -> str:
         """Add prefix to key"""
-        prefixed_key = f"{self.key_prefix}{key}" if self.key_prefix else key
-        logger.debug(f"Generated cache key: {prefixed_key}")
-        return prefixed_key
+        return f"{self.key_prefix}{key}" if self.key_prefix else key
+
+    @staticmethod
+    def _to_plain(value: Any) -> Any:
+        """Convert Pydantic models / objects to plain data for text codecs"""
+        if hasattr(value, "model_dump"):
+            return value.model_dump()
+        if hasattr(value, "__dict__"):
+            return value.__dict__
+        return value
 
     def _serialize(self, value: Any) -> bytes:
-        """Serialize value for storage"""
+        """Serialize (and compress above compress_threshold) value for storage"""
         try:
             if self.serialization == "json":
-                # Handle Pydantic models
-                if hasattr(value, "model_dump"):
-                    serialized_data = value.model_dump()
-                elif hasattr(value, "__dict__"):
-                    serialized_data = value.__dict__
-                else:
-                    serialized_data = value
-
-                serialized = json.dumps(serialized_data, default=str).encode("utf-8")
-                logger.debug(f"JSON serialized value of size: {len(serialized)} bytes")
-                return serialized
-            elif self.serialization == "pickle":
-                serialized = pickle.dumps(value)
-                logger.debug(
-                    f"Pickle serialized value of size: {len(serialized)} bytes"
+                data = json.dumps(self._to_plain(value), default=str).encode("utf-8")
+            elif self.serialization == "orjson":
+                data = orjson.dumps(
+                    self._to_plain(value),
+                    default=str,
+                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
                 )
-                return serialized
+            elif self.serialization == "msgpack":
+                data = msgpack.packb(self._to_plain(value), default=str, use_bin_type=True)
             else:
-                raise ValueError(f"Unsupported serialization: {self.serialization}")
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+            if self.compress_threshold is not None and len(data) >= self.compress_threshold:
+                data = _COMPRESSED_MAGIC + zlib.compress(data, self.compression_level)
+            return data
         except Exception as e:
             logger.error(f"Serialization failed: {e}")
             raise
@@ -170,37 +262,117 @@ class RedisCache(CacheInterface):
     def _deserialize(self, data: bytes) -> Any:
         """Deserialize value from storage"""
         try:
+            if data.startswith(_COMPRESSED_MAGIC):
+                data = zlib.decompress(data[len(_COMPRESSED_MAGIC):])
             if self.serialization == "json":
-                result = json.loads(data.decode("utf-8"))
-                logger.debug(f"JSON deserialized value from {len(data)} bytes")
-                return result
-            elif self.serialization == "pickle":
-                result = pickle.loads(data)
-                logger.debug(f"Pickle deserialized value from {len(data)} bytes")
-                return result
-            else:
-                raise ValueError(f"Unsupported serialization: {self.serialization}")
+                return json.loads(data.decode("utf-8"))
+            if self.serialization == "orjson":
+                return orjson.loads(data)
+            if self.serialization == "msgpack":
+                return msgpack.unpackb(data, raw=False, strict_map_key=False)
+            return pickle.loads(data)
         except Exception as e:
             logger.error(f"Deserialization failed: {e}")
             raise
 
+    def _scan(self, pattern: str) -> List[bytes]:
+        """Collect keys matching pattern with incremental SCAN (non-blocking)"""
+        return list(self.redis_client.scan_iter(match=pattern, count=_SCAN_COUNT))
+
+    def _store_pipelined(
+        self, items: List[Tuple[str, bytes]], ttl: Optional[int]
+    ) -> List[bool]:
+        """Write serialized items (prefixed keys) in one round trip"""
+        if self.max_bytes is not None:
+            stored = self._store_script(
+                keys=[self._sizes_key, self._bytes_key]
+                + [redis_key for redis_key, _ in items],
+                args=["" if ttl is None else ttl] + [data for _, data in items],
+            )
+            self._evict_for_budget()
+            return [True] * int(stored)
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        if ttl is None:
+            pipe.mset(dict(items))
+        else:
+            for redis_key, data in items:
+                pipe.set(redis_key, data, ex=ttl)
+        results = pipe.execute()
+        if ttl is None:
+            return [bool(results[0])] * len(items)
+        return [bool(r) for r in results]
+
+    def _delete_tracked(
+        self, redis_keys: List[str], only_missing: bool = False
+    ) -> Tuple[int, int]:
+        """Delete keys and their size records atomically; returns (deleted, freed bytes)"""
+        deleted, freed = self._delete_script(
+            keys=[self._sizes_key, self._bytes_key] + list(redis_keys),
+            args=["1" if only_missing else "0"],
+        )
+        return int(deleted), int(freed)
+
+    def _is_meta_key(self, redis_key: str) -> bool:
+        return redis_key in (self._sizes_key, self._bytes_key)
+
+    def _tracked_bytes(self) -> int:
+        return int(self.redis_client.get(self._bytes_key) or 0)
+
+    def _evict_for_budget(self) -> None:
+        """Evict sampled keys (largest idle time x size first) until under max_bytes"""
+        total = self._tracked_bytes()
+        rounds = 0
+        while total > self.max_bytes and rounds < 64:
+            rounds += 1
+            sample = self.redis_client.hrandfield(
+                self._sizes_key, self.eviction_samples, withvalues=True
+            )
+            if not sample:
+                break
+            fields = []
+            for i in range(0, len(sample), 2):
+                field = sample[i]
+                if isinstance(field, bytes):
+                    field = field.decode("utf-8")
+                fields.append((field, int(sample[i + 1])))
+            pipe = self.redis_client.pipeline()
+            for field, _ in fields:
+                pipe.object("idletime", field)
+            idle_times = pipe.execute(raise_on_error=False)
+
+            victim, best = None, -1.0
+            gone = []
+            for (field, size), idle in zip(fields, idle_times):
+                if idle is None:
+                    # Expired or deleted elsewhere: drop the stale size record
+                    gone.append(field)
+                    continue
+                if isinstance(idle, Exception):
+                    # Idle time is not tracked under LFU maxmemory policies
+                    score = float(size)
+                else:
+                    score = (int(idle) + 1) * size
+                if score > best:
+                    victim, best = field, score
+            if gone:
+                total -= self._delete_tracked(gone, only_missing=True)[1]
+            if victim is not None and total > self.max_bytes:
+                deleted, freed = self._delete_tracked([victim])
+                total -= freed
+                if deleted:
+                    self._stats.record_eviction()
+                    logger.debug(f"Evicted {victim} ({freed} bytes) for byte budget")
+
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve value from cache"""
-        start_time = time.time()
         try:
-            redis_key = self._make_key(key)
-            logger.debug(f"Getting value for key: {redis_key}")
-
-            data = self.redis_client.get(redis_key)
-
+            data = self.redis_client.get(self._make_key(key))
             if data is None:
-                logger.debug(f"Cache miss for key: {redis_key}")
                 self._stats.record_miss()
                 return default
 
             value = self._deserialize(data)
-            duration = time.time() - start_time
-            logger.debug(f"Cache hit for key: {redis_key} (took {duration:.3f}s)")
             self._stats.record_hit()
             return value
 
@@ -215,23 +387,24 @@ class RedisCache(CacheInterface):
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Store value in cache"""
-        start_time = time.time()
         try:
             redis_key = self._make_key(key)
             serialized_value = self._serialize(value)
 
-            logger.debug(f"Setting value for key: {redis_key} (TTL: {ttl})")
-
-            if ttl is not None:
+            if self.max_bytes is not None:
+                size = len(serialized_value)
+                if size > self.max_bytes:
+                    logger.warning(
+                        f"Value for {redis_key} ({size} bytes) exceeds max_bytes"
+                    )
+                    return False
+                result = self._store_pipelined([(redis_key, serialized_value)], ttl)[0]
+            elif ttl is not None:
                 result = self.redis_client.setex(redis_key, ttl, serialized_value)
             else:
                 result = self.redis_client.set(redis_key, serialized_value)
 
-            duration = time.time() - start_time
             if result:
-                logger.debug(
-                    f"Successfully set cache value for key: {redis_key} (took {duration:.3f}s)"
-                )
                 self._stats.record_set()
                 return True
             else:
@@ -245,13 +418,121 @@ class RedisCache(CacheInterface):
             logger.error(f"Error setting cache value for key {key}: {e}")
             return False
 
+    def get_many(self, keys: List[str], default: Any = None) -> Dict[str, Any]:
+        """Retrieve several values with a single MGET round trip"""
+        if not keys:
+            return {}
+        try:
+            raw_values = self.redis_client.mget([self._make_key(k) for k in keys])
+        except redis.ConnectionError as e:
+            logger.error(f"Redis connection error during get_many: {e}")
+            for _ in keys:
+                self._stats.record_miss()
+            return {key: default for key in keys}
+        return self._decode_many(keys, raw_values, default)
+
+    def get_many_with_ttl(
+        self, keys: List[str], default: Any = None
+    ) -> Dict[str, Tuple[Any, Optional[int]]]:
+        """Retrieve values and remaining TTLs in one pipelined round trip (MGET + TTL per key)"""
+        if not keys:
+            return {}
+        redis_keys = [self._make_key(k) for k in keys]
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.mget(redis_keys)
+            for redis_key in redis_keys:
+                pipe.ttl(redis_key)
+            raw_values, *ttls = pipe.execute()
+        except redis.ConnectionError as e:
+            logger.error(f"Redis connection error during get_many_with_ttl: {e}")
+            for _ in keys:
+                self._stats.record_miss()
+            return {key: (default, None) for key in keys}
+
+        values = self._decode_many(keys, raw_values, default)
+        # TTL -1 (no expiry) and -2 (missing) map to None, as in get_ttl
+        return {
+            key: (values[key], ttl if ttl is not None and ttl >= 0 else None)
+            for key, ttl in zip(keys, ttls)
+        }
+
+    def _decode_many(self, keys: List[str], raw_values: List[Any], default: Any) -> Dict[str, Any]:
+        """Deserialize MGET results, recording a hit or miss per key"""
+        result: Dict[str, Any] = {}
+        for key, data in zip(keys, raw_values):
+            if data is None:
+                self._stats.record_miss()
+                result[key] = default
+                continue
+            try:
+                result[key] = self._deserialize(data)
+                self._stats.record_hit()
+            except Exception as e:
+                logger.error(f"Error decoding cache value for key {key}: {e}")
+                self._stats.record_miss()
+                result[key] = default
+        return result
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Store several values in one pipelined round trip (MSET or SET EX per key)"""
+        if not mapping:
+            return True
+        try:
+            items = []
+            for key, value in mapping.items():
+                data = self._serialize(value)
+                if self.max_bytes is not None and len(data) > self.max_bytes:
+                    logger.warning(f"Value for {key} ({len(data)} bytes) exceeds max_bytes")
+                    continue
+                items.append((self._make_key(key), data))
+            if not items:
+                return False
+
+            stored = self._store_pipelined(items, ttl)
+            for ok in stored:
+                if ok:
+                    self._stats.record_set()
+            return len(items) == len(mapping) and all(stored)
+
+        except redis.ConnectionError as e:
+            logger.error(f"Redis connection error during set_many: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error setting {len(mapping)} cache values: {e}")
+            return False
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys in one pipelined round trip"""
+        if not keys:
+            return 0
+        try:
+            redis_keys = [self._make_key(k) for k in keys]
+            if self.max_bytes is not None:
+                deleted = self._delete_tracked(redis_keys)[0]
+            else:
+                deleted = int(self.redis_client.delete(*redis_keys))
+            for _ in range(deleted):
+                self._stats.record_delete()
+            return deleted
+
+        except redis.ConnectionError as e:
+            logger.error(f"Redis connection error during delete_many: {e}")
+            return 0
+        except Exception as e:
+            logger.error(f"Error deleting {len(keys)} cache keys: {e}")
+            return 0
+
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         try:
             redis_key = self._make_key(key)
             logger.debug(f"Deleting key: {redis_key}")
 
-            result = self.redis_client.delete(redis_key)
+            if self.max_bytes is not None:
+                result = self._delete_tracked([redis_key])[0]
+            else:
+                result = self.redis_client.delete(redis_key)
 
             if result > 0:
                 logger.debug(f"Successfully deleted key: {redis_key}")
@@ -277,14 +558,20 @@ class RedisCache(CacheInterface):
                 # Delete only keys with our prefix
                 pattern = f"{self.key_prefix}*"
                 logger.debug(f"Clearing keys matching pattern: {pattern}")
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    deleted_count = self.redis_client.delete(*keys)
-                    logger.info(
-                        f"Deleted {deleted_count} keys with prefix '{self.key_prefix}'"
-                    )
-                else:
-                    logger.info(f"No keys found with prefix '{self.key_prefix}'")
+                deleted_count = 0
+                batch: List[bytes] = []
+                for redis_key in self.redis_client.scan_iter(
+                    match=pattern, count=_SCAN_COUNT
+                ):
+                    batch.append(redis_key)
+                    if len(batch) >= _SCAN_COUNT:
+                        deleted_count += self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted_count += self.redis_client.unlink(*batch)
+                logger.info(
+                    f"Deleted {deleted_count} keys with prefix '{self.key_prefix}'"
+                )
             else:
                 # Clear entire database
                 logger.warning("Clearing entire Redis database")
@@ -303,10 +590,7 @@ class RedisCache(CacheInterface):
     def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         try:
-            redis_key = self._make_key(key)
-            result = bool(self.redis_client.exists(redis_key))
-            logger.debug(f"Key existence check for {redis_key}: {result}")
-            return result
+            return bool(self.redis_client.exists(self._make_key(key)))
         except redis.ConnectionError as e:
             logger.error(f"Redis connection error during exists check: {e}")
             return False
@@ -322,8 +606,12 @@ class RedisCache(CacheInterface):
             else:
                 search_pattern = f"{self.key_prefix}*" if self.key_prefix else "*"
 
-            logger.debug(f"Searching for keys with pattern: {search_pattern}")
-            redis_keys = self.redis_client.keys(search_pattern)
+            redis_keys = self._scan(search_pattern)
+
+            if self.max_bytes is not None:
+                redis_keys = [
+                    k for k in redis_keys if not self._is_meta_key(k.decode("utf-8"))
+                ]
 
             # Remove prefix from keys
             if self.key_prefix:
@@ -385,14 +673,24 @@ class RedisCache(CacheInterface):
             logger.error(f"Error setting TTL for key {key}: {e}")
             return False
 
+    def _entry_count(self) -> Optional[int]:
+        """Key count from O(1) commands, None when only a SCAN could tell"""
+        if not self.key_prefix:
+            size = self.redis_client.dbsize()
+            if self.max_bytes is not None:
+                size -= int(self.redis_client.exists(self._sizes_key, self._bytes_key))
+            return size
+        if self.max_bytes is not None:
+            # Every stored key has a size record; expired ones linger until sampled
+            return self.redis_client.hlen(self._sizes_key)
+        return None
+
     def get_size(self) -> int:
         """Get current cache size"""
         try:
-            if self.key_prefix:
-                pattern = f"{self.key_prefix}*"
-                size = len(self.redis_client.keys(pattern))
-            else:
-                size = self.redis_client.dbsize()
+            size = self._entry_count()
+            if size is None:
+                size = len(self._scan(f"{self.key_prefix}*"))
 
             logger.debug(f"Cache size: {size} keys")
             return size
@@ -416,8 +714,21 @@ class RedisCache(CacheInterface):
                 "used_memory_peak_human": info.get("used_memory_peak_human", "0B"),
                 "total_system_memory": info.get("total_system_memory", 0),
                 "maxmemory": info.get("maxmemory", 0),
-                "entry_count": self.get_size(),
+                # No SCAN here: this runs on every metrics scrape
+                "entry_count": self._entry_count(),
             }
+            if self.max_bytes is not None:
+                tracked = self._tracked_bytes()
+                memory_info.update(
+                    {
+                        "total_bytes": tracked,
+                        "total_mb": tracked / (1024 * 1024),
+                        "max_bytes": self.max_bytes,
+                        "byte_utilization": tracked / self.max_bytes,
+                        "eviction_policy": "sampled-size-aware-lru",
+                        "evictions": self._stats.evictions,
+                    }
+                )
             logger.debug(f"Memory usage: {memory_info['used_memory_human']}")
             return memory_info
 
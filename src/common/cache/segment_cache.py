@@ -0,0 +1,503 @@
+# common/cache/segment_cache.py
+
+import json
+import mmap
+import os
+import pickle
+import re
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.cache.cache_interface import CacheInterface, CacheStats
+from common.cache.size_policy import GDSFPolicy
+
+# flags(1) key_len(2) value_len(4) expires_at(8, 0 = none) crc32(4)
+_HEADER = struct.Struct("<BHIdI")
+_FLAG_VALUE = 0
+_FLAG_TOMBSTONE = 1
+
+
+class _Location:
+    """Where a live value sits in the log"""
+
+    __slots__ = ("segment", "offset", "length", "record_size", "expires_at")
+
+    def __init__(self, segment: int, offset: int, length: int, record_size: int, expires_at: Optional[float]):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.record_size = record_size
+        self.expires_at = expires_at
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) > self.expires_at
+
+
+class _Segment:
+    """One append-only log file plus a lazily (re)mapped read view"""
+
+    def __init__(self, path: Path, seg_id: int):
+        self.path = path
+        self.id = seg_id
+        self.fp = open(path, "a+b")
+        self.size = self.fp.seek(0, os.SEEK_END)
+        self.live_bytes = 0
+        self._map: Optional[mmap.mmap] = None
+
+    def view(self, end: int) -> memoryview:
+        """Zero-copy view of the segment, remapped if it grew past the current map"""
+        if self._map is None or len(self._map) < end:
+            self.fp.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)
+
+    def append(self, record: bytes) -> int:
+        offset = self.size
+        self.fp.write(record)
+        self.size += len(record)
+        return offset
+
+    def unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self) -> None:
+        self.unmap()
+        self.fp.close()
+
+
+class SegmentCache(CacheInterface):
+    """
+    Single-directory, append-only segment log cache.
+
+    - Writes append a record to the active segment (no file per entry, no rename).
+    - Reads go through mmap and slice the value without copying the segment.
+    - An in-memory hash index maps key -> (segment, offset, length, expiry);
+      it is rebuilt by replaying segments on start-up.
+    - Deletes append tombstones; a background pass compacts sealed segments
+      whose garbage ratio exceeds ``compaction_threshold``.
+
+    Intended for a single writer process per directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".cache/segments",
+        serialization: str = "pickle",  # "pickle" or "json"
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        compaction_threshold: float = 0.5,
+        cleanup_interval: int = 300,
+        max_bytes: Optional[int] = None,
+        fsync: bool = False,
+    ):
+        """
+        Initialize segment cache
+
+        Args:
+            cache_dir: Directory holding the segment files
+            serialization: Serialization method ("pickle" or "json")
+            max_segment_bytes: Size at which the active segment is sealed
+            compaction_threshold: Garbage ratio above which a sealed segment is compacted
+            cleanup_interval: Interval for expiry/compaction passes in seconds
+            max_bytes: Byte budget for live values (None for unlimited, GDSF eviction)
+            fsync: fsync the active segment after every write
+        """
+        if serialization not in ("pickle", "json"):
+            raise ValueError(f"Unsupported serialization: {serialization}")
+
+        self.cache_dir = Path(cache_dir).resolve()
+        self.serialization = serialization
+        self.max_segment_bytes = max_segment_bytes
+        self.compaction_threshold = compaction_threshold
+        self.cleanup_interval = cleanup_interval
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._stats = CacheStats()
+        self._index: Dict[str, _Location] = {}
+        self._segments: Dict[int, _Segment] = {}
+        self._policy = GDSFPolicy() if max_bytes else None
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_segments()
+
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_expired, daemon=True
+        )
+        self._cleanup_thread.start()
+
+    # ---------- segment management ----------
+    def _segment_path(self, seg_id: int) -> Path:
+        return self.cache_dir / f"segment-{seg_id:06d}.log"
+
+    @property
+    def _active(self) -> _Segment:
+        return self._segments[max(self._segments)]
+
+    def _open_segment(self, seg_id: int) -> _Segment:
+        segment = _Segment(self._segment_path(seg_id), seg_id)
+        self._segments[seg_id] = segment
+        return segment
+
+    def _load_segments(self) -> None:
+        """Replay existing segments in order to rebuild the index"""
+        ids = sorted(
+            int(p.stem.split("-")[1])
+            for p in self.cache_dir.glob("segment-*.log")
+            if p.stem.split("-")[1].isdigit()
+        )
+        for seg_id in ids:
+            segment = self._open_segment(seg_id)
+            self._replay(segment)
+        if not self._segments:
+            self._open_segment(1)
+
+    def _replay(self, segment: _Segment) -> None:
+        if segment.size == 0:
+            return
+        view = segment.view(segment.size)
+        pos = 0
+        while pos + _HEADER.size <= segment.size:
+            flags, key_len, value_len, expires_at, crc = _HEADER.unpack_from(view, pos)
+            end = pos + _HEADER.size + key_len + value_len
+            if end > segment.size:
+                break  # torn write at the tail
+            body = view[pos + _HEADER.size : end]
+            valid = zlib.crc32(body) == crc
+            key = bytes(body[:key_len]).decode("utf-8", errors="replace") if valid else ""
+            body.release()
+            if not valid:
+                break
+            self._unlink_location(key)
+            if flags == _FLAG_VALUE:
+                loc = _Location(
+                    segment.id,
+                    pos + _HEADER.size + key_len,
+                    value_len,
+                    end - pos,
+                    expires_at or None,
+                )
+                self._index[key] = loc
+                segment.live_bytes += loc.record_size
+                if self._policy is not None:
+                    self._policy.admit(key, value_len)
+            pos = end
+        view.release()
+        if pos < segment.size:
+            # Drop the torn tail so new appends start on a record boundary
+            segment.unmap()
+            segment.fp.truncate(pos)
+            segment.size = pos
+
+    @staticmethod
+    def _tombstone_keys(view: memoryview, size: int) -> List[str]:
+        """Keys deleted by tombstone records in a (fully replayed) segment"""
+        keys = []
+        pos = 0
+        while pos + _HEADER.size <= size:
+            flags, key_len, value_len, _, _ = _HEADER.unpack_from(view, pos)
+            if flags == _FLAG_TOMBSTONE:
+                start = pos + _HEADER.size
+                keys.append(bytes(view[start : start + key_len]).decode("utf-8", errors="replace"))
+            pos += _HEADER.size + key_len + value_len
+        return keys
+
+    def _unlink_location(self, key: str) -> Optional[_Location]:
+        loc = self._index.pop(key, None)
+        if loc is not None:
+            segment = self._segments.get(loc.segment)
+            if segment is not None:
+                segment.live_bytes -= loc.record_size
+            if self._policy is not None:
+                self._policy.remove(key)
+        return loc
+
+    def _append(self, flags: int, key: str, value: bytes, expires_at: Optional[float]) -> Tuple[_Segment, int, int]:
+        key_bytes = key.encode("utf-8")
+        body = key_bytes + value
+        record = _HEADER.pack(flags, len(key_bytes), len(value), expires_at or 0.0, zlib.crc32(body)) + body
+
+        segment = self._active
+        if segment.size and segment.size + len(record) > self.max_segment_bytes:
+            segment.fp.flush()
+            segment = self._open_segment(segment.id + 1)
+
+        offset = segment.append(record)
+        segment.fp.flush()
+        if self.fsync:
+            os.fsync(segment.fp.fileno())
+        return segment, offset + _HEADER.size + len(key_bytes), len(record)
+
+    def _read_value(self, loc: _Location) -> Any:
+        segment = self._segments[loc.segment]
+        view = segment.view(loc.offset + loc.length)
+        data = view[loc.offset : loc.offset + loc.length]
+        try:
+            if self.serialization == "pickle":
+                return pickle.loads(data)
+            return json.loads(bytes(data).decode("utf-8"))
+        finally:
+            data.release()
+            view.release()
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serialization == "pickle":
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+    def _write(self, key: str, data: bytes, expires_at: Optional[float]) -> None:
+        """Append a value record and point the index at it"""
+        self._unlink_location(key)
+        segment, offset, record_size = self._append(_FLAG_VALUE, key, data, expires_at)
+        self._index[key] = _Location(segment.id, offset, len(data), record_size, expires_at)
+        segment.live_bytes += record_size
+        if self._policy is not None:
+            self._policy.admit(key, len(data))
+
+    def _remove(self, key: str) -> bool:
+        if self._unlink_location(key) is None:
+            return False
+        self._append(_FLAG_TOMBSTONE, key, b"", None)
+        return True
+
+    def _live(self, key: str) -> Optional[_Location]:
+        loc = self._index.get(key)
+        if loc is None:
+            return None
+        if loc.is_expired():
+            self._remove(key)
+            self._stats.record_expired()
+            return None
+        return loc
+
+    # ---------- background maintenance ----------
+    def _cleanup_expired(self):
+        """Background thread: drop expired keys, then compact sealed segments"""
+        while True:
+            try:
+                time.sleep(self.cleanup_interval)
+                self._remove_expired_entries()
+                self.compact()
+            except Exception:
+                # Continue running even if cleanup fails
+                pass
+
+    def _remove_expired_entries(self) -> int:
+        with self._lock:
+            now = time.time()
+            expired = [k for k, loc in self._index.items() if loc.is_expired(now)]
+            for key in expired:
+                self._remove(key)
+                self._stats.record_expired()
+            return len(expired)
+
+    def compact(self, force: bool = False) -> int:
+        """
+        Rewrite live records of sealed segments whose garbage ratio is above
+        the threshold into the active segment, then delete those segments.
+
+        Segments are compacted oldest-first. A deletion (tombstone or dropped
+        expired value) is carried forward while an older segment remains, so
+        an older value for that key cannot come back on the next replay.
+
+        Returns the number of segments reclaimed.
+        """
+        reclaimed = 0
+        with self._lock:
+            active_id = self._active.id
+            for seg_id in sorted(self._segments):
+                segment = self._segments[seg_id]
+                if seg_id == active_id or segment.size == 0:
+                    continue
+                garbage = 1 - segment.live_bytes / segment.size
+                if not force and garbage < self.compaction_threshold:
+                    continue
+
+                now = time.time()
+                movers = [
+                    (key, loc) for key, loc in self._index.items() if loc.segment == seg_id
+                ]
+                has_older = any(other < seg_id for other in self._segments)
+                view = segment.view(segment.size)
+                for key, loc in movers:
+                    if loc.is_expired(now):
+                        self._unlink_location(key)
+                        self._stats.record_expired()
+                        if has_older:
+                            self._append(_FLAG_TOMBSTONE, key, b"", None)
+                        continue
+                    data = bytes(view[loc.offset : loc.offset + loc.length])
+                    self._write(key, data, loc.expires_at)
+                if has_older:
+                    for key in dict.fromkeys(self._tombstone_keys(view, segment.size)):
+                        if key not in self._index:
+                            self._append(_FLAG_TOMBSTONE, key, b"", None)
+                view.release()
+
+                segment.close()
+                del self._segments[seg_id]
+                try:
+                    segment.path.unlink()
+                except OSError:
+                    pass
+                reclaimed += 1
+                # Writes during compaction may have sealed the active segment
+                active_id = self._active.id
+        return reclaimed
+
+    # ---------- CacheInterface ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retrieve value from cache"""
+        with self._lock:
+            loc = self._live(key)
+            if loc is None:
+                self._stats.record_miss()
+                return default
+            try:
+                value = self._read_value(loc)
+            except Exception:
+                self._stats.record_miss()
+                return default
+            if self._policy is not None:
+                self._policy.touch(key)
+            self._stats.record_hit()
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store value in cache"""
+        try:
+            data = self._serialize(value)
+        except Exception:
+            return False
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return False
+
+        with self._lock:
+            try:
+                if self._policy is not None:
+                    self._policy.remove(key)
+                    while self._policy.total_bytes + len(data) > self.max_bytes:
+                        victim = self._policy.pop_victim()
+                        if victim is None:
+                            break
+                        self._remove(victim)
+                        self._stats.record_eviction()
+
+                expires_at = time.time() + ttl if ttl else None
+                self._write(key, data, expires_at)
+                self._stats.record_set()
+                return True
+            except Exception:
+                return False
+
+    def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        with self._lock:
+            if self._remove(key):
+                self._stats.record_delete()
+                return True
+            return False
+
+    def clear(self) -> bool:
+        """Clear all cache entries"""
+        with self._lock:
+            try:
+                for segment in self._segments.values():
+                    segment.close()
+                    try:
+                        segment.path.unlink()
+                    except OSError:
+                        pass
+                self._segments.clear()
+                self._index.clear()
+                if self._policy is not None:
+                    self._policy.clear()
+                self._open_segment(1)
+                self._stats.record_clear()
+                return True
+            except Exception:
+                return False
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in cache"""
+        with self._lock:
+            return self._live(key) is not None
+
+    def keys(self, pattern: Optional[str] = None) -> List[str]:
+        """Get list of cache keys"""
+        with self._lock:
+            now = time.time()
+            all_keys = [k for k, loc in self._index.items() if not loc.is_expired(now)]
+
+        if pattern is None:
+            return all_keys
+
+        # Simple pattern matching with wildcards
+        regex_pattern = pattern.replace("*", ".*").replace("?", ".")
+        compiled_pattern = re.compile(regex_pattern)
+        return [key for key in all_keys if compiled_pattern.match(key)]
+
+    def get_stats(self) -> CacheStats:
+        """Get cache statistics"""
+        return self._stats
+
+    def get_ttl(self, key: str) -> Optional[int]:
+        """Get remaining TTL for a key"""
+        with self._lock:
+            loc = self._live(key)
+            if loc is None or loc.expires_at is None:
+                return None
+            return max(0, int(loc.expires_at - time.time()))
+
+    def set_ttl(self, key: str, ttl: int) -> bool:
+        """Set TTL for existing key (re-appends the value with the new expiry)"""
+        with self._lock:
+            loc = self._live(key)
+            if loc is None:
+                return False
+            segment = self._segments[loc.segment]
+            view = segment.view(loc.offset + loc.length)
+            data = bytes(view[loc.offset : loc.offset + loc.length])
+            view.release()
+            self._write(key, data, time.time() + ttl)
+            return True
+
+    def get_size(self) -> int:
+        """Get current cache size"""
+        with self._lock:
+            now = time.time()
+            return sum(1 for loc in self._index.values() if not loc.is_expired(now))
+
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Get disk usage information"""
+        with self._lock:
+            disk_bytes = sum(s.size for s in self._segments.values())
+            live_bytes = sum(s.live_bytes for s in self._segments.values())
+            value_bytes = sum(loc.length for loc in self._index.values())
+            return {
+                "total_bytes": value_bytes,
+                "total_mb": value_bytes / (1024 * 1024),
+                "disk_bytes": disk_bytes,
+                "live_record_bytes": live_bytes,
+                "garbage_ratio": 1 - live_bytes / disk_bytes if disk_bytes else 0.0,
+                "segment_count": len(self._segments),
+                "entry_count": len(self._index),
+                "cache_dir": str(self.cache_dir),
+                "max_bytes": self.max_bytes,
+                "byte_utilization": value_bytes / self.max_bytes if self.max_bytes else 0,
+                "evictions": self._stats.evictions,
+            }
+
+    def close(self) -> None:
+        """Flush and close all segment files"""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
@@ -0,0 +1,356 @@
+# common/cache/sharded_memory_cache.py
+
+import heapq
+import itertools
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.cache.cache_interface import CacheInterface, CacheStats
+from common.cache.in_memory_cache import CacheEntry
+from common.cache.size_policy import GDSFPolicy, estimate_size
+
+
+def _split(total: int, parts: int) -> List[int]:
+    """Split total into parts that differ by at most one and sum to total"""
+    base, extra = divmod(total, parts)
+    return [base + 1 if i < extra else base for i in range(parts)]
+
+
+class _Shard:
+    """One lock-protected partition of the cache with its own expiry heap"""
+
+    def __init__(self, max_size: Optional[int], enable_lru: bool, max_bytes: Optional[int]):
+        self.max_size = max_size
+        self.enable_lru = enable_lru
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = CacheStats()
+        self.bytes = 0
+        self.policy = GDSFPolicy() if max_bytes else None
+        # (expires_at, seq, key); stale items are skipped lazily
+        self.expiry_heap: List[Tuple[float, int, str]] = []
+
+    def schedule(self, key: str, entry: CacheEntry, seq: int) -> None:
+        if entry.expires_at is None:
+            return
+        heapq.heappush(self.expiry_heap, (entry.expires_at, seq, key))
+        # Overwrites/deletes leave stale heap items behind; keep the heap bounded
+        if len(self.expiry_heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [
+                item
+                for item in self.expiry_heap
+                if (e := self.entries.get(item[2])) is not None
+                and e.expires_at == item[0]
+            ]
+            heapq.heapify(self.expiry_heap)
+
+    def purge_expired(self, now: float) -> int:
+        """Pop expired entries off the heap: O(expired * log n), not O(size)"""
+        removed = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self.drop(key)
+                self.stats.record_expired()
+                removed += 1
+        return removed
+
+    def drop(self, key: str) -> Optional[CacheEntry]:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            if self.policy is not None:
+                self.policy.remove(key)
+        return entry
+
+    def evict_one(self) -> None:
+        key = None
+        if self.policy is not None:
+            key = self.policy.pop_victim()
+            # The policy still tracks a key being overwritten; skip it
+            while key is not None and key not in self.entries:
+                key = self.policy.pop_victim()
+        if key is None:
+            key = next(iter(self.entries))
+        self.drop(key)
+        self.stats.record_eviction()
+
+    def ensure_capacity(self, incoming_bytes: int, new_key: bool) -> None:
+        if self.max_size is not None and new_key:
+            while self.entries and len(self.entries) >= self.max_size:
+                self.evict_one()
+        if self.max_bytes is not None:
+            while self.entries and self.bytes + incoming_bytes > self.max_bytes:
+                self.evict_one()
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        self.ensure_capacity(entry.size, new_key=old is None)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        if self.policy is not None:
+            self.policy.admit(key, entry.size)
+
+    def get_live(self, key: str) -> Optional[CacheEntry]:
+        """Return a non-expired entry (dropping it if expired); caller holds lock"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            self.drop(key)
+            self.stats.record_expired()
+            return None
+        return entry
+
+
+class ShardedInMemoryCache(CacheInterface):
+    """
+    In-memory cache partitioned into lock-striped shards.
+
+    Each key maps to one shard by hash, so concurrent callers only contend
+    when they hit the same shard. Every shard keeps a min-heap of expiry
+    times, so expiry work is proportional to the number of expired entries
+    rather than a full scan of the cache.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        default_ttl: Optional[int] = None,
+        cleanup_interval: int = 60,
+        enable_lru: bool = True,
+        shards: int = 16,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize sharded in-memory cache
+
+        Args:
+            max_size: Maximum number of entries (None for unlimited), split across shards
+            default_ttl: Default TTL in seconds (None for no expiration)
+            cleanup_interval: Interval for purging expired entries in seconds
+            enable_lru: Enable LRU eviction when max_size is reached
+            shards: Number of shards (rounded up to a power of two, reduced so
+                every shard holds at least one entry when max_size is set)
+            max_bytes: Byte budget (None for unlimited), split across shards;
+                when set, eviction follows GDSF
+        """
+        shard_count = 1
+        while shard_count < max(1, shards):
+            shard_count <<= 1
+        if max_size:
+            # Every shard must hold at least one entry
+            while shard_count > max_size:
+                shard_count >>= 1
+
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.cleanup_interval = cleanup_interval
+        self.enable_lru = enable_lru
+        self.max_bytes = max_bytes
+        self.shard_count = shard_count
+        self._mask = shard_count - 1
+
+        sizes = _split(max_size, shard_count) if max_size else [None] * shard_count
+        budgets = _split(max_bytes, shard_count) if max_bytes else [None] * shard_count
+        self._shards = [
+            _Shard(size, enable_lru, budget) for size, budget in zip(sizes, budgets)
+        ]
+        self._seq = itertools.count()
+        self._start_time = time.time()
+        self._clears = 0
+
+        self._stop = threading.Event()
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_expired, daemon=True
+        )
+        self._cleanup_thread.start()
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) & self._mask]
+
+    def _cleanup_expired(self):
+        """Background thread purging expired entries shard by shard"""
+        while not self._stop.wait(self.cleanup_interval):
+            try:
+                self._remove_expired_entries()
+            except Exception:
+                # Continue running even if cleanup fails
+                pass
+
+    def _remove_expired_entries(self) -> int:
+        now = time.time()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed += shard.purge_expired(now)
+        return removed
+
+    def close(self) -> None:
+        """Stop the background cleanup thread"""
+        self._stop.set()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retrieve value from cache"""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.get_live(key)
+            if entry is None:
+                shard.stats.record_miss()
+                return default
+            if self.enable_lru:
+                shard.entries.move_to_end(key)
+            if shard.policy is not None:
+                shard.policy.touch(key)
+            shard.stats.record_hit()
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store value in cache"""
+        try:
+            effective_ttl = ttl if ttl is not None else self.default_ttl
+            # Measured outside the lock; reject entries larger than a shard's budget
+            if self.max_bytes is None:
+                size = sys.getsizeof(key) + sys.getsizeof(value)
+            else:
+                size = sys.getsizeof(key) + estimate_size(value)
+            shard = self._shard(key)
+            if shard.max_bytes is not None and size > shard.max_bytes:
+                return False
+            entry = CacheEntry(value, effective_ttl, size)
+            with shard.lock:
+                shard.purge_expired(entry.created_at)
+                shard.put(key, entry)
+                if self.enable_lru:
+                    shard.entries.move_to_end(key)
+                shard.schedule(key, entry, next(self._seq))
+                shard.stats.record_set()
+                return True
+        except Exception:
+            return False
+
+    def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        shard = self._shard(key)
+        with shard.lock:
+            if shard.drop(key) is not None:
+                shard.stats.record_delete()
+                return True
+            return False
+
+    def clear(self) -> bool:
+        """Clear all cache entries"""
+        try:
+            for shard in self._shards:
+                with shard.lock:
+                    shard.entries.clear()
+                    shard.expiry_heap.clear()
+                    shard.bytes = 0
+                    if shard.policy is not None:
+                        shard.policy.clear()
+            self._clears += 1
+            return True
+        except Exception:
+            return False
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in cache"""
+        shard = self._shard(key)
+        with shard.lock:
+            return shard.get_live(key) is not None
+
+    def keys(self, pattern: Optional[str] = None) -> List[str]:
+        """Get list of cache keys"""
+        now = time.time()
+        all_keys: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                shard.purge_expired(now)
+                all_keys.extend(shard.entries.keys())
+
+        if pattern is None:
+            return all_keys
+
+        # Simple pattern matching with wildcards
+        regex_pattern = pattern.replace("*", ".*").replace("?", ".")
+        compiled_pattern = re.compile(regex_pattern)
+        return [key for key in all_keys if compiled_pattern.match(key)]
+
+    def get_stats(self) -> CacheStats:
+        """Get cache statistics aggregated over all shards"""
+        stats = CacheStats()
+        stats.start_time = self._start_time
+        stats.clears = self._clears
+        for shard in self._shards:
+            s = shard.stats
+            stats.hits += s.hits
+            stats.misses += s.misses
+            stats.sets += s.sets
+            stats.deletes += s.deletes
+            stats.expired += s.expired
+            stats.evictions += s.evictions
+        return stats
+
+    def get_ttl(self, key: str) -> Optional[int]:
+        """Get remaining TTL for a key"""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.get_live(key)
+            return entry.get_remaining_ttl() if entry is not None else None
+
+    def set_ttl(self, key: str, ttl: int) -> bool:
+        """Set TTL for existing key"""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.get_live(key)
+            if entry is None:
+                return False
+            new_entry = CacheEntry(entry.value, ttl, entry.size)
+            shard.entries[key] = new_entry
+            if self.enable_lru:
+                shard.entries.move_to_end(key)
+            shard.schedule(key, new_entry, next(self._seq))
+            return True
+
+    def get_size(self) -> int:
+        """Get current cache size"""
+        now = time.time()
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                shard.purge_expired(now)
+                total += len(shard.entries)
+        return total
+
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Get memory usage information"""
+        total_size = 0
+        entry_count = 0
+        evictions = 0
+        for shard in self._shards:
+            with shard.lock:
+                entry_count += len(shard.entries)
+                total_size += shard.bytes
+                evictions += shard.stats.evictions
+
+        return {
+            "total_bytes": total_size,
+            "total_mb": total_size / (1024 * 1024),
+            "entry_count": entry_count,
+            "max_size": self.max_size,
+            "utilization": entry_count / self.max_size if self.max_size else 0,
+            "max_bytes": self.max_bytes,
+            "byte_utilization": total_size / self.max_bytes if self.max_bytes else 0,
+            "eviction_policy": "gdsf" if self.max_bytes else "lru",
+            "evictions": evictions,
+            "shards": self.shard_count,
+        }
@@ -0,0 +1,127 @@
+# common/cache/size_policy.py
+
+import heapq
+import itertools
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+_ATOMIC = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def estimate_size(value: Any, max_depth: int = 8) -> int:
+    """
+    Cheap estimate of the memory held by ``value`` in bytes.
+
+    Walks containers (dict/list/tuple/set and plain objects' __dict__) once,
+    summing sys.getsizeof of each node. Shared objects are counted once and
+    recursion stops at ``max_depth``.
+    """
+    seen = set()
+    total = 0
+    stack: List[Tuple[Any, int]] = [(value, 0)]
+    while stack:
+        obj, depth = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, _ATOMIC) or depth >= max_depth:
+            continue
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                stack.append((k, depth + 1))
+                stack.append((v, depth + 1))
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            for item in obj:
+                stack.append((item, depth + 1))
+        elif hasattr(obj, "__dict__"):
+            stack.append((vars(obj), depth + 1))
+    return total
+
+
+class GDSFPolicy:
+    """
+    Greedy-Dual-Size-Frequency eviction order.
+
+    priority = L + frequency * cost / size, where L is the priority of the
+    last evicted entry. Small, frequently used entries are kept; L inflates
+    over time so entries that stop being used age out (recency).
+
+    Not thread-safe: callers hold their own cache lock.
+    """
+
+    def __init__(self):
+        self._meta: Dict[str, List[float]] = {}  # key -> [freq, size, cost, seq]
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._clock = 0.0
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._meta
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def _push(self, key: str, meta: List[float]) -> None:
+        freq, size, cost, _ = meta
+        seq = next(self._seq)
+        meta[3] = seq
+        heapq.heappush(self._heap, (self._clock + freq * cost / max(size, 1), seq, key))
+        if len(self._heap) > 2 * len(self._meta) + 64:
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, item: Tuple[float, int, str]) -> bool:
+        meta = self._meta.get(item[2])
+        return meta is not None and meta[3] == item[1]
+
+    def admit(self, key: str, size: int, cost: float = 1.0) -> None:
+        """Record a set; an overwrite keeps the key's access frequency."""
+        meta = self._meta.get(key)
+        if meta is None:
+            meta = [1, size, cost, 0]
+            self._meta[key] = meta
+        else:
+            self.total_bytes -= int(meta[1])
+            meta[0] += 1
+            meta[1] = size
+            meta[2] = cost
+        self.total_bytes += size
+        self._push(key, meta)
+
+    def touch(self, key: str) -> None:
+        """Record a hit."""
+        meta = self._meta.get(key)
+        if meta is not None:
+            meta[0] += 1
+            self._push(key, meta)
+
+    def remove(self, key: str) -> Optional[int]:
+        """Forget ``key`` (deleted/expired); returns its size if it was tracked."""
+        meta = self._meta.pop(key, None)
+        if meta is None:
+            return None
+        self.total_bytes -= int(meta[1])
+        return int(meta[1])
+
+    def size_of(self, key: str) -> int:
+        meta = self._meta.get(key)
+        return int(meta[1]) if meta is not None else 0
+
+    def pop_victim(self) -> Optional[str]:
+        """Remove and return the key with the lowest priority."""
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            if self._is_live(item):
+                self._clock = item[0]
+                self.remove(item[2])
+                self.evictions += 1
+                return item[2]
+        return None
+
+    def clear(self) -> None:
+        self._meta.clear()
+        self._heap.clear()
+        self.total_bytes = 0
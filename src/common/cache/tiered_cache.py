@@ -0,0 +1,429 @@
+# common/cache/tiered_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.cache.cache_interface import CacheInterface, CacheStats
+from common.logger import LoggerFactory, LoggerType, LogLevel
+
+logger = LoggerFactory.get_logger(
+    name="tiered-cache", logger_type=LoggerType.STANDARD, level=LogLevel.INFO
+)
+
+WRITE_MODES = ("write-through", "write-behind")
+
+_MISSING = object()
+_DELETE = object()
+
+
+class TieredCacheStats(CacheStats):
+    """CacheStats with per-tier hit counters for a near/far composite"""
+
+    def __init__(self):
+        super().__init__()
+        self.near_hits = 0
+        self.far_hits = 0
+        self.negative_hits = 0
+        self.write_behind_flushed = 0
+        self.write_behind_errors = 0
+
+    def record_near_hit(self):
+        self.near_hits += 1
+        self.record_hit()
+
+    def record_far_hit(self):
+        self.far_hits += 1
+        self.record_hit()
+
+    def record_negative_hit(self):
+        self.negative_hits += 1
+        self.record_miss()
+
+    def get_near_hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.near_hits / total if total > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "near_hits": self.near_hits,
+            "far_hits": self.far_hits,
+            "negative_hits": self.negative_hits,
+            "sets": self.sets,
+            "deletes": self.deletes,
+            "hit_rate": self.get_hit_rate(),
+            "near_hit_rate": self.get_near_hit_rate(),
+            "write_behind_flushed": self.write_behind_flushed,
+            "write_behind_errors": self.write_behind_errors,
+        }
+
+
+class TieredCache(CacheInterface):
+    """
+    Near/far composite cache.
+
+    - Reads are read-through: near tier first, then far tier; far hits are
+      promoted into the near tier (with at most ``near_ttl``).
+    - Writes are write-through (both tiers synchronously) or write-behind
+      (near tier synchronously, far tier from a background thread that
+      coalesces pending writes per key).
+    - Negative caching: a far miss is remembered for ``negative_ttl`` seconds
+      so repeated lookups of absent keys never leave the process.
+    """
+
+    def __init__(
+        self,
+        near: CacheInterface,
+        far: CacheInterface,
+        write_mode: str = "write-through",
+        near_ttl: Optional[int] = 300,
+        negative_ttl: int = 0,
+        negative_max_size: int = 10_000,
+        write_behind_interval: float = 0.5,
+    ):
+        """
+        Initialize tiered cache
+
+        Args:
+            near: Small, fast in-process tier (e.g. InMemoryCache with max_size)
+            far: Larger shared/persistent tier (file, segment or Redis cache)
+            write_mode: "write-through" or "write-behind"
+            near_ttl: Upper bound for TTL of near entries (None for far TTL only)
+            negative_ttl: Seconds to remember far misses (0 disables negative caching)
+            negative_max_size: Maximum remembered misses
+            write_behind_interval: Max delay before pending far writes are flushed
+        """
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"Unknown write mode: {write_mode}")
+
+        self.near = near
+        self.far = far
+        self.write_mode = write_mode
+        self.near_ttl = near_ttl
+        self.negative_ttl = negative_ttl
+        self.negative_max_size = negative_max_size
+        self.write_behind_interval = write_behind_interval
+
+        self._stats = TieredCacheStats()
+        self._negative: "OrderedDict[str, float]" = OrderedDict()
+        self._negative_lock = threading.Lock()
+
+        # Write-behind state: key -> (value or _DELETE, ttl)
+        self._pending: "OrderedDict[str, Tuple[Any, Optional[int]]]" = OrderedDict()
+        self._pending_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        if write_mode == "write-behind":
+            self._writer = threading.Thread(target=self._write_behind_loop, daemon=True)
+            self._writer.start()
+
+    # ---------- helpers ----------
+    def _near_ttl(self, ttl: Optional[int]) -> Optional[int]:
+        if self.near_ttl is None:
+            return ttl
+        if ttl is None:
+            return self.near_ttl
+        return min(ttl, self.near_ttl)
+
+    def _is_negative(self, key: str) -> bool:
+        if not self.negative_ttl:
+            return False
+        with self._negative_lock:
+            expires_at = self._negative.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.time():
+                del self._negative[key]
+                return False
+            return True
+
+    def _remember_miss(self, key: str) -> None:
+        if not self.negative_ttl:
+            return
+        with self._negative_lock:
+            self._negative[key] = time.time() + self.negative_ttl
+            self._negative.move_to_end(key)
+            while len(self._negative) > self.negative_max_size:
+                self._negative.popitem(last=False)
+
+    def _forget_miss(self, key: str) -> None:
+        if self.negative_ttl:
+            with self._negative_lock:
+                self._negative.pop(key, None)
+
+    def _pending_item(self, key: str) -> Optional[Tuple[Any, Optional[int]]]:
+        with self._pending_lock:
+            return self._pending.get(key)
+
+    def _pending_value(self, key: str) -> Any:
+        item = self._pending_item(key)
+        return _MISSING if item is None else item[0]
+
+    def _promote(self, hits: Dict[str, Tuple[Any, Optional[int]]]) -> None:
+        """Copy far-tier hits (key -> (value, far TTL)) into the near tier, never outliving the far entry"""
+        by_ttl: Dict[Optional[int], Dict[str, Any]] = {}
+        for key, (value, far_ttl) in hits.items():
+            if far_ttl is not None and far_ttl <= 0:
+                continue  # expires within a second; a TTL of 0 would mean "no expiry"
+            by_ttl.setdefault(self._near_ttl(far_ttl), {})[key] = value
+        for near_ttl, mapping in by_ttl.items():
+            self.near.set_many(mapping, near_ttl)
+
+    # ---------- write-behind ----------
+    def _enqueue(self, key: str, value: Any, ttl: Optional[int]) -> None:
+        with self._pending_lock:
+            self._pending[key] = (value, ttl)
+            self._pending.move_to_end(key)
+            self._idle.clear()
+        self._pending_event.set()
+
+    def _write_behind_loop(self) -> None:
+        while not self._stop.is_set():
+            self._pending_event.wait(self.write_behind_interval)
+            self._pending_event.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        # Entries stay visible in _pending until they reached the far tier
+        with self._pending_lock:
+            batch = list(self._pending.items())
+        for key, item in batch:
+            value, ttl = item
+            try:
+                if value is _DELETE:
+                    self.far.delete(key)
+                    self._stats.write_behind_flushed += 1
+                elif self.far.set(key, value, ttl):
+                    self._stats.write_behind_flushed += 1
+                else:
+                    self._stats.write_behind_errors += 1
+            except Exception as e:
+                self._stats.write_behind_errors += 1
+                logger.warning(f"Write-behind to far tier failed for {key}: {e}")
+            with self._pending_lock:
+                # A newer write for the same key is left for the next round
+                if self._pending.get(key) is item:
+                    del self._pending[key]
+        with self._pending_lock:
+            if not self._pending:
+                self._idle.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until pending write-behind operations reached the far tier"""
+        if self._writer is None:
+            return True
+        self._pending_event.set()
+        return self._idle.wait(timeout)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the write-behind thread"""
+        if self._writer is not None:
+            self.flush(timeout=10)
+            self._stop.set()
+            self._pending_event.set()
+            self._writer.join(timeout=5)
+            self._writer = None
+
+    # ---------- CacheInterface ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retrieve value: near tier, then far tier (read-through)"""
+        value = self.near.get(key, _MISSING)
+        if value is not _MISSING:
+            self._stats.record_near_hit()
+            return value
+
+        if self._is_negative(key):
+            self._stats.record_negative_hit()
+            return default
+
+        item = self._pending_item(key)
+        if item is None:
+            item = self.far.get_many_with_ttl([key], _MISSING)[key]
+        value, far_ttl = item
+        if value is _MISSING or value is _DELETE:
+            self._remember_miss(key)
+            self._stats.record_miss()
+            return default
+
+        self._promote({key: (value, far_ttl)})
+        self._stats.record_far_hit()
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store value in both tiers (synchronously or write-behind)"""
+        self._forget_miss(key)
+        near_ok = self.near.set(key, value, self._near_ttl(ttl))
+        if self.write_mode == "write-behind":
+            self._enqueue(key, value, ttl)
+            ok = near_ok
+        else:
+            ok = self.far.set(key, value, ttl)
+            if not ok:
+                # Keep tiers consistent: a failed far write must not leave a near-only value
+                self.near.delete(key)
+        if ok:
+            self._stats.record_set()
+        return ok
+
+    def delete(self, key: str) -> bool:
+        """Delete key from both tiers"""
+        self._forget_miss(key)
+        near_deleted = self.near.delete(key)
+        if self.write_mode == "write-behind":
+            pending = self._pending_value(key)
+            self._enqueue(key, _DELETE, None)
+            far_deleted = (pending is not _MISSING and pending is not _DELETE) or self.far.exists(key)
+        else:
+            far_deleted = self.far.delete(key)
+        deleted = near_deleted or far_deleted
+        if deleted:
+            self._stats.record_delete()
+        return deleted
+
+    def get_many(self, keys: List[str], default: Any = None) -> Dict[str, Any]:
+        """Retrieve several values; near misses go to the far tier in one batch"""
+        result: Dict[str, Any] = {}
+        far_keys: List[str] = []
+        for key, value in self.near.get_many(keys, _MISSING).items():
+            if value is not _MISSING:
+                self._stats.record_near_hit()
+                result[key] = value
+            elif self._is_negative(key):
+                self._stats.record_negative_hit()
+                result[key] = default
+            else:
+                pending = self._pending_value(key)
+                if pending is _MISSING:
+                    far_keys.append(key)
+                elif pending is _DELETE:
+                    self._stats.record_miss()
+                    result[key] = default
+                else:
+                    self._stats.record_far_hit()
+                    result[key] = pending
+
+        if far_keys:
+            hits: Dict[str, Tuple[Any, Optional[int]]] = {}
+            for key, item in self.far.get_many_with_ttl(far_keys, _MISSING).items():
+                if item[0] is _MISSING:
+                    self._remember_miss(key)
+                    self._stats.record_miss()
+                    result[key] = default
+                else:
+                    self._stats.record_far_hit()
+                    hits[key] = item
+                    result[key] = item[0]
+            self._promote(hits)
+        return {key: result[key] for key in keys}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Store several values in both tiers (far tier written as one batch)"""
+        if not mapping:
+            return True
+        for key in mapping:
+            self._forget_miss(key)
+        near_ok = self.near.set_many(mapping, self._near_ttl(ttl))
+        if self.write_mode == "write-behind":
+            for key, value in mapping.items():
+                self._enqueue(key, value, ttl)
+            ok = near_ok
+        else:
+            ok = self.far.set_many(mapping, ttl)
+            if not ok:
+                self.near.delete_many(list(mapping))
+        if ok:
+            for _ in mapping:
+                self._stats.record_set()
+        return ok
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys from both tiers"""
+        if self.write_mode == "write-behind":
+            return sum(1 for key in keys if self.delete(key))
+        for key in keys:
+            self._forget_miss(key)
+        self.near.delete_many(keys)
+        deleted = self.far.delete_many(keys)
+        for _ in range(deleted):
+            self._stats.record_delete()
+        return deleted
+
+    def clear(self) -> bool:
+        """Clear both tiers"""
+        with self._pending_lock:
+            self._pending.clear()
+            self._idle.set()
+        with self._negative_lock:
+            self._negative.clear()
+        ok = self.near.clear() and self.far.clear()
+        if ok:
+            self._stats.record_clear()
+        return ok
+
+    def exists(self, key: str) -> bool:
+        """Check if key exists in either tier"""
+        if self.near.exists(key):
+            return True
+        if self._is_negative(key):
+            return False
+        pending = self._pending_value(key)
+        if pending is not _MISSING:
+            return pending is not _DELETE
+        return self.far.exists(key)
+
+    def keys(self, pattern: Optional[str] = None) -> List[str]:
+        """Get list of keys across both tiers"""
+        keys = set(self.far.keys(pattern)) | set(self.near.keys(pattern))
+        with self._pending_lock:
+            for key, (value, _) in self._pending.items():
+                if value is _DELETE:
+                    keys.discard(key)
+        return list(keys)
+
+    def get_stats(self) -> TieredCacheStats:
+        """Get composite statistics with per-tier hit counters"""
+        return self._stats
+
+    def get_tier_stats(self) -> Dict[str, CacheStats]:
+        """Get the underlying tiers' own statistics"""
+        return {"near": self.near.get_stats(), "far": self.far.get_stats()}
+
+    def get_ttl(self, key: str) -> Optional[int]:
+        """Get remaining TTL (far tier is authoritative)"""
+        ttl = self.far.get_ttl(key)
+        return ttl if ttl is not None else self.near.get_ttl(key)
+
+    def set_ttl(self, key: str, ttl: int) -> bool:
+        """Set TTL for existing key in both tiers"""
+        self.flush()
+        far_ok = self.far.set_ttl(key, ttl)
+        near_ok = self.near.set_ttl(key, self._near_ttl(ttl))
+        return far_ok or near_ok
+
+    def get_size(self) -> int:
+        """Get current cache size (far tier is the superset)"""
+        self.flush()
+        return self.far.get_size()
+
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Get memory usage of both tiers"""
+        with self._pending_lock:
+            pending = len(self._pending)
+        far_usage = self.far.get_memory_usage()
+        return {
+            # Far tier holds every entry; reported at top level for metrics
+            "entry_count": far_usage.get("entry_count", far_usage.get("file_count")),
+            "total_bytes": far_usage.get("total_bytes"),
+            "near": self.near.get_memory_usage(),
+            "far": far_usage,
+            "write_mode": self.write_mode,
+            "write_behind_pending": pending,
+            "negative_entries": len(self._negative),
+            "tier_stats": self._stats.to_dict(),
+        }
@@ -7,6 +7,16 @@ DEFAULT_API_TIMEOUT = 10.0
 DEFAULT_LLM_TIMEOUT = 60.0
 DEFAULT_CODE_EXECUTION_TIMEOUT = 5.0
 
+# Worker threads for draining synchronous LLM runner iterators
+DEFAULT_LLM_RUNNER_THREADS = 8
+
+# Max LLM agent executions in flight per event loop, shared by all tools
+DEFAULT_LLM_MAX_CONCURRENCY = 8
+
+# Reusable LLM executor pool: max executors kept, idle seconds before eviction
+DEFAULT_LLM_EXECUTOR_POOL_SIZE = 32
+DEFAULT_LLM_EXECUTOR_IDLE_TTL = 600.0
+
 # Default retry configuration
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_RETRY_DELAY = 1.0
@@ -7,6 +7,14 @@ import time
 
 from schemas.core import ToolInput, ToolOutput
 from common.logger import LoggerFactory, LoggerType, LogLevel
+from common.cache.cache_interface import CacheInterface
+from common.cache.cache_factory import CacheFactory, CacheType
+from common.cache.in_memory_cache import InMemoryCache
+from common.cache.sharded_memory_cache import ShardedInMemoryCache
+from common.cache.cache_keys import stable_hash
+
+# Entry bound of the default shared in-memory tool result cache
+DEFAULT_TOOL_CACHE_SIZE = 1024
 
 
 class BaseTool(ABC):
@@ -22,6 +30,7 @@ class BaseTool(ABC):
         verbose: bool = False,
         cache_enabled: bool = False,
         cache_ttl: int = 300,  # 5 minutes
+        cache: Optional[CacheInterface] = None,
     ):
         """Initialize the tool.
 
@@ -34,6 +43,10 @@ class BaseTool(ABC):
             verbose: Whether to log detailed information
             cache_enabled: Whether to cache tool execution results
             cache_ttl: Time-to-live for cached results in seconds
+            cache: Cache backend for results. Defaults to the process-wide
+                "tool_results" cache of type config["cache_backend"] (a CacheType
+                value, "memory" by default; constructor options in
+                config["cache_options"]), shared by all tools
         """
         self.name = name
         self.description = description
@@ -51,7 +64,32 @@ class BaseTool(ABC):
         # Cache configuration
         self.cache_enabled = cache_enabled
         self.cache_ttl = cache_ttl
-        self._cache = {}  # {input_hash: (output, timestamp)}
+        self._cache: Optional[CacheInterface] = cache
+        if cache_enabled and cache is None:
+            self._cache = self._create_cache()
+
+    def _create_cache(self) -> CacheInterface:
+        """Get the shared result cache backend configured for tools."""
+        backend = self.config.get("cache_backend", CacheType.MEMORY.value)
+        options = dict(self.config.get("cache_options", {}))
+        if backend == CacheType.MEMORY.value:
+            options.setdefault("max_size", DEFAULT_TOOL_CACHE_SIZE)
+        try:
+            return CacheFactory.get_cache(
+                name="tool_results", cache_type=CacheType(backend), **options
+            )
+        except Exception as e:
+            self.logger.warning(f"Tool cache backend '{backend}' unavailable: {e}")
+            return CacheFactory.get_cache(
+                name="tool_results",
+                cache_type=CacheType.MEMORY,
+                max_size=DEFAULT_TOOL_CACHE_SIZE,
+            )
+
+    @property
+    def _cache_is_local(self) -> bool:
+        """Whether cached outputs are kept as objects (no serialization, copied on get/set)."""
+        return isinstance(self._cache, (InMemoryCache, ShardedInMemoryCache))
 
     @abstractmethod
     async def _execute(self, input_data: ToolInput) -> Any:
@@ -124,33 +162,51 @@ class BaseTool(ABC):
             raise
 
     def _get_cache_key(self, input_data: ToolInput) -> str:
-        """Generate a cache key from input data."""
+        """Generate a cache key from input data (stable across processes)."""
         try:
-            # Use JSON string representation which is always hashable
-            return str(hash(input_data.model_dump_json()))
+            config = {
+                k: v for k, v in self.config.items() if not k.startswith("cache_")
+            }
+            return f"tool:{self.name}:{stable_hash(self.name, config, input_data)}"
         except Exception as e:
             # Fallback in case of serialization issues
             self.logger.warning(f"Error generating cache key: {e}")
-            return str(id(input_data))  # Use object ID as fallback
+            return f"tool:{self.name}:id:{id(input_data)}"  # Use object ID as fallback
 
     def _get_from_cache(self, key: str) -> Optional[ToolOutput]:
         """Get a result from cache if it exists and is not expired."""
-        if key in self._cache:
-            output, timestamp = self._cache[key]
-            if time.time() - timestamp < self.cache_ttl:
-                return output
-            else:
-                # Remove expired entry
-                del self._cache[key]
-        return None
+        if self._cache is None:
+            return None
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        if isinstance(cached, self.output_schema):
+            # The shared entry is a live object; callers get their own copy
+            return cached.model_copy(deep=True)
+        try:
+            # Serializing backends return the dumped output
+            return self.output_schema.model_validate(cached)
+        except ValidationError:
+            self._cache.delete(key)
+            return None
 
     def _add_to_cache(self, key: str, output: ToolOutput) -> None:
         """Add a result to the cache."""
-        self._cache[key] = (output, time.time())
+        if self._cache is None:
+            return
+        if self._cache_is_local:
+            # Copy so later changes to the returned output do not reach the cache
+            value = output.model_copy(deep=True)
+        else:
+            value = output.model_dump(mode="json")
+        self._cache.set(key, value, self.cache_ttl)
 
     def clear_cache(self) -> None:
         """Clear the tool's cache."""
-        self._cache = {}
+        if self._cache is None:
+            return
+        # The backend is shared: only drop this tool's entries
+        self._cache.delete_many(self._cache.keys(f"tool:{self.name}:*"))
 
     async def cleanup(self) -> None:
         """Clean up resources used by the tool."""
@@ -26,7 +26,7 @@ import os, shutil
 import argparse
 
 from dotenv import load_dotenv
-from kat.utils.llm.gpt.gpt import GPTChatCompletion
+from kat.utils.llm.gpt.gpt import GPTChatCompletion, GPTCompletionError
 from kat.utils.swagger_utils.swagger_utils import find_object_with_key, get_endpoint_id, get_endpoint_params, get_ref, get_required_fields
 load_dotenv()
 
@@ -147,7 +147,11 @@ class TestDataGenerator:
     
         
     def get_data_from_gpt(self, prompt: str) -> str:
-        response = GPTChatCompletion(prompt, system="", temperature=0.0)
+        try:
+            response = GPTChatCompletion(prompt, system="", temperature=0.0)
+        except GPTCompletionError as e:
+            print(f"[WARN] GPT data generation failed: {e}")
+            return ""
         if response:
             self.input_token_count += len(prompt)
             self.output_token_count += len(response)
@@ -1,4 +1,4 @@
-from kat.utils.llm.gpt.gpt import GPTChatCompletion
+from kat.utils.llm.gpt.gpt import GPTChatCompletion, GPTCompletionError
 from kat.document_parser.document_parser import extract_endpoints, get_swagger_spec, write_anything_to_file
 import logging
 import json
@@ -99,7 +99,11 @@ class InterParamsDependencyTool:
         request_data = {endpoint: request_data_dict}
         prompt = DETECT_INTER_PARAM_DEPENDENCIES_PROMPT.format(request_data=json.dumps(request_data))
 
-        response = GPTChatCompletion(prompt, system="", temperature=0.0, max_tokens=1024)
+        try:
+            response = GPTChatCompletion(prompt, system="", temperature=0.0, max_tokens=1024)
+        except GPTCompletionError as e:
+            print(f"[WARN] Cannot detect inter-parameter dependencies of {endpoint}: {e}")
+            return ""
         return "" if response.startswith("No dependencies") else response
 
     def get_inter_param_validation_script(self, endpoint: str, part: str = "all", constraints="") -> str:
@@ -122,7 +126,11 @@ class InterParamsDependencyTool:
             context=constraints
         )
 
-        validation_script = GPTChatCompletion(prompt, system="", temperature=0.0)
+        try:
+            validation_script = GPTChatCompletion(prompt, system="", temperature=0.0)
+        except GPTCompletionError as e:
+            print(f"[WARN] Cannot generate validation script for {endpoint}: {e}")
+            return ""
         validation_script += "\n\nprint(validate_request_data({request_data_item}))"
         return validation_script
 
@@ -14,7 +14,7 @@ from kat.operation_dependency_graph.odg_prompting import *
 from difflib import SequenceMatcher
 
 from kat.document_parser.document_parser import extract_endpoints, get_swagger_spec
-from kat.utils.llm.gpt.gpt import GPTChatCompletion
+from kat.utils.llm.gpt.gpt import GPTChatCompletion, GPTChatCompletionBatch, GPTCompletionError
 from kat.utils.swagger_utils.swagger_utils import get_endpoint_params, get_endpoints_belong_to_schemas, get_simplified_schema
 
 # Config create resource endpoints, POST or both POST and GET
@@ -169,7 +169,11 @@ class ODGGenerator():
                 prompt = base_prompt.format(specific_schema=f"{schema}:\n{self.simplified_schemas[schema]}", simplified_schemas=simplified_schemas)
                 
                 self.input_token_count += len(prompt)
-                response = GPTChatCompletion(prompt, system="", temperature=0.0)
+                try:
+                    response = GPTChatCompletion(prompt, system="", temperature=0.0)
+                except GPTCompletionError as e:
+                    print(f"[WARN] Skip schema group of {schema}: {e}")
+                    continue
                 if response:
                     self.output_token_count += len(response)
             
@@ -310,7 +314,11 @@ class ODGGenerator():
                 
             # Generate descriptions of the endpoint's parameters
             prompt = GET_PARAM_DESCRIPTION_PROMPT.format(specific_endpoint_params=specific_endpoint_params)
-            parameter_description = GPTChatCompletion(prompt, system="", temperature=0.0)
+            try:
+                parameter_description = GPTChatCompletion(prompt, system="", temperature=0.0)
+            except GPTCompletionError as e:
+                print(f"[WARN] No parameter description for {endpoint}: {e}")
+                parameter_description = ""
             if parameter_description:
                 self.input_token_count += len(prompt)
                 self.output_token_count += len(parameter_description)
@@ -318,6 +326,7 @@ class ODGGenerator():
             else:
                 parameter_description = ""
             
+            prompts = []
             for schemas in schema_groups:
                 # Create context about schema with enhanced nested path information
                 schema_context = ""
@@ -325,9 +334,16 @@ class ODGGenerator():
                     enhanced_schema_info = self.enhance_schema_context_with_paths(schema, self.simplified_schemas[schema])
                     schema_context += f"\n{enhanced_schema_info}"
                 
-                prompt = base_prompt.format(specific_endpoint_params=specific_endpoint_params, parameter_description=parameter_description, simplified_schemas=schema_context)
-                
-                response = GPTChatCompletion(prompt, system="", temperature=0.0)
+                prompts.append(base_prompt.format(specific_endpoint_params=specific_endpoint_params, parameter_description=parameter_description, simplified_schemas=schema_context))
+            
+            # Các nhóm schema độc lập với nhau nên gửi song song; nhóm lỗi bị bỏ qua riêng
+            responses = GPTChatCompletionBatch(prompts, system="", temperature=0.0, return_exceptions=True)
+            for prompt, response in zip(prompts, responses):
+                if isinstance(response, GPTCompletionError):
+                    print(f"[WARN] Skip a schema group of {endpoint}: {response}")
+                    continue
+                if isinstance(response, BaseException):
+                    raise response
                 if response:
                     self.input_token_count += len(prompt)
                     self.output_token_count += len(response)
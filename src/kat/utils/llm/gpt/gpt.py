@@ -1,10 +1,17 @@
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
 import os
 import time
+import random
+import asyncio
 import datetime
+import threading
+import weakref
 from pathlib import Path
+from typing import List, Optional
 from dotenv import load_dotenv
 
+from kat.utils.llm.gpt.gpt_cache import response_cache, caller_stage, GPTCacheMiss
+
 load_dotenv()
 
 # Khởi tạo client Azure OpenAI
@@ -18,6 +25,26 @@ client = AzureOpenAI(
     api_key=AZURE_OPENAI_KEY,
 )
 
+# Retry do agpt_chat_completion tự xử lý (backoff + rate limit), tắt retry của SDK
+# để một lần gọi không bị nhân thành (GPT_MAX_RETRIES + 1) x (SDK retries + 1) request
+async_client = AsyncAzureOpenAI(
+    api_version=AZURE_OPENAI_API_VERSION,
+    azure_endpoint=AZURE_OPENAI_ENDPOINT,
+    api_key=AZURE_OPENAI_KEY,
+    max_retries=0,
+)
+
+# Giới hạn đồng thời / rate limit (có thể chỉnh qua biến môi trường)
+GPT_MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", "8"))
+GPT_REQUESTS_PER_MINUTE = int(os.getenv("GPT_REQUESTS_PER_MINUTE", "120"))
+GPT_TOKENS_PER_MINUTE = int(os.getenv("GPT_TOKENS_PER_MINUTE", "150000"))
+GPT_MAX_RETRIES = int(os.getenv("GPT_MAX_RETRIES", "6"))
+GPT_BACKOFF_BASE = float(os.getenv("GPT_BACKOFF_BASE", "1.0"))
+GPT_BACKOFF_MAX = float(os.getenv("GPT_BACKOFF_MAX", "60.0"))
+
+# Ước lượng số token output khi max_tokens=-1 (dùng cho token bucket)
+DEFAULT_COMPLETION_TOKENS = 1024
+
 # Setup log folder
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -30,40 +57,221 @@ def log_to_file(content: str):
         f.write(f"\n[{ts}] {content}\n")
 
 
-def GPTChatCompletion(prompt, system="", model='gpt-4.1', temperature=0, top_p=1, max_tokens=-1):
+class GPTCompletionError(RuntimeError):
+    """Lỗi khi gọi GPT thất bại sau khi đã retry hết số lần cho phép"""
+
+
+class TokenBucket:
     """
-    Hàm giữ nguyên interface cũ nhưng chạy bằng Azure OpenAI.
-    - model: chính là tên deployment trên Azure (vd: 'gpt-4.1-deploy')
-    - max_tokens=-1 nghĩa là để API tự quyết định (None)
+    Token bucket dùng chung cho mọi thread / event loop.
+    - capacity: số đơn vị tối đa trong 1 phút
+    - acquire() trả về thời gian (giây) cần chờ; phần đã đặt trước được trừ
+      ngay (số dư có thể âm) nên các request chờ theo thứ tự, không tranh nhau
     """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        # Một request lớn hơn capacity vẫn được phép, chỉ phải chờ bucket đầy
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        # Điều chỉnh lại sau khi biết số token thực tế (amount âm = trừ thêm)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+request_bucket = TokenBucket(GPT_REQUESTS_PER_MINUTE)
+token_bucket = TokenBucket(GPT_TOKENS_PER_MINUTE)
+
+# Semaphore của asyncio gắn với event loop, nên mỗi loop có một semaphore riêng;
+# các lời gọi sync đều chạy trên cùng một background loop nên dùng chung một cái
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(GPT_MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def _build_messages(prompt, system):
     if system:
-        messages = [
+        return [
             {"role": "system", "content": system},
             {"role": "user", "content": prompt}
         ]
-    else:
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
+    return [
+        {"role": "user", "content": prompt}
+    ]
 
-    while True:
+
+def _estimate_tokens(messages, max_tokens) -> int:
+    # ~4 ký tự / token, đủ chính xác cho rate limit
+    prompt_tokens = sum(len(m["content"]) for m in messages) // 4 + 1
+    return prompt_tokens + (max_tokens if max_tokens != -1 else DEFAULT_COMPLETION_TOKENS)
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Lỗi 4xx (trừ 408/409/429) là lỗi của request, retry cũng không có tác dụng
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return True
+    return status in (408, 409, 429) or status >= 500
+
+
+def _backoff_delay(attempt: int, error: Exception) -> float:
+    # Ưu tiên Retry-After của server (429), nếu không có thì exponential backoff + full jitter
+    response = getattr(error, "response", None)
+    retry_after = None
+    if response is not None:
         try:
-            kwargs = dict(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                top_p=top_p
-            )
-            if max_tokens != -1:
-                kwargs["max_tokens"] = max_tokens
-
-            response = client.chat.completions.create(**kwargs)
-            output = response.choices[0].message.content
+            retry_after = float(response.headers.get("retry-after"))
+        except (TypeError, ValueError, AttributeError):
+            retry_after = None
+    if retry_after is not None:
+        return min(retry_after, GPT_BACKOFF_MAX)
+    return random.uniform(0, min(GPT_BACKOFF_MAX, GPT_BACKOFF_BASE * (2 ** attempt)))
 
 
+async def agpt_chat_completion(prompt, system="", model='gpt-4.1', temperature=0, top_p=1, max_tokens=-1, max_retries=None, stage=None):
+    """
+    Phiên bản async của GPTChatCompletion.
+    - Response được cache theo nội dung (xem gpt_cache); stage dùng để thống kê
+      hit/miss, mặc định suy ra từ module gọi
+    - Giới hạn số request đồng thời bằng semaphore (GPT_MAX_CONCURRENCY)
+    - Rate limit theo request/phút và token/phút (token bucket)
+    - Lỗi được retry với exponential backoff + jitter, tối đa max_retries lần,
+      sau đó raise GPTCompletionError
+    """
+    stage = stage or caller_stage()
+    cache_key = response_cache.make_key(prompt, system, model, temperature, top_p, max_tokens)
+    cached = response_cache.lookup(cache_key, stage)
+    if cached is not None:
+        return cached
+
+    messages = _build_messages(prompt, system)
+    kwargs = dict(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        top_p=top_p
+    )
+    if max_tokens != -1:
+        kwargs["max_tokens"] = max_tokens
+
+    retries = GPT_MAX_RETRIES if max_retries is None else max_retries
+    estimated_tokens = _estimate_tokens(messages, max_tokens)
+    semaphore = _get_semaphore()
+
+    attempt = 0
+    while True:
+        wait = max(request_bucket.reserve(1), token_bucket.reserve(estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        try:
+            async with semaphore:
+                response = await async_client.chat.completions.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                token_bucket.refund(estimated_tokens - usage.total_tokens)
+            output = response.choices[0].message.content
+            response_cache.store(cache_key, output, stage)
             return output
 
         except Exception as e:
-            log_to_file(f"[AzureOpenAI Error] {e}")
+            log_to_file(f"[AzureOpenAI Error] (attempt {attempt + 1}) {e}")
             print(f"[AzureOpenAI Error] {e}")
-            time.sleep(10)
+            if attempt >= retries or not _is_retryable(e):
+                raise GPTCompletionError(f"GPT call failed after {attempt + 1} attempt(s): {e}") from e
+            await asyncio.sleep(_backoff_delay(attempt, e))
+            attempt += 1
+
+
+async def agpt_chat_completion_many(
+    prompts: List[str], system="", stage=None, return_exceptions=False, **kwargs
+) -> List[str]:
+    """
+    Gửi nhiều prompt song song (vẫn chịu giới hạn semaphore + rate limit), giữ thứ tự kết quả.
+    Prompt trùng nhau chỉ được gửi một lần.
+    - return_exceptions=True: prompt thất bại trả về exception ở đúng vị trí của nó
+      thay vì làm hỏng cả batch (giống asyncio.gather)
+    """
+    stage = stage or caller_stage()
+    unique_prompts = list(dict.fromkeys(prompts))
+    responses = await asyncio.gather(
+        *[agpt_chat_completion(prompt, system, stage=stage, **kwargs) for prompt in unique_prompts],
+        return_exceptions=return_exceptions,
+    )
+    by_prompt = dict(zip(unique_prompts, responses))
+    return [by_prompt[prompt] for prompt in prompts]
+
+
+# Background event loop cho các lời gọi sync (chạy trong một daemon thread)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="gpt-client-loop", daemon=True).start()
+        return _loop
+
+
+def _run_sync(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
+
+
+def GPTChatCompletion(prompt, system="", model='gpt-4.1', temperature=0, top_p=1, max_tokens=-1):
+    """
+    Hàm giữ nguyên interface cũ nhưng chạy bằng Azure OpenAI.
+    - model: chính là tên deployment trên Azure (vd: 'gpt-4.1-deploy')
+    - max_tokens=-1 nghĩa là để API tự quyết định (None)
+    - Chạy agpt_chat_completion trên background loop nên dùng chung
+      semaphore / rate limit với mọi thread khác
+    - Khác bản cũ (retry vô hạn): raise GPTCompletionError khi hết số lần retry,
+      các stage KAT bắt lỗi này và bỏ qua phần kết quả tương ứng
+    """
+    return _run_sync(agpt_chat_completion(
+        prompt, system, model, temperature, top_p, max_tokens, stage=caller_stage()
+    ))
+
+
+def get_gpt_cache_stats():
+    """Thống kê hit/miss/write của cache GPT theo từng stage KAT"""
+    return response_cache.get_stats()
+
+
+def GPTChatCompletionBatch(prompts, system="", model='gpt-4.1', temperature=0, top_p=1, max_tokens=-1,
+                           return_exceptions=False):
+    """
+    Bản sync của agpt_chat_completion_many: trả về list response theo đúng thứ tự prompts.
+    Raise GPTCompletionError nếu một prompt thất bại sau khi đã retry hết, trừ khi
+    return_exceptions=True: khi đó lỗi nằm trong list, các prompt khác vẫn giữ kết quả
+    """
+    return _run_sync(agpt_chat_completion_many(
+        prompts, system, stage=caller_stage(), return_exceptions=return_exceptions,
+        model=model, temperature=temperature, top_p=top_p, max_tokens=max_tokens
+    ))
@@ -0,0 +1,126 @@
+import os
+import sys
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from common.cache.cache_factory import CacheFactory, CacheType
+from common.cache.cache_interface import CacheInterface
+from common.cache.cache_keys import stable_hash
+
+# Chế độ cache cho các lời gọi GPT của KAT (biến môi trường GPT_CACHE_MODE):
+# - "off":        không dùng cache
+# - "read_write": đọc cache trước, miss thì gọi GPT rồi ghi lại (mặc định)
+# - "replay":     chỉ đọc cache, miss thì raise GPTCacheMiss -> chạy offline, tất định
+# - "refresh":    luôn gọi GPT và ghi đè cache
+CACHE_MODES = ("off", "read_write", "replay", "refresh")
+
+GPT_CACHE_MODE = os.getenv("GPT_CACHE_MODE", "read_write")
+GPT_CACHE_TYPE = os.getenv("GPT_CACHE_TYPE", "file")  # file | segment | redis
+GPT_CACHE_DIR = os.getenv("GPT_CACHE_DIR", ".cache/kat_gpt")
+GPT_CACHE_TTL = int(os.getenv("GPT_CACHE_TTL", "0")) or None  # 0 = không hết hạn
+
+KEY_PREFIX = "kat_gpt:"
+
+
+class GPTCacheMiss(LookupError):
+    """Prompt chưa có trong cache khi chạy ở chế độ replay"""
+
+
+class GPTResponseCache:
+    """
+    Cache prompt -> response, địa chỉ hoá theo nội dung:
+    key = hash(model, temperature, top_p, max_tokens, system, prompt).
+    Mặc định là TieredCache (LRU trong RAM + file cache trên đĩa) nên chạy lại
+    trên spec không đổi không tốn lời gọi GPT nào. Thống kê hit/miss theo stage.
+    """
+
+    def __init__(self, cache: Optional[CacheInterface] = None, mode: str = GPT_CACHE_MODE, ttl: Optional[int] = GPT_CACHE_TTL):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown GPT cache mode: {mode}")
+        self.mode = mode
+        self.ttl = ttl
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "writes": 0})
+
+    @property
+    def cache(self) -> CacheInterface:
+        # Tạo lười để import module không đụng tới đĩa / Redis
+        if self._cache is None:
+            if GPT_CACHE_TYPE == CacheType.REDIS.value:
+                far_options = {"key_prefix": KEY_PREFIX, "serialization": "json"}
+            else:
+                far_options = {"cache_dir": GPT_CACHE_DIR}
+            self._cache = CacheFactory.get_cache(
+                name="kat_gpt",
+                cache_type=CacheType.TIERED,
+                far_type=GPT_CACHE_TYPE,
+                far_options=far_options,
+                near_max_size=512,
+            )
+        return self._cache
+
+    @staticmethod
+    def make_key(prompt, system, model, temperature, top_p, max_tokens) -> str:
+        return KEY_PREFIX + stable_hash(model, float(temperature), float(top_p), max_tokens, system, prompt)
+
+    def _count(self, stage: str, field: str):
+        with self._lock:
+            self._stats[stage][field] += 1
+
+    def lookup(self, key: str, stage: str) -> Optional[str]:
+        """Trả về response đã cache (None nếu miss hoặc không đọc cache)"""
+        if self.mode in ("off", "refresh"):
+            return None
+        response = self.cache.get(key)
+        if response is not None:
+            self._count(stage, "hits")
+            return response
+        self._count(stage, "misses")
+        if self.mode == "replay":
+            raise GPTCacheMiss(f"No cached GPT response for {key} (stage: {stage})")
+        return None
+
+    def store(self, key: str, response: Optional[str], stage: str):
+        if self.mode == "off" or not response:
+            return
+        if self.cache.set(key, response, self.ttl):
+            self._count(stage, "writes")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            stats = {stage: dict(counts) for stage, counts in self._stats.items()}
+        for counts in stats.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = counts["hits"] / total if total else 0.0
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+response_cache = GPTResponseCache()
+
+
+def set_cache_mode(mode: str):
+    """Đổi chế độ cache lúc chạy (vd: 'replay' để chạy offline)"""
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown GPT cache mode: {mode}")
+    response_cache.mode = mode
+
+
+def caller_stage(depth: int = 2) -> str:
+    """
+    Tên stage KAT của nơi gọi, suy ra từ module
+    (vd: kat.operation_dependency_graph.odg_generator -> operation_dependency_graph)
+    """
+    try:
+        module = sys._getframe(depth).f_globals.get("__name__", "")
+    except ValueError:
+        return "unknown"
+    parts = module.split(".")
+    if len(parts) >= 2 and parts[0] == "kat":
+        return parts[1]
+    return module or "unknown"
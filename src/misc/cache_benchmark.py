@@ -0,0 +1,104 @@
+# src/misc/cache_benchmark.py
+
+"""
+Contention benchmark: InMemoryCache vs ShardedInMemoryCache
+
+Run from src/:  python -m misc.cache_benchmark [--threads 8] [--ops 50000]
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Callable, Dict
+
+from common.cache import InMemoryCache, ShardedInMemoryCache
+from common.logger import LoggerFactory, LoggerType, LogLevel
+
+logger = LoggerFactory.get_logger(
+    name="cache-benchmark",
+    logger_type=LoggerType.STANDARD,
+    level=LogLevel.INFO,
+    use_colors=True,
+)
+
+
+def run_contention(cache, threads: int, ops: int, key_space: int) -> Dict[str, float]:
+    """Each thread does ``ops`` operations (80% get, 20% set with TTL)."""
+    barrier = threading.Barrier(threads + 1)
+    latencies = []
+    lat_lock = threading.Lock()
+
+    def worker(seed: int):
+        rnd = random.Random(seed)
+        worst = 0.0
+        barrier.wait()
+        for _ in range(ops):
+            key = f"key:{rnd.randrange(key_space)}"
+            start = time.perf_counter()
+            if rnd.random() < 0.8:
+                cache.get(key)
+            else:
+                cache.set(key, {"v": key}, ttl=rnd.randint(1, 30))
+            worst = max(worst, time.perf_counter() - start)
+        with lat_lock:
+            latencies.append(worst)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ops_per_sec": threads * ops / elapsed,
+        "elapsed_s": elapsed,
+        "worst_op_ms": max(latencies) * 1000,
+    }
+
+
+def run_expiry_pause(factory: Callable[[], object], size: int) -> float:
+    """Time one expiry pass over ``size`` live entries where only 1% have expired."""
+    cache = factory()
+    for i in range(size):
+        cache.set(f"k{i}", i, ttl=3600)
+    for i in range(size // 100):
+        cache.set(f"exp{i}", i, ttl=1)
+    time.sleep(1.1)
+    start = time.perf_counter()
+    cache._remove_expired_entries()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--expiry-size", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    def make(cls, max_size=None):
+        kwargs = {"shards": args.shards} if cls is ShardedInMemoryCache else {}
+        return cls(max_size=max_size, cleanup_interval=3600, **kwargs)
+
+    for cls in (InMemoryCache, ShardedInMemoryCache):
+        result = run_contention(make(cls, args.keys), args.threads, args.ops, args.keys)
+        logger.info(
+            f"{cls.__name__:<22} {result['ops_per_sec']:>12,.0f} ops/s  "
+            f"worst op {result['worst_op_ms']:.2f} ms"
+        )
+
+    for cls in (InMemoryCache, ShardedInMemoryCache):
+        pause = run_expiry_pause(lambda: make(cls), args.expiry_size)
+        logger.info(
+            f"{cls.__name__:<22} expiry pass over {args.expiry_size:,} entries: {pause:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
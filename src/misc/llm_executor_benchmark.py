@@ -0,0 +1,73 @@
+# src/misc/llm_executor_benchmark.py
+
+"""
+Per-call setup overhead: new LlmSession/LlmExecutor per call vs LlmExecutorPool
+
+Only agent/runner/session setup is timed, no LLM request is sent.
+
+Run from src/:  python -m misc.llm_executor_benchmark [--calls 500] [--agents 4]
+"""
+
+import argparse
+import time
+from typing import Dict
+
+from common.logger import LoggerFactory, LoggerType, LogLevel
+from utils.llm_utils import LlmExecutor, LlmExecutorPool, LlmSession
+
+logger = LoggerFactory.get_logger(
+    name="llm-executor-benchmark",
+    logger_type=LoggerType.STANDARD,
+    level=LogLevel.INFO,
+    use_colors=True,
+)
+
+INSTRUCTION = "Extract constraints for the endpoint below and answer in JSON."
+
+
+def run_per_call(calls: int, agents: int) -> Dict[str, float]:
+    """Build a session and executor for every call, as before pooling."""
+    start = time.perf_counter()
+    for i in range(calls):
+        LlmExecutor(
+            session=LlmSession("benchmark"),
+            agent_name=f"benchmark_agent_{i % agents}",
+            instruction=INSTRUCTION,
+        )
+    elapsed = time.perf_counter() - start
+    return {"per_call_ms": elapsed / calls * 1000, "elapsed_s": elapsed}
+
+
+def run_pooled(calls: int, agents: int) -> Dict[str, float]:
+    """Lease executors from a pool; each release resets the session."""
+    pool = LlmExecutorPool()
+    start = time.perf_counter()
+    for i in range(calls):
+        with pool.lease("benchmark", f"benchmark_agent_{i % agents}", INSTRUCTION):
+            pass
+    elapsed = time.perf_counter() - start
+    return {"per_call_ms": elapsed / calls * 1000, "elapsed_s": elapsed, **pool.get_stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--agents", type=int, default=4)
+    args = parser.parse_args()
+
+    before = run_per_call(args.calls, args.agents)
+    logger.info(
+        f"{'per-call construction':<22} {before['per_call_ms']:>8.3f} ms/call  "
+        f"({args.calls} calls in {before['elapsed_s']:.2f}s)"
+    )
+
+    after = run_pooled(args.calls, args.agents)
+    logger.info(
+        f"{'LlmExecutorPool':<22} {after['per_call_ms']:>8.3f} ms/call  "
+        f"({after['created']} created, {after['reused']} reused)"
+    )
+    logger.info(f"Speedup: {before['per_call_ms'] / after['per_call_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,15 @@ class TestDataVerifierInput(BaseModel):
     timeout: Optional[int] = Field(
         default=30, description="Timeout for script execution in seconds"
     )
+    batch_mode: bool = Field(
+        default=True,
+        description="Load each script once and evaluate it against the whole collection",
+    )
+    batch_shards: int = Field(
+        default=1,
+        ge=1,
+        description="Number of worker shards the collection is split into per script (batch mode)",
+    )
 
 
 class VerificationResult(BaseModel):
@@ -43,3 +52,10 @@ class TestDataVerifierOutput(BaseModel):
     filtered_count: int = Field(
         ..., description="Number of test data items filtered out"
     )
+    script_ids: List[str] = Field(
+        default_factory=list, description="Script IDs, in pass_matrix column order"
+    )
+    pass_matrix: List[List[Optional[bool]]] = Field(
+        default_factory=list,
+        description="Pass/fail per test data (rows) and script (columns); None if the script errored",
+    )
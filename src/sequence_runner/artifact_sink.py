@@ -0,0 +1,225 @@
+# src/sequence_runner/artifact_sink.py
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import queue
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_COMPRESSION_SUFFIX = {None: "", "gzip": ".gz", "zstd": ".zst"}
+_STOP = object()
+
+
+@dataclass
+class IndexEntry:
+    """Vị trí 1 payload: frame (batch) trong segment + slice bên trong frame đã giải nén."""
+    segment: str
+    frame_offset: int
+    frame_length: int
+    offset: int
+    length: int
+
+
+def _compress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression is None:
+        return data
+    if compression == "gzip":
+        # mỗi frame là một gzip member độc lập -> file vẫn là gzip hợp lệ
+        return gzip.compress(data, compresslevel=5)
+    import zstandard  # đã kiểm tra lúc khởi tạo
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def _decompress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.decompress(data)
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+class JsonlArtifactSink:
+    """
+    Sink append-only cho target response của runner.
+
+    - write() chỉ enqueue, một writer thread nền gom batch (group commit) rồi ghi 1 frame/batch.
+    - Frame có thể nén gzip/zstd; file .jsonl (.gz/.zst) đọc tuần tự bình thường được.
+    - Xoay segment khi vượt max_segment_bytes.
+    - Index offset theo (test_case_id, row) để đọc lại từng payload (read()),
+      được ghi ra file <name>.index.json khi close().
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        compression: Optional[str] = None,
+        batch_size: int = 256,
+        max_segment_bytes: int = 256 * 1024 * 1024,
+    ):
+        if compression not in _COMPRESSION_SUFFIX:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError as e:
+                raise ValueError("zstd compression requires the 'zstandard' package") from e
+
+        self.base_path = Path(base_path)
+        self.base_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.batch_size = max(1, batch_size)
+        self.max_segment_bytes = max_segment_bytes
+
+        self.index: Dict[Tuple[str, int], IndexEntry] = {}
+        self.segments: List[Path] = []
+        self._segment_no = 0
+        self._fp = None
+        self._segment_size = 0
+        self._open_segment()
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="artifact-sink", daemon=True)
+        self._thread.start()
+
+    @property
+    def index_path(self) -> Path:
+        return self.base_path.with_name(self.base_path.name + ".index.json")
+
+    # ---------- producer side ----------
+    def write(self, test_case_id: str, data_row_idx: int, payload: Dict[str, Any]) -> None:
+        if self._closed:
+            raise RuntimeError("Artifact sink is closed")
+        self._queue.put((test_case_id, data_row_idx, payload))
+
+    def flush(self) -> None:
+        """Chờ writer ghi hết những gì đã enqueue."""
+        self._queue.join()
+        if self._error:
+            raise self._error
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._fp:
+            self._fp.close()
+            self._fp = None
+        self._write_index()
+        if self._error:
+            logger.error(f"Artifact sink stopped with error: {self._error}")
+
+    # ---------- lookup ----------
+    def read(self, test_case_id: str, data_row_idx: int) -> Optional[Dict[str, Any]]:
+        entry = self.index.get((test_case_id, data_row_idx))
+        if entry is None:
+            return None
+        return read_entry(entry, self.compression)
+
+    # ---------- writer thread ----------
+    def _segment_path(self, n: int) -> Path:
+        suffix = _COMPRESSION_SUFFIX[self.compression]
+        name = self.base_path.name if n == 0 else f"{self.base_path.stem}.{n:04d}{self.base_path.suffix}"
+        return self.base_path.with_name(name + suffix)
+
+    def _open_segment(self) -> None:
+        if self._fp:
+            self._fp.close()
+        path = self._segment_path(self._segment_no)
+        self._fp = path.open("ab")
+        self._segment_size = self._fp.tell()
+        self.segments.append(path)
+
+    def _run(self) -> None:
+        # Group commit: chờ item đầu tiên, gom thêm những gì đang có trong queue
+        # (tối đa batch_size) rồi ghi thành 1 frame.
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            pending: List[Tuple[str, int, Dict[str, Any]]] = []
+            done = 1
+            if item is _STOP:
+                stop = True
+            else:
+                pending.append(item)
+            while not stop and len(pending) < self.batch_size:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                done += 1
+                if nxt is _STOP:
+                    stop = True
+                else:
+                    pending.append(nxt)
+            try:
+                if pending:
+                    self._write_frame(pending)
+            except Exception as e:  # không để thread chết im lặng
+                self._error = e
+                logger.error(f"Failed to write artifact batch: {e}")
+            finally:
+                for _ in range(done):
+                    self._queue.task_done()
+
+    def _write_frame(self, batch: List[Tuple[str, int, Dict[str, Any]]]) -> None:
+        raw = bytearray()
+        slices: List[Tuple[Tuple[str, int], int, int]] = []
+        for test_case_id, row_idx, payload in batch:
+            line = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+            slices.append(((test_case_id, row_idx), len(raw), len(line)))
+            raw += line
+        frame = _compress(bytes(raw), self.compression)
+
+        if self._segment_size and self._segment_size + len(frame) > self.max_segment_bytes:
+            self._segment_no += 1
+            self._open_segment()
+
+        frame_offset = self._segment_size
+        self._fp.write(frame)
+        self._fp.flush()
+        self._segment_size += len(frame)
+
+        segment = str(self.segments[-1])
+        for key, offset, length in slices:
+            self.index[key] = IndexEntry(segment, frame_offset, len(frame), offset, length)
+
+    def _write_index(self) -> None:
+        data = {
+            "compression": self.compression,
+            "entries": [
+                {"test_case_id": k[0], "data_row": k[1], **asdict(v)} for k, v in self.index.items()
+            ],
+        }
+        try:
+            self.index_path.write_text(json.dumps(data), encoding="utf-8")
+        except Exception as e:
+            logger.error(f"Failed to write artifact index {self.index_path}: {e}")
+
+
+def read_entry(entry: IndexEntry, compression: Optional[str]) -> Dict[str, Any]:
+    with open(entry.segment, "rb") as fp:
+        fp.seek(entry.frame_offset)
+        frame = fp.read(entry.frame_length)
+    raw = _decompress(frame, compression)
+    return json.loads(raw[entry.offset: entry.offset + entry.length])
+
+
+def load_artifact(index_path: Path, test_case_id: str, data_row_idx: int) -> Optional[Dict[str, Any]]:
+    """Đọc 1 payload từ sink đã đóng, dựa vào file index."""
+    data = json.loads(Path(index_path).read_text(encoding="utf-8"))
+    for e in data.get("entries", []):
+        if e["test_case_id"] == test_case_id and e["data_row"] == data_row_idx:
+            entry = IndexEntry(e["segment"], e["frame_offset"], e["frame_length"], e["offset"], e["length"])
+            return read_entry(entry, data.get("compression"))
+    return None
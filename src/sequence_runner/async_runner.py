@@ -0,0 +1,223 @@
+# src/sequence_runner/async_runner.py
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .logging_setup import setup_logging
+from .models import StepModel
+from .runner import SequenceRunner
+from .validator import extract_expected_status
+
+logger = setup_logging()
+
+
+class AsyncSequenceRunner(SequenceRunner):
+    """
+    Chế độ chạy bất đồng bộ cho SequenceRunner.
+
+    - Các test case và các data row độc lập được chạy song song.
+    - Các step trong cùng một row vẫn chạy tuần tự (giữ thứ tự dependency).
+    - Giới hạn đồng thời toàn cục (max_concurrency) và theo host (per_host_limit).
+    - Ghi ra đúng các artifact CSV / JSON theo row như SequenceRunner.
+
+    HTTP call vẫn đi qua HttpClient (blocking) nhưng được đẩy sang thread,
+    còn việc ghi CSV/JSON luôn diễn ra trên event loop nên không cần lock.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        base_url: str,
+        token: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        skip_preload: bool = False,
+        base_module_file: str = __file__,
+        out_file_name: Optional[str] = None,
+        artifact_format: str = "json",
+        max_concurrency: int = 16,
+        per_host_limit: int = 8,
+        step_delay: float = 0.0,
+        http_options: Optional[Dict[str, Any]] = None,
+    ):
+        # Pool HTTP phải đủ lớn cho per_host_limit, nếu không thread sẽ chờ connection
+        http_options = {
+            "pool_maxsize": max(per_host_limit, 10),
+            "per_host_limit": per_host_limit,
+            **(http_options or {}),
+        }
+        super().__init__(
+            service_name=service_name,
+            base_url=base_url,
+            token=token,
+            endpoint=endpoint,
+            skip_preload=skip_preload,
+            base_module_file=base_module_file,
+            out_file_name=out_file_name,
+            artifact_format=artifact_format,
+            http_options=http_options,
+        )
+        if max_concurrency < 1 or per_host_limit < 1:
+            raise ValueError("max_concurrency and per_host_limit must be >= 1")
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.step_delay = step_delay
+        # Semaphores phải được tạo trong event loop đang chạy
+        self._global_sem: Optional[asyncio.Semaphore] = None
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+
+    # ------------------------------------------------------------------
+    # Concurrency limits
+    # ------------------------------------------------------------------
+    def _reset_limits(self) -> None:
+        self._global_sem = asyncio.Semaphore(self.max_concurrency)
+        self._host_sems = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc or url
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host_limit)
+            self._host_sems[host] = sem
+        return sem
+
+    async def execute_request_async(
+        self,
+        step: StepModel,
+        test_data_row: Optional[Dict[str, Any]] = None,
+        current_step: int = 1,
+        step_responses: List[Optional[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        if self._global_sem is None:
+            self._reset_limits()
+        # Mọi step đều build URL từ self.base_url
+        async with self._global_sem, self._host_semaphore(self.base_url):
+            return await asyncio.to_thread(
+                self.execute_request, step, test_data_row, current_step, step_responses
+            )
+
+    # ------------------------------------------------------------------
+    # Run a single data row (steps giữ thứ tự)
+    # ------------------------------------------------------------------
+    async def _run_row(
+        self,
+        test_case_id: str,
+        target_endpoint: str,
+        steps: List[StepModel],
+        row_idx: int,
+        total_rows: int,
+        row: Dict[str, Any],
+    ) -> bool:
+        logger.info(f"[{test_case_id}] Running with test data row {row_idx}/{total_rows}")
+        expected_status = extract_expected_status(row)
+        step_responses: List[Optional[Dict[str, Any]]] = []
+        is_pass = False
+
+        for step_idx, step in enumerate(steps):
+            is_target_step = (step.endpoint == target_endpoint)
+            result = await self.execute_request_async(step, row, step_idx + 1, step_responses)
+
+            if result.get("skipped"):
+                self.record_skipped_step(
+                    test_case_id, step_idx + 1, step, row_idx, expected_status, result
+                )
+                return False
+
+            if result["success"] and result["response"] is not None:
+                step_responses.append(result["response"])
+            else:
+                step_responses.append(None)
+
+            if not is_target_step:
+                logger.info(
+                    f"  🔄 [{test_case_id}] Step {step_idx+1}: {step.method} {step.endpoint} "
+                    f"-> {result['status_code']} (dependency - skip assert)"
+                )
+                continue
+
+            is_pass = self.record_target_result(
+                test_case_id, target_endpoint, step_idx + 1, step,
+                row_idx, row, expected_status, result,
+            )
+            if self.step_delay > 0:
+                await asyncio.sleep(self.step_delay)
+
+        return is_pass
+
+    # ------------------------------------------------------------------
+    # Run a single test case file (rows song song)
+    # ------------------------------------------------------------------
+    async def run_test_case_async(self, test_case_file: Path) -> bool:
+        logger.info(f"Running test case: {test_case_file.name}")
+        test_case, test_case_id, test_data_rows = await asyncio.to_thread(
+            self.prepare_test_case, test_case_file
+        )
+        target_endpoint = test_case.endpoint
+        steps: List[StepModel] = test_case.steps
+        if not steps:
+            logger.warning(f"No steps found in test case: {test_case_id}")
+            return False
+
+        results = await asyncio.gather(
+            *(
+                self._run_row(test_case_id, target_endpoint, steps, row_idx, len(test_data_rows), row)
+                for row_idx, row in enumerate(test_data_rows, start=1)
+            ),
+            return_exceptions=True,
+        )
+        for res in results:
+            if isinstance(res, BaseException):
+                logger.error(f"Error running a data row of {test_case_id}: {res}")
+        # Giữ ngữ nghĩa của run_test_case: kết quả của row cuối cùng
+        last = results[-1] if results else False
+        return last is True
+
+    async def _run_test_case_guarded(self, test_case_file: Path) -> bool:
+        try:
+            return await self.run_test_case_async(test_case_file)
+        except Exception as e:
+            logger.error(f"Error running test case {test_case_file.name}: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Run all test cases
+    # ------------------------------------------------------------------
+    async def run_all_async(self):
+        logger.info(
+            f"Starting async test execution for service: {self.service_name} "
+            f"(max_concurrency={self.max_concurrency}, per_host_limit={self.per_host_limit})"
+        )
+        test_case_files = self.file.find_test_case_files(self.endpoint_filter)
+        if not test_case_files:
+            logger.error("No test case files found!")
+            return
+        out_file_name = self.file.open_csv_output(self.service_name)
+        self._reset_limits()
+
+        # Mỗi wave chạy song song; wave sau chỉ bắt đầu khi các producer đã xong
+        waves = await asyncio.to_thread(self.plan_waves, test_case_files)
+        for wave_idx, wave in enumerate(waves, start=1):
+            logger.info(f"🌊 Wave {wave_idx}/{len(waves)}: {len(wave)} test cases")
+            await asyncio.gather(*(self._run_test_case_guarded(f) for f in wave))
+
+        logger.info(f"📊 HTTP pool stats: {self.http.pool_stats()}")
+
+        return out_file_name
+
+    def run_all(self):
+        """
+        Sync entrypoint, tương thích với chỗ gọi SequenceRunner.run_all().
+
+        Nếu thread hiện tại đã có event loop đang chạy (vd. trong route async)
+        thì asyncio.run() không dùng được: chạy trên event loop riêng ở một
+        thread khác và chờ kết quả. Code async nên await run_all_async() trực tiếp.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_all_async())
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-runner") as pool:
+            return pool.submit(asyncio.run, self.run_all_async()).result()
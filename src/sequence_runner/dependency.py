@@ -4,14 +4,19 @@ from __future__ import annotations
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
+from urllib.parse import urljoin
 
 from .http_client import HttpClient
+from .id_pool import IdPool
 from .models import TestCaseCore, StepModel
+from .resolution_plan import StepPlan, compile_dependencies, compile_path, walk_path
 
 logger = logging.getLogger(__name__)
 NOT_SURE = "%not-sure%"
+# field chứa danh sách item trong response dạng dict (dùng cho preload và ghép trang)
+LIST_KEYS = ("data", "items", "results", "holidays", "provinces", "brands", "categories", "products")
 
 
 class DependencyService:
@@ -19,7 +24,35 @@ class DependencyService:
         # cache json trả về từ các endpoint preload hoặc step trước
         self.global_dependency_cache: Dict[str, Any] = {}
         # KHÔNG hard-code key nào: key được sinh động theo dep_key, path var...
-        self.available_ids_cache: Dict[str, List[str]] = defaultdict(list)
+        self.id_pool = IdPool()
+        # id(step) -> (step, plan): resolution plan compile một lần cho mỗi StepModel
+        self._plans: Dict[int, Tuple[StepModel, StepPlan]] = {}
+
+    @property
+    def available_ids_cache(self) -> IdPool:
+        """Alias tương thích ngược cho id_pool (trước đây là dict[str, list])."""
+        return self.id_pool
+
+    # ---------- compiled resolution plans ----------
+    def compile_step(self, step: StepModel) -> StepPlan:
+        """Compile data_dependencies của step một lần; các row sau dùng lại plan."""
+        cached = self._plans.get(id(step))
+        # giữ tham chiếu tới step để id() không bị tái sử dụng
+        if cached is not None and cached[0] is step:
+            return cached[1]
+        plan = compile_dependencies(step.data_dependencies, list(self.global_dependency_cache.keys()))
+        self._plans[id(step)] = (step, plan)
+        return plan
+
+    def resolve_step(
+        self,
+        step: StepModel,
+        current_step: int,
+        step_responses: List[Optional[Dict]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return self.execute_plan(
+            self.compile_step(step), step.query_parameters, step.request_body, step_responses
+        )
 
     def resolve_dependencies(
         self,
@@ -29,34 +62,36 @@ class DependencyService:
         current_step: int,
         step_responses: List[Optional[Dict]],
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-        import random
+        if not data_dependencies:
+            return params.copy(), body.copy()
+        plan = compile_dependencies(data_dependencies, list(self.global_dependency_cache.keys()))
+        return self.execute_plan(plan, params, body, step_responses)
 
+    def execute_plan(
+        self,
+        plan: StepPlan,
+        params: Dict[str, Any],
+        body: Dict[str, Any],
+        step_responses: List[Optional[Dict]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         resolved_params = params.copy()
         resolved_body = body.copy()
 
-        if not data_dependencies:
-            return resolved_params, resolved_body
-
-        for dep_key, dep_info in (data_dependencies or {}).items():
-            if not (isinstance(dep_info, dict) and "from_step" in dep_info):
-                continue
-
-            from_step = dep_info["from_step"]
-            field_mappings = dep_info.get("field_mappings", {}) or {}
+        for dep in plan.deps:
+            dep_key = dep.dep_key
 
             # chọn nguồn dữ liệu
             prev_response = None
-            for cache_key, cached_data in self.global_dependency_cache.items():
-                if any(token in cache_key.lower() for token in dep_key.lower().split("_")):
-                    prev_response = cached_data
-                    logger.info(f"  📋 Using global cached '{cache_key}' for dep '{dep_key}'")
-                    break
+            if dep.cache_key is not None:
+                prev_response = self.global_dependency_cache.get(dep.cache_key)
+                if prev_response:
+                    logger.info(f"  📋 Using global cached '{dep.cache_key}' for dep '{dep_key}'")
 
             if not prev_response:
-                idx = (from_step - 1)
+                idx = (dep.from_step - 1)
                 if 0 <= idx < len(step_responses) and step_responses[idx]:
                     prev_response = step_responses[idx]
-                    logger.info(f"  📋 Using step[{from_step}] response for dep '{dep_key}'")
+                    logger.info(f"  📋 Using step[{dep.from_step}] response for dep '{dep_key}'")
 
             if not prev_response and self.global_dependency_cache:
                 any_key = next(iter(self.global_dependency_cache.keys()))
@@ -67,45 +102,39 @@ class DependencyService:
                 logger.warning("❌ No cached data available for dependency resolution")
                 continue
 
-            if field_mappings:
-                for target_field, source_field in field_mappings.items():
-                    value = None
+            if dep.fields:
+                for fp in dep.fields:
+                    target_field = fp.target_field
 
                     # nếu đã có list id cache cho target_field thì ưu tiên
-                    if self.available_ids_cache.get(target_field):
-                        value = random.choice(self.available_ids_cache[target_field])
+                    value = self.id_pool.choice(target_field)
+                    if value is not None:
                         logger.info(f"🎲 Random selected {target_field} = {value}")
                     else:
-                        # cố gắng lấy theo 'source_field' (JSON path nhẹ)
-                        extracted = self.extract_from_response(prev_response, source_field)
-
+                        # cố gắng lấy theo 'source_field' (JSON path nhẹ, đã tách sẵn)
                         # nếu extract trả về list/dict, cố gắng đoán id
-                        value = self._guess_scalar_from_any(extracted)
-                        if value is None:
+                        value = self._guess_scalar_from_any(fp.extract(prev_response))
+                        if value is None and isinstance(prev_response, dict):
                             # fallback: quét nhẹ toàn response để tìm field phù hợp
-                            if isinstance(prev_response, dict):
-                                for _, v in prev_response.items():
-                                    if isinstance(v, (list, dict)):
-                                        value = self._guess_scalar_from_any(
-                                            self.extract_from_response(v, source_field)
-                                        )
-                                        if value is not None:
-                                            break
+                            for v in prev_response.values():
+                                if isinstance(v, (list, dict)):
+                                    value = self._guess_scalar_from_any(fp.extract(v))
+                                    if value is not None:
+                                        break
 
                     if value is not None:
                         resolved_params[target_field] = value
                         logger.info(f"✅ Resolved dependency: {target_field} = {value}")
                     else:
-                        logger.warning(f"❌ Failed to resolve dependency: {target_field} from {source_field}")
-            else:
+                        logger.warning(f"❌ Failed to resolve dependency: {target_field} from {fp.source_path}")
+            elif dep.direct is not None:
                 # không có field_mappings -> thử lấy trực tiếp theo dep_key
-                if self.available_ids_cache.get(dep_key):
-                    value = random.choice(self.available_ids_cache[dep_key])
+                value = self.id_pool.choice(dep_key)
+                if value is not None:
                     resolved_params[dep_key] = value
                     logger.info(f"🎲 Random selected {dep_key} = {value}")
                 else:
-                    value = self.extract_from_response(prev_response, dep_key)
-                    value = self._guess_scalar_from_any(value)
+                    value = self._guess_scalar_from_any(dep.direct.extract(prev_response))
                     if value is not None:
                         resolved_params[dep_key] = value
                         logger.info(f"✅ Resolved dependency: {dep_key} = {value}")
@@ -113,8 +142,9 @@ class DependencyService:
         return resolved_params, resolved_body
 
     def resolve_not_sure_parameter(self, param_name: str, step_responses: List[Optional[Dict]]) -> Optional[str]:
-        if self.available_ids_cache.get(param_name):
-            return self.available_ids_cache[param_name][0]
+        cached = self.id_pool.first(param_name)
+        if cached is not None:
+            return cached
 
         for resp in step_responses:
             if not isinstance(resp, dict):
@@ -135,29 +165,7 @@ class DependencyService:
     def extract_from_response(self, response_data: Any, path: str) -> Any:
         if not path:
             return response_data
-        current = response_data
-        if isinstance(current, list) and current:
-            current = current[0]
-        for key in path.split("."):
-            if key == "":
-                continue
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            elif isinstance(current, list) and key.isdigit():
-                idx = int(key)
-                if 0 <= idx < len(current):
-                    current = current[idx]
-                else:
-                    return None
-            elif isinstance(current, list) and current:
-                current = current[0]
-                if isinstance(current, dict) and key in current:
-                    current = current[key]
-                else:
-                    return None
-            else:
-                return None
-        return current
+        return walk_path(response_data, compile_path(path))
 
     def _guess_scalar_from_any(self, obj: Any) -> Optional[str]:
         """Thử rút ra 1 scalar (ưu tiên 'id') từ obj (dict/list/scalar)."""
@@ -183,8 +191,7 @@ class DependencyService:
         return None
 
     def _cache_parameter_value(self, param_name: str, value: str):
-        if value not in self.available_ids_cache[param_name]:
-            self.available_ids_cache[param_name].append(value)
+        self.id_pool.add(param_name, value)
 
     def _extract_id_from_response(self, response_data: dict, param_name: str) -> Optional[str]:
         if param_name in response_data:
@@ -221,7 +228,7 @@ class DependencyService:
                 if isinstance(it, dict) and "id" in it:
                     ids.append(str(it["id"]))
         elif isinstance(response_data, dict):
-            for key in ["data", "items", "results", "holidays", "provinces", "brands", "categories", "products"]:
+            for key in LIST_KEYS:
                 if key in response_data and isinstance(response_data[key], list):
                     for it in response_data[key]:
                         if isinstance(it, dict) and "id" in it:
@@ -258,12 +265,71 @@ class DependencyService:
                                 dependency_mappings[dep_key] = src_ep
         return dependency_endpoints, dependency_mappings
 
+    def _next_page_url(self, resp: Any, data: Any, current_url: str) -> Optional[str]:
+        """Tìm URL trang kế tiếp: Link header rel=next, hoặc field next/links.next trong body."""
+        links = getattr(resp, "links", None) or {}
+        nxt = (links.get("next") or {}).get("url")
+        if not nxt and isinstance(data, dict):
+            for candidate in (
+                data.get("next"),
+                data.get("next_page_url"),
+                (data.get("links") or {}).get("next") if isinstance(data.get("links"), dict) else None,
+                (data.get("_links") or {}).get("next") if isinstance(data.get("_links"), dict) else None,
+            ):
+                if isinstance(candidate, dict):
+                    candidate = candidate.get("href")
+                if isinstance(candidate, str) and candidate:
+                    nxt = candidate
+                    break
+        if not nxt:
+            return None
+        nxt = urljoin(current_url, nxt)
+        return nxt if nxt != current_url else None
+
+    @staticmethod
+    def _merge_page(merged: Any, data: Any) -> Any:
+        """Ghép item của trang mới vào kết quả; response không rõ dạng danh sách thì giữ trang đầu."""
+        if isinstance(merged, list) and isinstance(data, list):
+            merged.extend(data)
+        elif isinstance(merged, dict) and isinstance(data, dict):
+            for key in LIST_KEYS:
+                if isinstance(merged.get(key), list) and isinstance(data.get(key), list):
+                    merged[key].extend(data[key])
+                    break
+        return merged
+
+    def _fetch_endpoint(
+        self, base_url: str, http: HttpClient, ep: str, timeout: float, max_pages: int
+    ) -> Tuple[Optional[Any], List[str], str]:
+        """GET một dependency endpoint (kèm phân trang). Trả về (data đã ghép các trang, ids, log)."""
+        url = self.convert_endpoint_to_url(base_url, ep)
+        start = time.time()
+        merged: Optional[Any] = None
+        ids: List[str] = []
+        pages = 0
+        while url and pages < max_pages:
+            resp = http.request("GET", url, timeout=timeout)
+            if resp.status_code != 200:
+                if pages == 0:
+                    return None, [], f"❌ Failed ({resp.status_code}): {resp.text[:120]}"
+                break
+            data = resp.json()
+            merged = data if merged is None else self._merge_page(merged, data)
+            ids.extend(self.extract_ids_from_response(data))
+            pages += 1
+            url = self._next_page_url(resp, data, url)
+        elapsed = time.time() - start
+        return merged, ids, f"✅ Success ({pages} page(s), {elapsed:.2f}s)"
+
     def preload_dependencies(
         self,
         base_url: str,
         http: HttpClient,
         dependency_endpoints: set,
         dependency_mappings: Dict[str, str],
+        max_workers: int = 8,
+        timeout: float = 10,
+        max_pages: int = 5,
     ):
         if not dependency_endpoints:
             logger.info("🔍 No dependencies found in test cases")
@@ -271,31 +337,41 @@ class DependencyService:
 
         logger.info(f"🔍 Found {len(dependency_endpoints)} dependency endpoints: {list(dependency_endpoints)}")
         total = len(dependency_endpoints)
-        for i, ep in enumerate(dependency_endpoints, start=1):
-            try:
-                url = self.convert_endpoint_to_url(base_url, ep)
-                logger.info(f"📡 Preloading ({i}/{total}): {ep} -> {url}")
-                start = time.time()
-                resp = http.request("GET", url, timeout=10)
-                elapsed = time.time() - start
-                logger.info(f"    ⏱️  Response time: {elapsed:.2f}s")
-
-                if resp.status_code == 200:
-                    data = resp.json()
-                    cache_key = ep.replace("get-", "").replace("/", "_").strip("_")
-                    self.global_dependency_cache[cache_key] = data
-
-                    ids = self.extract_ids_from_response(data)
-                    if ids:
-                        for dep_key, src_ep in dependency_mappings.items():
-                            if src_ep == ep:
-                                self.available_ids_cache[dep_key] = ids[:]  # clone list
-                                logger.info(f"    📋 Cached {len(ids)} IDs for {dep_key} (ex: {ids[:3]})")
-
-                    logger.info(f"    ✅ Success ({resp.status_code})")
-                else:
-                    logger.warning(f"    ❌ Failed ({resp.status_code}): {resp.text[:120]}")
-            except Exception as e:
-                logger.warning(f"    ❌ Error: {str(e)[:160]}")
 
-        logger.info(f"✅ Preloading complete: {len(self.global_dependency_cache)} endpoints cached")
+        # dep_key theo endpoint nguồn, tránh quét lại dependency_mappings cho mỗi endpoint
+        dep_keys_by_ep: Dict[str, List[str]] = {}
+        for dep_key, src_ep in dependency_mappings.items():
+            dep_keys_by_ep.setdefault(src_ep, []).append(dep_key)
+
+        start = time.time()
+        workers = max(1, min(max_workers, total))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dep-preload") as pool:
+            futures = {
+                pool.submit(self._fetch_endpoint, base_url, http, ep, timeout, max_pages): ep
+                for ep in dependency_endpoints
+            }
+            for i, fut in enumerate(as_completed(futures), start=1):
+                ep = futures[fut]
+                try:
+                    data, ids, msg = fut.result()
+                except Exception as e:
+                    logger.warning(f"📡 Preloaded ({i}/{total}): {ep}    ❌ Error: {str(e)[:160]}")
+                    continue
+                logger.info(f"📡 Preloaded ({i}/{total}): {ep}    {msg}")
+                if data is None:
+                    continue
+
+                cache_key = ep.replace("get-", "").replace("/", "_").strip("_")
+                self.global_dependency_cache[cache_key] = data
+                if ids:
+                    for dep_key in dep_keys_by_ep.get(ep, []):
+                        self.id_pool.replace(dep_key, ids)
+                        logger.info(f"    📋 Cached {len(self.id_pool[dep_key])} IDs for {dep_key} (ex: {ids[:3]})")
+
+        # Cache key đã thay đổi -> plan cũ (cache_key chọn sẵn) không còn đúng
+        self._plans.clear()
+
+        logger.info(
+            f"✅ Preloading complete: {len(self.global_dependency_cache)} endpoints cached "
+            f"in {time.time() - start:.2f}s"
+        )
@@ -1,20 +1,149 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Optional, Dict, Any
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Như urllib3 Retry.DEFAULT_ALLOWED_METHODS: POST/PATCH không retry mặc định
+# vì có thể tạo trùng resource
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+
+class RetryBudget:
+    """
+    Giới hạn tổng số retry theo tỉ lệ so với số request (kiểu Finagle/gRPC):
+    retry được phép khi retries < min_retries + ratio * requests.
+    Tránh cảnh server chậm/sập làm mọi request retry đồng loạt.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._requests = 0
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._retries < self.min_retries + self.ratio * self._requests:
+                self._retries += 1
+                return True
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": self._requests, "retries": self._retries}
+
+
+class PoolMetrics:
+    """Counter rẻ cho mức sử dụng pool: in-flight hiện tại / đỉnh, theo host."""
+
+    def __init__(self, pool_maxsize: int):
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.retry_budget_exhausted = 0
+        self.in_flight: Dict[str, int] = {}
+        self.peak_in_flight: Dict[str, int] = {}
+        self.total_time = 0.0
+
+    def start(self, host: str) -> None:
+        with self._lock:
+            self.requests += 1
+            cur = self.in_flight.get(host, 0) + 1
+            self.in_flight[host] = cur
+            if cur > self.peak_in_flight.get(host, 0):
+                self.peak_in_flight[host] = cur
+
+    def finish(self, host: str, elapsed: float, error: bool = False) -> None:
+        with self._lock:
+            self.in_flight[host] = self.in_flight.get(host, 1) - 1
+            self.total_time += elapsed
+            if error:
+                self.errors += 1
+
+    def record_retry(self, allowed: bool) -> None:
+        with self._lock:
+            if allowed:
+                self.retries += 1
+            else:
+                self.retry_budget_exhausted += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "retry_budget_exhausted": self.retry_budget_exhausted,
+                "avg_latency": (self.total_time / self.requests) if self.requests else 0.0,
+                "pool_maxsize": self.pool_maxsize,
+                "in_flight": dict(self.in_flight),
+                "peak_in_flight": dict(self.peak_in_flight),
+                "peak_utilisation": {
+                    h: round(v / self.pool_maxsize, 3) for h, v in self.peak_in_flight.items()
+                } if self.pool_maxsize else {},
+            }
+
+
+def _backoff_delay(backoff: float, attempt: int, backoff_max: float) -> float:
+    """Exponential backoff có jitter (full jitter), chặn trên bởi backoff_max."""
+    if backoff <= 0:
+        return 0.0
+    return random.uniform(0, min(backoff_max, backoff * (2 ** attempt)))
+
 
 class HttpClient:
+    """
+    Transport đồng bộ (requests) với pool tuỳ chỉnh.
+
+    - pool_connections: số host pool được giữ; pool_maxsize: số connection mỗi host.
+    - per_host_limit: nếu đặt, pool chặn (pool_block) ở mức này -> giới hạn theo host.
+    - Retry lỗi kết nối do urllib3 xử lý; retry theo status (429/5xx) do client
+      xử lý với backoff có jitter, backoff_max và RetryBudget dùng chung.
+    - Retry theo status chỉ áp dụng cho method idempotent; POST/PATCH phải
+      bật riêng từng lời gọi bằng request(..., retry=True).
+    """
+
     def __init__(self, default_headers: Optional[Dict[str, str]] = None, token: Optional[str] = None,
-                 total_retries: int = 3, backoff: float = 1.0):
+                 total_retries: int = 3, backoff: float = 1.0,
+                 pool_connections: int = 10, pool_maxsize: int = 10,
+                 per_host_limit: Optional[int] = None, backoff_max: float = 10.0,
+                 retry_budget: Optional[RetryBudget] = None):
         self.session = requests.Session()
+        self.total_retries = total_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retry_budget = retry_budget or RetryBudget()
+
+        maxsize = min(pool_maxsize, per_host_limit) if per_host_limit else pool_maxsize
+        # urllib3 chỉ lo lỗi kết nối/đọc (backoff ngắn); retry theo status nằm ở request()
         retry_strategy = Retry(
             total=total_retries,
-            backoff_factor=backoff,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status=0,
+            backoff_factor=min(backoff, 0.5),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=maxsize,
+            pool_block=per_host_limit is not None,
+            max_retries=retry_strategy,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self.metrics = PoolMetrics(maxsize)
 
         self.session.headers.update({
             'User-Agent': 'API-Test-Runner/1.0',
@@ -26,8 +155,41 @@ class HttpClient:
         if token:
             self.session.headers.update({'Authorization': f'Bearer {token}'})
 
-    def request(self, method: str, url: str, **kwargs) -> requests.Response:
-        return self.session.request(method.upper(), url, **kwargs)
+    def request(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> requests.Response:
+        method = method.upper()
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        host = urlsplit(url).netloc
+        self.retry_budget.record_request()
+        attempt = 0
+        while True:
+            self.metrics.start(host)
+            start = time.time()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except Exception:
+                self.metrics.finish(host, time.time() - start, error=True)
+                raise
+            self.metrics.finish(host, time.time() - start)
+
+            if not retry or resp.status_code not in RETRY_STATUSES or attempt >= self.total_retries:
+                return resp
+            allowed = self.retry_budget.try_acquire()
+            self.metrics.record_retry(allowed)
+            if not allowed:
+                return resp
+            time.sleep(self._retry_after(resp) or _backoff_delay(self.backoff, attempt, self.backoff_max))
+            attempt += 1
+
+    def _retry_after(self, resp: requests.Response) -> Optional[float]:
+        value = resp.headers.get("Retry-After")
+        try:
+            return min(float(value), self.backoff_max) if value else None
+        except ValueError:
+            return None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return {**self.metrics.snapshot(), "retry_budget": self.retry_budget.snapshot()}
 
     def close(self):
         self.session.close()
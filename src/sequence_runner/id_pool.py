@@ -0,0 +1,95 @@
+# src/sequence_runner/id_pool.py
+from __future__ import annotations
+
+import random
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+
+class IdPool:
+    """
+    Pool ID dùng chung, đánh index theo tên field.
+
+    Mỗi field giữ song song list (giữ thứ tự chèn, cho [0] / random.choice)
+    và set (kiểm tra membership O(1)). Thread-safe cho ghi song song khi preload.
+    API đọc giống dict[str, list] để tương thích với available_ids_cache cũ.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, List[str]] = {}
+        self._index: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    # ---------- write ----------
+    def add(self, field: str, value: str) -> bool:
+        """Thêm 1 giá trị; trả về False nếu đã tồn tại."""
+        value = str(value)
+        with self._lock:
+            idx = self._index.setdefault(field, set())
+            if value in idx:
+                return False
+            idx.add(value)
+            self._values.setdefault(field, []).append(value)
+            return True
+
+    def extend(self, field: str, values: Iterable[str]) -> int:
+        added = 0
+        with self._lock:
+            idx = self._index.setdefault(field, set())
+            bucket = self._values.setdefault(field, [])
+            for v in values:
+                v = str(v)
+                if v not in idx:
+                    idx.add(v)
+                    bucket.append(v)
+                    added += 1
+        return added
+
+    def replace(self, field: str, values: Iterable[str]) -> None:
+        bucket: List[str] = []
+        idx: Set[str] = set()
+        for v in values:
+            v = str(v)
+            if v not in idx:
+                idx.add(v)
+                bucket.append(v)
+        with self._lock:
+            self._values[field] = bucket
+            self._index[field] = idx
+
+    # ---------- read ----------
+    def contains(self, field: str, value: str) -> bool:
+        return str(value) in self._index.get(field, ())
+
+    def first(self, field: str) -> Optional[str]:
+        bucket = self._values.get(field)
+        return bucket[0] if bucket else None
+
+    def choice(self, field: str) -> Optional[str]:
+        bucket = self._values.get(field)
+        return random.choice(bucket) if bucket else None
+
+    def get(self, field: str, default: Optional[List[str]] = None) -> Optional[List[str]]:
+        bucket = self._values.get(field)
+        return bucket if bucket else default
+
+    def __getitem__(self, field: str) -> List[str]:
+        return self._values.get(field, [])
+
+    def __setitem__(self, field: str, values: Iterable[str]) -> None:
+        self.replace(field, values)
+
+    def __contains__(self, field: object) -> bool:
+        return bool(self._values.get(field))  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._values))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def keys(self):
+        return list(self._values.keys())
+
+    def items(self):
+        return list(self._values.items())
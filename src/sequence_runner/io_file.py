@@ -8,13 +8,31 @@ import logging
 import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from .artifact_sink import JsonlArtifactSink
 from .models import Paths, TEST_CASE_DIR_NAME, TestCaseCore, DataRow
 from .parser import parse_test_case_core_from_path, parse_csv_to_data_rows
 
 logger = logging.getLogger(__name__)
 
+# artifact_format -> (stream qua JsonlArtifactSink?, compression). "json" = 1 file/row như cũ
+ARTIFACT_FORMATS = {
+    "json": (False, None),
+    "jsonl": (True, None),
+    "jsonl.gz": (True, "gzip"),
+    "jsonl.zst": (True, "zstd"),
+}
+
 class FileService:
-    def __init__(self, service_name: str, base_module_file: str, out_file_name: Optional[str] = None):
+    def __init__(
+        self,
+        service_name: str,
+        base_module_file: str,
+        out_file_name: Optional[str] = None,
+        artifact_format: str = "json",
+        csv_flush_every: int = 100,
+    ):
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unsupported artifact_format: {artifact_format}")
         # Use shared_config for unified directory structure
         try:
             # Navigate up to find project root and add src to path
@@ -75,6 +93,11 @@ class FileService:
         self.out_file_name = out_file_name
         self._csv_file =  None
         self._csv_writer = None
+        self._csv_rows_since_flush = 0
+        self.csv_flush_every = csv_flush_every
+        self.artifact_format = artifact_format
+        self._sink: Optional[JsonlArtifactSink] = None
+        self._response_dirs: set = set()
 
 
     # ---------- Topolist & TestCase ----------
@@ -174,27 +197,58 @@ class FileService:
         self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=headers)
         self._csv_writer.writeheader()
         logger.info(f"CSV output will be saved to: {out_path}")
+        self._open_artifact_sink()
         return self.out_file_name
 
+    def _open_artifact_sink(self):
+        streaming, compression = ARTIFACT_FORMATS[self.artifact_format]
+        if not streaming or self._sink is not None:
+            return
+        sink_path = self.paths.output_dir / f"{self.out_file_name}_responses.jsonl"
+        self._sink = JsonlArtifactSink(sink_path, compression=compression)
+        logger.info(f"Target responses will be streamed to: {self._sink.segments[0]}")
+
     def write_csv_row(self, row: Dict[str, Any]):
         if not self._csv_writer:
             logger.warning("CSV writer not initialized. Call open_csv_output() first.")
             return
         self._csv_writer.writerow(row)
+        self._csv_rows_since_flush += 1
+        if self.csv_flush_every and self._csv_rows_since_flush >= self.csv_flush_every:
+            self._csv_file.flush()
+            self._csv_rows_since_flush = 0
 
     def save_target_response(self, test_case_id: str, data_row_idx: int, payload: Dict[str, Any]):
+        if self._sink is not None:
+            self._sink.write(test_case_id, data_row_idx, payload)
+            return
         case_dir = self.paths.output_dir / f"{test_case_id}_response"
-        case_dir.mkdir(parents=True, exist_ok=True)
+        if case_dir not in self._response_dirs:
+            case_dir.mkdir(parents=True, exist_ok=True)
+            self._response_dirs.add(case_dir)
         fp = case_dir / f"row_{data_row_idx}_target_response.json"
         try:
             fp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
         except Exception as e:
             logger.error(f"Failed to write target response {fp}: {e}")
 
+    def load_target_response(self, test_case_id: str, data_row_idx: int) -> Optional[Dict[str, Any]]:
+        """Đọc lại payload đã lưu, bất kể đang dùng file JSON riêng hay JSONL sink."""
+        if self._sink is not None:
+            return self._sink.read(test_case_id, data_row_idx)
+        fp = self.paths.output_dir / f"{test_case_id}_response" / f"row_{data_row_idx}_target_response.json"
+        if not fp.exists():
+            return None
+        return json.loads(fp.read_text(encoding="utf-8"))
+
     def close(self):
         try:
+            if self._sink:
+                self._sink.close()
             if self._csv_file:
                 self._csv_file.close()
         finally:
+            self._sink = None
             self._csv_file = None
             self._csv_writer = None
+            self._csv_rows_since_flush = 0
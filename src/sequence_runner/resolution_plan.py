@@ -0,0 +1,123 @@
+# src/sequence_runner/resolution_plan.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (key, index nếu key là số) - tách sẵn một lần thay vì split mỗi row
+PathKeys = Tuple[Tuple[str, Optional[int]], ...]
+Extractor = Callable[[Any], Any]
+
+
+def compile_path(path: str) -> PathKeys:
+    """'data.0.id' -> (('data', None), ('0', 0), ('id', None)); bỏ key rỗng."""
+    return tuple(
+        (key, int(key) if key.isdigit() else None)
+        for key in (path or "").split(".")
+        if key != ""
+    )
+
+
+def walk_path(data: Any, keys: PathKeys) -> Any:
+    """Tương đương DependencyService.extract_from_response nhưng với path đã tách sẵn."""
+    current = data
+    if isinstance(current, list) and current:
+        current = current[0]
+    for key, idx in keys:
+        if isinstance(current, dict) and key in current:
+            current = current[key]
+        elif isinstance(current, list) and idx is not None:
+            if 0 <= idx < len(current):
+                current = current[idx]
+            else:
+                return None
+        elif isinstance(current, list) and current:
+            current = current[0]
+            if isinstance(current, dict) and key in current:
+                current = current[key]
+            else:
+                return None
+        else:
+            return None
+    return current
+
+
+def make_extractor(path: str) -> Extractor:
+    """Chọn extractor rẻ nhất cho path: identity / 1 key / walk đầy đủ."""
+    keys = compile_path(path)
+    if not keys:
+        return lambda data: data
+    if len(keys) == 1 and keys[0][1] is None:
+        key = keys[0][0]
+
+        def _single(data: Any) -> Any:
+            if isinstance(data, list) and data:
+                data = data[0]
+            if isinstance(data, dict):
+                return data[key] if key in data else None
+            if isinstance(data, list) and data:
+                first = data[0]
+                return first[key] if isinstance(first, dict) and key in first else None
+            return None
+
+        return _single
+    return lambda data: walk_path(data, keys)
+
+
+@dataclass
+class FieldPlan:
+    target_field: str
+    source_path: str
+    extract: Extractor
+
+
+@dataclass
+class DependencyPlan:
+    dep_key: str
+    from_step: int
+    # key trong global_dependency_cache khớp token của dep_key (chọn sẵn lúc compile)
+    cache_key: Optional[str]
+    fields: List[FieldPlan] = field(default_factory=list)
+    # Không có field_mappings -> lấy trực tiếp theo dep_key
+    direct: Optional[FieldPlan] = None
+
+
+@dataclass
+class StepPlan:
+    deps: List[DependencyPlan] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.deps
+
+
+def match_cache_key(dep_key: str, cache_keys: List[str]) -> Optional[str]:
+    """Key đầu tiên trong cache chứa một token bất kỳ của dep_key (giống logic cũ)."""
+    tokens = dep_key.lower().split("_")
+    for cache_key in cache_keys:
+        lowered = cache_key.lower()
+        if any(token in lowered for token in tokens):
+            return cache_key
+    return None
+
+
+def compile_dependencies(data_dependencies: Dict[str, Any], cache_keys: List[str]) -> StepPlan:
+    plan = StepPlan()
+    for dep_key, dep_info in (data_dependencies or {}).items():
+        if not (isinstance(dep_info, dict) and "from_step" in dep_info):
+            continue
+        field_mappings = dep_info.get("field_mappings", {}) or {}
+        dep_plan = DependencyPlan(
+            dep_key=dep_key,
+            from_step=dep_info["from_step"],
+            cache_key=match_cache_key(dep_key, cache_keys),
+        )
+        if field_mappings:
+            dep_plan.fields = [
+                FieldPlan(target_field=t, source_path=src, extract=make_extractor(src))
+                for t, src in field_mappings.items()
+            ]
+        else:
+            dep_plan.direct = FieldPlan(target_field=dep_key, source_path=dep_key, extract=make_extractor(dep_key))
+        plan.deps.append(dep_plan)
+    return plan
@@ -6,7 +6,7 @@ from .logging_setup import setup_logging
 import re   
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .http_client import HttpClient
 from .io_file import FileService
@@ -16,6 +16,7 @@ from .dependency import DependencyService, NOT_SURE
 from .url_builder import clean_endpoint, required_path_vars, substitute_path_vars, build_urls
 from .models import TestCaseCore, DataRow, InjectedDataset, TestCaseWithDataset, StepModel
 from .parser import parse_test_case_core_from_dict, parse_all_from_files
+from .scheduler import build_waves
 import datetime
 logger = setup_logging()
 
@@ -30,12 +31,15 @@ class SequenceRunner:
         skip_preload: bool = False,
         base_module_file: str = __file__,
         out_file_name: Optional[str] = None,
+        artifact_format: str = "json",
+        http_options: Optional[Dict[str, Any]] = None,
     ):
         self.service_name = service_name
         self.base_url = base_url.rstrip("/")
         self.endpoint_filter = endpoint
-        self.file = FileService(service_name , base_module_file, out_file_name)
-        self.http = HttpClient(token=token)
+        self.file = FileService(service_name , base_module_file, out_file_name, artifact_format=artifact_format)
+        # http_options: pool_connections / pool_maxsize / per_host_limit / retry_budget ...
+        self.http = HttpClient(token=token, **(http_options or {}))
         self.dep = DependencyService()
         self.response_cache: Dict[str, Any] = {}
 
@@ -69,18 +73,13 @@ class SequenceRunner:
     ) -> Dict[str, Any]:
         endpoint = step.endpoint
         method = step.method.upper()
-        base_params = step.query_parameters
-        base_body = step.request_body
         path_vars = step.path_variables
-        data_deps = step.data_dependencies
 
         if step_responses is None:
             step_responses = []
 
-        # 1) Resolve data dependencies
-        resolved_params, resolved_body = self.dep.resolve_dependencies(
-            base_params, base_body, data_deps, current_step, step_responses
-        )
+        # 1) Resolve data dependencies (compiled plan per StepModel)
+        resolved_params, resolved_body = self.dep.resolve_step(step, current_step, step_responses)
 
         # 2) Merge test data
         csv_path_vars, not_sure_params = {}, {}
@@ -134,8 +133,9 @@ class SequenceRunner:
         if missing_vars:
             for v in missing_vars:
                 # ưu tiên cache id động nếu có (theo key var)
-                if self.dep.available_ids_cache.get(v):
-                    all_path_vars[v] = self.dep.available_ids_cache[v][0]
+                cached_id = self.dep.id_pool.first(v)
+                if cached_id is not None:
+                    all_path_vars[v] = cached_id
                 else:
                     # generic fallback: id-like -> '1', else 'default'
                     all_path_vars[v] = "1" if ("id" in v.lower() or v.lower().endswith("id")) else "default"
@@ -217,23 +217,15 @@ class SequenceRunner:
             }
 
     # ------------------------------------------------------------------
-    # Run a single test case file
+    # Test case loading & result recording (shared by sync/async runners)
     # ------------------------------------------------------------------
-    def run_test_case(self, test_case_file: Path) -> bool:
-        logger.info(f"Running test case: {test_case_file.name}")
-        is_pass = False
-
-        # Load and parse test case using models
+    def prepare_test_case(
+        self, test_case_file: Path
+    ) -> Tuple[TestCaseCore, str, List[Dict[str, Any]]]:
+        """Load a test case file and build its combined param/body data rows."""
         test_case_dict = self.file.load_test_case(test_case_file)
         test_case = parse_test_case_core_from_dict(test_case_dict)
         test_case_id = test_case_file.stem
-        target_endpoint = test_case.endpoint
-        logger.info(f"🎯 Target endpoint: {target_endpoint}")
-
-        steps: List[StepModel] = test_case.steps
-        if not steps:
-            logger.warning(f"No steps found in test case: {test_case_id}")
-            return is_pass
 
         # CSV locate by endpoint_identifier (compat rules)
         endpoint_identifier = (
@@ -263,6 +255,131 @@ class SequenceRunner:
                 )
             logger.info(f"🧪 Will run {len(test_data_rows)} times (combine param/body rows by index)")
 
+        return test_case, test_case_id, test_data_rows
+
+    def record_skipped_step(
+        self,
+        test_case_id: str,
+        step_number: int,
+        step: StepModel,
+        row_idx: int,
+        expected_status: str,
+        result: Dict[str, Any],
+    ) -> None:
+        """Log CSV error once for a row skipped because of unresolved %not-sure%."""
+        self.file.write_csv_row(
+            {
+                "test_case_id": test_case_id,
+                "step_number": step_number,
+                "endpoint": step.endpoint,
+                "method": step.method,
+                "test_data_row": row_idx,
+                "request_params": json.dumps(result.get("merged_params", {})),
+                "request_body": json.dumps(result.get("merged_body", {})),
+                "final_url": result.get("url", ""),
+                "response_status": None,
+                "expected_status": expected_status,
+                "execution_time": f"{result.get('execution_time', 0.0):.3f}s",
+                "status": "ERROR(%not-sure%)",
+            }
+        )
+        logger.error(f"  ❌ ERROR(%not-sure%): {result.get('error')}")
+
+    def record_target_result(
+        self,
+        test_case_id: str,
+        target_endpoint: str,
+        step_number: int,
+        step: StepModel,
+        row_idx: int,
+        row: Dict[str, Any],
+        expected_status: str,
+        result: Dict[str, Any],
+    ) -> bool:
+        """Assert the target step, save its response JSON and CSV row."""
+        actual_status = result["status_code"] or 0
+        is_pass = is_status_match(actual_status, expected_status)
+
+        # Save target response JSON
+        payload = {
+            "test_case_id": test_case_id,
+            "target_endpoint": target_endpoint,
+            "step_number": step_number,
+            "data_row": row_idx,
+            "request": {
+                "url": result.get("url", ""),
+                "method": step.method,
+                "endpoint": step.endpoint,
+                "base_query_parameters": step.query_parameters,
+                "merged_query_parameters": result.get("merged_params", {}),
+                "base_request_body": step.request_body,
+                "merged_request_body": result.get("merged_body", {}),
+                "test_data_used": row,
+            },
+            "response": {
+                "status_code": result["status_code"],
+                "body": result["response"],
+                "execution_time": f"{result['execution_time']:.3f}s",
+                "success": result["success"],
+                "error": result.get("error"),
+            },
+            "validation": {
+                "expected_status": expected_status,
+                "actual_status": actual_status,
+                "status_match": is_pass,
+                "test_result": "PASS" if is_pass else "FAIL",
+            },
+        }
+        self.file.save_target_response(test_case_id, row_idx, payload)
+
+        # CSV row
+        self.file.write_csv_row(
+            {
+                "test_case_id": test_case_id,
+                "step_number": step_number,
+                "endpoint": step.endpoint,
+                "method": step.method,
+                "test_data_row": row_idx,
+                "request_params": json.dumps(result.get("merged_params", {})),
+                "request_body": json.dumps(result.get("merged_body", {})),
+                "final_url": result.get("url", ""),
+                "response_status": result["status_code"],
+                "expected_status": expected_status,
+                "execution_time": f"{result['execution_time']:.3f}s",
+                "status": "PASS" if is_pass else "FAIL",
+            }
+        )
+
+        status_emoji = "✅" if is_pass else "❌"
+        expected_info = f"(expected: {expected_status})" if expected_status != "2xx" else ""
+        logger.info(
+            f"  {status_emoji} 🎯 TARGET: {step.method} {step.endpoint} "
+            f"-> {result['status_code']} {expected_info} ({result['execution_time']:.3f}s)"
+        )
+        if not is_pass and result.get("error"):
+            logger.error(f"    Error: {result.get('error')}")
+        if not is_pass and result["response"]:
+            logger.error(f"    Response: {json.dumps(result['response'], indent=2)}")
+
+        return is_pass
+
+    # ------------------------------------------------------------------
+    # Run a single test case file
+    # ------------------------------------------------------------------
+    def run_test_case(self, test_case_file: Path) -> bool:
+        logger.info(f"Running test case: {test_case_file.name}")
+        is_pass = False
+
+        # Load and parse test case using models
+        test_case, test_case_id, test_data_rows = self.prepare_test_case(test_case_file)
+        target_endpoint = test_case.endpoint
+        logger.info(f"🎯 Target endpoint: {target_endpoint}")
+
+        steps: List[StepModel] = test_case.steps
+        if not steps:
+            logger.warning(f"No steps found in test case: {test_case_id}")
+            return is_pass
+
         # Iterate rows
         for row_idx, row in enumerate(test_data_rows, start=1):
             logger.info(f"Running with test data row {row_idx}/{len(test_data_rows)}")
@@ -280,23 +397,9 @@ class SequenceRunner:
 
                 # If skip because unresolved %not-sure% → log CSV error once and skip whole row
                 if result.get("skipped"):
-                    self.file.write_csv_row(
-                        {
-                            "test_case_id": test_case_id,
-                            "step_number": step_idx + 1,
-                            "endpoint": step.endpoint,
-                            "method": step.method,
-                            "test_data_row": row_idx,
-                            "request_params": json.dumps(result.get("merged_params", {})),
-                            "request_body": json.dumps(result.get("merged_body", {})),
-                            "final_url": result.get("url", ""),
-                            "response_status": None,
-                            "expected_status": expected_status,
-                            "execution_time": f"{result.get('execution_time', 0.0):.3f}s",
-                            "status": "ERROR(%not-sure%)",
-                        }
+                    self.record_skipped_step(
+                        test_case_id, step_idx + 1, step, row_idx, expected_status, result
                     )
-                    logger.error(f"  ❌ ERROR(%not-sure%): {result.get('error')}")
                     skip_row = True
                     break
 
@@ -315,69 +418,10 @@ class SequenceRunner:
                     continue
 
                 # Target step: assert & log
-                actual_status = result["status_code"] or 0
-                is_pass = is_status_match(actual_status, expected_status)
-
-                # Save target response JSON
-                payload = {
-                    "test_case_id": test_case_id,
-                    "target_endpoint": target_endpoint,
-                    "step_number": step_idx + 1,
-                    "data_row": row_idx,
-                    "request": {
-                        "url": result.get("url", ""),
-                        "method": step.method,
-                        "endpoint": step.endpoint,
-                        "base_query_parameters": step.query_parameters,
-                        "merged_query_parameters": result.get("merged_params", {}),
-                        "base_request_body": step.request_body,
-                        "merged_request_body": result.get("merged_body", {}),
-                        "test_data_used": row,
-                    },
-                    "response": {
-                        "status_code": result["status_code"],
-                        "body": result["response"],
-                        "execution_time": f"{result['execution_time']:.3f}s",
-                        "success": result["success"],
-                        "error": result.get("error"),
-                    },
-                    "validation": {
-                        "expected_status": expected_status,
-                        "actual_status": actual_status,
-                        "status_match": is_pass,
-                        "test_result": "PASS" if is_pass else "FAIL",
-                    },
-                }
-                self.file.save_target_response(test_case_id, row_idx, payload)
-
-                # CSV row
-                self.file.write_csv_row(
-                    {
-                        "test_case_id": test_case_id,
-                        "step_number": step_idx + 1,
-                        "endpoint": step.endpoint,
-                        "method": step.method,
-                        "test_data_row": row_idx,
-                        "request_params": json.dumps(result.get("merged_params", {})),
-                        "request_body": json.dumps(result.get("merged_body", {})),
-                        "final_url": result.get("url", ""),
-                        "response_status": result["status_code"],
-                        "expected_status": expected_status,
-                        "execution_time": f"{result['execution_time']:.3f}s",
-                        "status": "PASS" if is_pass else "FAIL",
-                    }
-                )
-
-                status_emoji = "✅" if is_pass else "❌"
-                expected_info = f"(expected: {expected_status})" if expected_status != "2xx" else ""
-                logger.info(
-                    f"  {status_emoji} 🎯 TARGET: {step.method} {step.endpoint} "
-                    f"-> {result['status_code']} {expected_info} ({result['execution_time']:.3f}s)"
+                is_pass = self.record_target_result(
+                    test_case_id, target_endpoint, step_idx + 1, step,
+                    row_idx, row, expected_status, result,
                 )
-                if not is_pass and result.get("error"):
-                    logger.error(f"    Error: {result.get('error')}")
-                if not is_pass and result["response"]:
-                    logger.error(f"    Response: {json.dumps(result['response'], indent=2)}")
 
                 time.sleep(0.1)
 
@@ -390,6 +434,17 @@ class SequenceRunner:
     # ------------------------------------------------------------------
     # Run all test cases
     # ------------------------------------------------------------------
+    def plan_waves(self, test_case_files: List[Path]) -> List[List[Path]]:
+        """Chia test case thành các wave theo DAG (topolist + data_dependencies)."""
+        test_cases: Dict[Path, Optional[TestCaseCore]] = {}
+        for f in test_case_files:
+            try:
+                test_cases[f] = parse_test_case_core_from_dict(self.file.load_test_case(f))
+            except Exception as e:
+                logger.warning(f"Failed to parse test case {f}: {e}")
+                test_cases[f] = None
+        return build_waves(test_cases, self.file.load_topolist())
+
     def run_all(self):
         logger.info(f"Starting test execution for service: {self.service_name}")
         test_case_files = self.file.find_test_case_files(self.endpoint_filter)
@@ -398,36 +453,14 @@ class SequenceRunner:
             return
         out_file_name = self.file.open_csv_output(self.service_name)
 
-        # sort theo topolist nếu có
-        topolist = self.file.load_topolist()
-        if topolist:
-            def sort_key(file_path: Path):
-                filename = file_path.stem
-                for i, endpoint in enumerate(topolist):
-                    if "-" in endpoint:
-                        method, path = endpoint.split("-", 1)
-                        path_pattern = path.replace("/", "_").replace("{", "").replace("}", "_")
-                        patterns = [
-                            f"{path_pattern}",
-                            f"{method.lower()}{path_pattern}",
-                            f"{path_pattern}{method}",
-                            f"{path_pattern}{method.title()}",
-                        ]
-                        for p in patterns:
-                            if p in filename:
-                                return i
-                return len(topolist)
-
-            logger.info("📋 Sorting test cases by topolist order...")
-            test_case_files.sort(key=sort_key)
-
-        
-        for test_case_file in test_case_files:
-            try:
-                if self.run_test_case(test_case_file):
-                    pass
-            except Exception as e:
-                logger.error(f"Error running test case {test_case_file.name}: {e}")
+        # Sync: chạy lần lượt từng wave (thứ tự đã tôn trọng producer -> consumer)
+        for wave in self.plan_waves(test_case_files):
+            for test_case_file in wave:
+                try:
+                    if self.run_test_case(test_case_file):
+                        pass
+                except Exception as e:
+                    logger.error(f"Error running test case {test_case_file.name}: {e}")
 
         return out_file_name
     # ------------------------------------------------------------------
@@ -0,0 +1,142 @@
+# src/sequence_runner/scheduler.py
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .models import TestCaseCore
+
+logger = logging.getLogger(__name__)
+
+
+def topo_rank_index(topolist: List[str]) -> Dict[str, int]:
+    """Map endpoint 'method-/path' (lowercase method) -> vị trí trong topolist."""
+    index: Dict[str, int] = {}
+    for i, endpoint in enumerate(topolist or []):
+        key = _normalize_endpoint(endpoint)
+        index.setdefault(key, i)
+    return index
+
+
+def _normalize_endpoint(endpoint: str) -> str:
+    if "-" not in (endpoint or ""):
+        return endpoint or ""
+    method, path = endpoint.split("-", 1)
+    return f"{method.lower()}-{path}"
+
+
+def _is_delete(endpoint: str) -> bool:
+    return _normalize_endpoint(endpoint).startswith("delete-")
+
+
+def _producer_endpoints(test_case: TestCaseCore) -> Set[str]:
+    """Các endpoint mà test case lấy dữ liệu từ đó (theo data_dependencies.from_step)."""
+    producers: Set[str] = set()
+    steps = test_case.steps
+    for step in steps:
+        for dep_info in (step.data_dependencies or {}).values():
+            if not (isinstance(dep_info, dict) and "from_step" in dep_info):
+                continue
+            try:
+                from_idx = int(dep_info["from_step"]) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= from_idx < len(steps) and steps[from_idx].endpoint:
+                producers.add(_normalize_endpoint(steps[from_idx].endpoint))
+    return producers
+
+
+def build_waves(
+    test_cases: Dict[Path, Optional[TestCaseCore]],
+    topolist: List[str],
+) -> List[List[Path]]:
+    """
+    Dựng DAG giữa các test case rồi chia thành các "wave" (Kahn theo tầng).
+
+    Cạnh P -> C khi:
+      - C có data_dependency tới endpoint đích của P, và P đứng trước C
+        trong topolist (cạnh ngược thứ tự topolist bị bỏ để không tạo chu trình,
+        cùng vị trí thì so theo tên file);
+      - C là delete-* còn P không phải delete-* (topolist đẩy delete xuống cuối,
+        tránh xoá resource khi test case khác còn cần). Rào này là một nút
+        sentinel chung, không phải D x N cạnh.
+
+    Test case trong cùng wave độc lập với nhau nên có thể chạy song song.
+    Test case không parse được sẽ nằm ở wave cuối.
+    Chi phí O(files + edges): tra topolist bằng dict thay vì so khớp chuỗi.
+    """
+    rank_index = topo_rank_index(topolist)
+    default_rank = len(topolist or [])
+
+    parsed: Dict[Path, TestCaseCore] = {p: tc for p, tc in test_cases.items() if tc is not None}
+    unparsed: List[Path] = sorted(p for p, tc in test_cases.items() if tc is None)
+
+    rank: Dict[Path, int] = {
+        p: rank_index.get(_normalize_endpoint(tc.endpoint), default_rank) for p, tc in parsed.items()
+    }
+
+    by_target: Dict[str, List[Path]] = defaultdict(list)
+    for p, tc in parsed.items():
+        by_target[_normalize_endpoint(tc.endpoint)].append(p)
+
+    edges: Dict[Path, Set[Path]] = defaultdict(set)
+    indegree: Dict[Path, int] = {p: 0 for p in parsed}
+
+    def add_edge(src: Path, dst: Path) -> None:
+        if src == dst or dst in edges[src]:
+            return
+        edges[src].add(dst)
+        indegree[dst] += 1
+
+    def order(p: Path):
+        return (rank[p], p.name)
+
+    for consumer, tc in parsed.items():
+        for producer_ep in _producer_endpoints(tc):
+            for producer in by_target.get(producer_ep, ()):
+                # Chỉ giữ cạnh cùng chiều thứ tự (rank, tên file) -> luôn là DAG;
+                # delete-* không được làm producer cho test case thường (đã có rào delete)
+                if _is_delete(producer_ep) and not _is_delete(tc.endpoint):
+                    continue
+                if order(producer) < order(consumer):
+                    add_edge(producer, consumer)
+
+    # Rào delete: một nút sentinel thay cho D x N cạnh "mọi test case thường -> mọi delete".
+    # Mỗi delete chờ thêm 1 cạnh từ sentinel; sentinel mở khi mọi test case thường đã chạy.
+    deletes = [p for p, tc in parsed.items() if _is_delete(tc.endpoint)]
+    barrier_pending = len(parsed) - len(deletes)
+    if barrier_pending:
+        for d in deletes:
+            indegree[d] += 1
+
+    waves: List[List[Path]] = []
+    current = [p for p, deg in indegree.items() if deg == 0]
+    while current:
+        current.sort(key=order)
+        waves.append(current)
+        nxt: List[Path] = []
+        released: List[Path] = [q for p in current for q in edges.get(p, ())]
+        if barrier_pending:
+            barrier_pending -= sum(1 for p in current if not _is_delete(parsed[p].endpoint))
+            if barrier_pending == 0:
+                released.extend(deletes)
+        for q in released:
+            indegree[q] -= 1
+            if indegree[q] == 0:
+                nxt.append(q)
+        current = nxt
+
+    scheduled = sum(len(w) for w in waves)
+    if scheduled != len(parsed):
+        # Không nên xảy ra (cạnh luôn theo thứ tự rank) - phòng hờ: chạy nốt theo rank
+        leftover = sorted((p for p, deg in indegree.items() if deg > 0), key=order)
+        logger.warning(f"⚠️ Dependency cycle among {len(leftover)} test cases, running them last in topolist order")
+        waves.append(leftover)
+
+    if unparsed:
+        waves.append(unparsed)
+
+    logger.info(f"📋 Scheduled {len(test_cases)} test cases into {len(waves)} waves")
+    return waves
@@ -2,14 +2,12 @@
 
 import asyncio
 import re
-import io
-import contextlib
 from typing import Any, Dict, List, Optional
-import traceback
 
 from core.base_tool import BaseTool
 from schemas.tools.code_executor import CodeExecutorInput, CodeExecutorOutput
 from common.logger import LoggerFactory, LoggerType, LogLevel
+from utils.script_execution_pool import get_script_pool
 
 
 class CodeExecutorTool(BaseTool):
@@ -61,6 +59,9 @@ class CodeExecutorTool(BaseTool):
             "restricted_modules", []
         )
         self.timeout_seconds = cfg.get("timeout", 30)  # Default timeout: 30 seconds
+        # "thread" for trusted scripts, "process" for isolation (forked workers)
+        self.execution_backend = cfg.get("execution_backend", "thread")
+        self.max_workers = cfg.get("max_workers")
 
     async def _execute(self, inp: CodeExecutorInput) -> CodeExecutorOutput:
         """Execute Python code natively"""
@@ -106,14 +107,6 @@ class CodeExecutorTool(BaseTool):
         self.logger.debug(f"Context variables provided: {context_vars}")
         self.logger.add_context(context_var_count=len(context_vars))
 
-        # Create a namespace for execution
-        namespace = {**context_vars}
-        self.logger.debug(f"Initial namespace keys: {list(namespace.keys())}")
-
-        # Prepare output capturing
-        stdout_capture = io.StringIO()
-        stderr_capture = io.StringIO()
-
         # Track execution time
         start = asyncio.get_event_loop().time()
 
@@ -159,111 +152,32 @@ class CodeExecutorTool(BaseTool):
 
         self.logger.debug(f"Starting code execution with timeout {timeout} seconds")
 
-        # Execute with timeout and output capturing
-        async def execute_with_timeout():
-            try:
-                with contextlib.redirect_stdout(
-                    stdout_capture
-                ), contextlib.redirect_stderr(stderr_capture):
-                    # Execute the code in the namespace
-                    exec(compiled_code, namespace)
-
-                    # Check if the code defines any functions
-                    functions = {
-                        name: obj
-                        for name, obj in namespace.items()
-                        if callable(obj)
-                        and name not in context_vars
-                        and not name.startswith("__")
-                    }
-
-                    # If there's a function defined and no explicit _result,
-                    # try to execute the first function with available context
-                    result = namespace.get("_result", None)
-                    if result is None and functions:
-                        # Get the first defined function
-                        func_name, func = next(iter(functions.items()))
-                        self.logger.debug(f"Executing function: {func_name}")
-
-                        # Check if we have matching parameters for this function
-                        import inspect
-
-                        sig = inspect.signature(func)
-                        params = sig.parameters
-
-                        # If we have parameters to pass
-                        if params:
-                            # Try to match parameter names with context variables
-                            args = {}
-                            for param_name in params:
-                                if param_name in context_vars:
-                                    args[param_name] = context_vars[param_name]
-
-                            # Execute the function with matched args
-                            if args:
-                                self.logger.debug(
-                                    f"Calling function with args: {list(args.keys())}"
-                                )
-                                result = func(**args)
-                            else:
-                                # Try to execute without args if no match found
-                                self.logger.debug("Calling function without args")
-                                result = func()
-                        else:
-                            # Function takes no arguments
-                            self.logger.debug("Calling function with no parameters")
-                            result = func()
+        # Run in the shared worker pool: real timeouts, per-call output capture
+        pool = get_script_pool(self.execution_backend, self.max_workers)
+        payload = compiled_code if pool.backend == "thread" else code
+        outcome = await pool.run(payload, context_vars, timeout=timeout)
 
-                    return True, result
-            except Exception as e:
-                self.logger.debug(f"Code execution error: {str(e)}")
-                return False, e
+        elapsed = asyncio.get_event_loop().time() - start
+        stdout_value = outcome.stdout
+        stderr_value = outcome.stderr
 
-        try:
-            success, result = await asyncio.wait_for(
-                execute_with_timeout(), timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            elapsed = asyncio.get_event_loop().time() - start
+        if outcome.timed_out:
             self.logger.error(f"Code execution timed out after {timeout} seconds")
             return CodeExecutorOutput(
                 result="",
                 success=False,
-                error=f"Execution timed out after {timeout} seconds",
-                stdout=stdout_capture.getvalue(),
-                stderr=f"TimeoutError: Execution exceeded {timeout} seconds",
+                error=outcome.error,
+                stdout=stdout_value,
+                stderr=stderr_value,
                 execution_time=elapsed,
                 validated_code=code,
             )
 
-        elapsed = asyncio.get_event_loop().time() - start
-        stdout_value = stdout_capture.getvalue()
-        stderr_value = stderr_capture.getvalue()
-
-        if success:
-            # If result is an exception, it's a failure
-            if isinstance(result, Exception):
-                error_msg = str(result)
-                self.logger.error(f"Code execution resulted in exception: {error_msg}")
-                self.logger.debug(f"Exception type: {type(result).__name__}")
-                self.logger.debug(f"Stdout: {stdout_value}")
-                self.logger.debug(f"Stderr: {stderr_value}")
-                return CodeExecutorOutput(
-                    result="",
-                    success=False,
-                    error=error_msg,
-                    stdout=stdout_value,
-                    stderr=stderr_value or error_msg,
-                    execution_time=elapsed,
-                    validated_code=code,
-                )
-
-            # Success case - return the result or stdout if result is None
-            # self.logger.info(f"Code execution successful in {elapsed:.3f}s")
+        if outcome.success:
+            result = outcome.result
             self.logger.debug(f"Result type: {type(result).__name__}")
             self.logger.debug(f"Result value: {result}")
             self.logger.debug(f"Stdout: {stdout_value}")
-            self.logger.debug(f"Stderr: {stderr_value}")
 
             # Determine final result value
             final_result = str(result) if result is not None else stdout_value
@@ -274,35 +188,22 @@ class CodeExecutorTool(BaseTool):
                 success=True,
                 error=None,
                 stdout=stdout_value,
-                stderr=stderr_value,
-                execution_time=elapsed,
-                validated_code=code,
-            )
-        else:
-            # Handle execution error
-            error_msg = (
-                str(result) if isinstance(result, Exception) else "Execution failed"
-            )
-            tb = ""
-            if isinstance(result, Exception):
-                tb = "".join(
-                    traceback.format_exception(
-                        type(result), result, result.__traceback__
-                    )
-                )
-            self.logger.error(f"Code execution failed: {error_msg}")
-            self.logger.debug(
-                f"Error type: {type(result).__name__ if isinstance(result, Exception) else 'Unknown'}"
-            )
-            self.logger.debug(f"Traceback: {tb}")
-            self.logger.debug(f"Stdout: {stdout_value}")
-            self.logger.debug(f"Stderr: {stderr_value}")
-            return CodeExecutorOutput(
-                result="",
-                success=False,
-                error=error_msg,
-                stdout=stdout_value,
-                stderr=tb or error_msg,
+                stderr="",
                 execution_time=elapsed,
                 validated_code=code,
             )
+
+        # Handle execution error
+        error_msg = outcome.error or "Execution failed"
+        self.logger.error(f"Code execution failed: {error_msg}")
+        self.logger.debug(f"Traceback: {stderr_value}")
+        self.logger.debug(f"Stdout: {stdout_value}")
+        return CodeExecutorOutput(
+            result="",
+            success=False,
+            error=error_msg,
+            stdout=stdout_value,
+            stderr=stderr_value or error_msg,
+            execution_time=elapsed,
+            validated_code=code,
+        )
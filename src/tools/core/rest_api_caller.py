@@ -1,7 +1,8 @@
 # tools/rest_api_caller.py
 
+import asyncio
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 import httpx
 
@@ -49,7 +50,51 @@ class RestApiCallerTool(BaseTool):
         )
 
         # You can accept config overrides for timeouts, retries, etc.
-        self._timeout = config.get("timeout", 10.0) if config else 10.0
+        config = config or {}
+        self._timeout = config.get("timeout", 10.0)
+
+        # Connection pool settings for the shared AsyncClient
+        self._limits = httpx.Limits(
+            max_connections=config.get("max_connections", 100),
+            max_keepalive_connections=config.get("max_keepalive_connections", 20),
+            keepalive_expiry=config.get("keepalive_expiry", 30.0),
+        )
+        self._http2 = config.get("http2", False)
+
+        # One AsyncClient per event loop, created lazily; all closed in cleanup()
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared AsyncClient of the running loop, creating it on first use.
+
+        httpx clients are tied to the event loop they were first used on, so
+        each loop the tool is used from gets its own client. Clients of loops
+        that have since been closed are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        for closed in [other for other in self._clients if other.is_closed()]:
+            self._clients.pop(closed)
+            self.logger.debug("Dropped AsyncClient of a closed event loop")
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            http2 = self._http2
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    self.logger.warning(
+                        "HTTP/2 requested but 'h2' is not installed, using HTTP/1.1"
+                    )
+                    http2 = False
+            client = httpx.AsyncClient(
+                timeout=self._timeout, limits=self._limits, http2=http2
+            )
+            self._clients[loop] = client
+            self.logger.debug(
+                f"Created shared AsyncClient (http2={http2}, "
+                f"max_connections={self._limits.max_connections})"
+            )
+        return client
 
     async def _execute(self, inp: RestApiCallerInput) -> RestApiCallerOutput:
         req: RestRequest = inp.request  # already validated by Pydantic
@@ -68,17 +113,17 @@ class RestApiCallerTool(BaseTool):
 
         try:
             # Use a shared AsyncClient for connection pooling
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                self.logger.debug("Executing HTTP request")
-
-                # Dynamically choose the HTTP method
-                response = await client.request(
-                    method=req.method.upper(),
-                    url=req.url,
-                    headers=req.headers or {},
-                    params=req.params or {},
-                    json=req.json_body,
-                )
+            client = self._get_client()
+            self.logger.debug("Executing HTTP request")
+
+            # Dynamically choose the HTTP method
+            response = await client.request(
+                method=req.method.upper(),
+                url=req.url,
+                headers=req.headers or {},
+                params=req.params or {},
+                json=req.json_body,
+            )
 
             elapsed = time.perf_counter() - start
 
@@ -120,5 +165,23 @@ class RestApiCallerTool(BaseTool):
             raise
 
     async def cleanup(self) -> None:
-        # Nothing to clean up here
+        """Close the AsyncClients of every loop and release pooled connections."""
+        current = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        for loop, client in clients.items():
+            if client.is_closed:
+                continue
+            try:
+                if loop is current:
+                    await client.aclose()
+                elif loop.is_running():
+                    # Close on the loop that owns the connections
+                    await asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                    )
+                else:
+                    self.logger.debug("AsyncClient's event loop is not running, dropping it")
+            except RuntimeError as e:
+                # Client bound to a loop that is already closed
+                self.logger.debug(f"Could not close AsyncClient cleanly: {e}")
         self.logger.debug("RestApiCallerTool cleanup completed")
@@ -1,6 +1,7 @@
 # tools/core/test_data_verifier.py
 
-from typing import Dict, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.base_tool import BaseTool
 from schemas.tools.test_data_verifier import (
@@ -11,7 +12,42 @@ from schemas.tools.test_data_verifier import (
 from schemas.tools.code_executor import CodeExecutorInput, CodeExecutorOutput
 from tools.core.code_executor import CodeExecutorTool
 from common.logger import LoggerFactory, LoggerType, LogLevel
-from utils.code_script_utils import prepare_validation_script
+from utils.code_script_utils import load_validation_function, prepare_validation_script
+from utils.script_execution_pool import get_script_pool
+
+
+def _build_context(test_data) -> Dict[str, Any]:
+    """Request/response objects a verification script is called with."""
+    return {
+        "request": {
+            "params": test_data.request_params or {},
+            "headers": test_data.request_headers or {},
+            "body": test_data.request_body,
+        },
+        "response": {
+            "status_code": test_data.expected_status_code,
+            "schema": test_data.expected_response_schema,
+            "contains": test_data.expected_response_contains,
+        },
+    }
+
+
+def _timeout_error(timeout: Optional[float]) -> str:
+    return f"timed out after {timeout} seconds"
+
+
+def _evaluate_row(validation_code: str, ctx: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+    """
+    Run one validation script against one context; returns (value, error).
+
+    Runs inside a script pool worker process, which keeps its own
+    compiled-function cache, so each worker compiles a script only once.
+    """
+    validate = load_validation_function(validation_code)
+    try:
+        return validate(ctx["request"], ctx["response"]), None
+    except Exception as e:
+        return False, str(e)
 
 
 class TestDataVerifierTool(BaseTool):
@@ -63,7 +99,7 @@ class TestDataVerifierTool(BaseTool):
             log_file=str(logs_dir / "test_data_verifier.log"),
         )
 
-        # Initialize code executor
+        # Initialize code executor (sequential mode)
         self.code_executor = CodeExecutorTool(
             verbose=verbose,
             cache_enabled=cache_enabled,
@@ -124,10 +160,183 @@ class TestDataVerifierTool(BaseTool):
             f"Test data IDs: {[td.id for td in inp.test_data_collection]}"
         )
 
+        script_ids = [script.id for script in inp.verification_scripts]
+        if inp.batch_mode:
+            row_outcomes = await self._verify_batched(inp)
+        else:
+            row_outcomes = await self._verify_sequential(inp)
+
         verification_results = []
         verified_test_data = []
         filtered_count = 0
+        pass_matrix = []
+
+        for test_data, (script_results, overall_valid, constraint_violations) in zip(
+            inp.test_data_collection, row_outcomes
+        ):
+            pass_matrix.append(
+                [r["result"] if r.get("success") else None for r in script_results]
+            )
+
+            # Determine if test data should be filtered
+            should_filter = False
+            error_message = None
+
+            self.logger.debug(
+                f"Test data {test_data.id} overall validation result: {overall_valid}"
+            )
+            self.logger.debug(
+                f"Test data {test_data.id} constraint violations: {constraint_violations}"
+            )
+
+            # For now, let's be more lenient and not filter based on validation results
+            # The issue might be that valid test data is failing validation scripts incorrectly
+            # Let's allow all test data through for debugging
+            should_filter = False
+
+            # Create verification result
+            verification_result = VerificationResult(
+                test_data_id=test_data.id,
+                is_valid=overall_valid,
+                verification_details={"script_results": script_results},
+                error_message=error_message,
+                constraint_violations=constraint_violations,
+            )
+            verification_results.append(verification_result)
+
+            # Add to verified data if not filtered
+            if not should_filter:
+                verified_test_data.append(test_data)
+                self.logger.debug(f"Test data {test_data.id} passed verification")
+            else:
+                filtered_count += 1
+                self.logger.debug(
+                    f"Test data {test_data.id} filtered out: {error_message}"
+                )
+
+        self.logger.info(
+            f"Verification completed: {len(verified_test_data)} verified, {filtered_count} filtered"
+        )
 
+        self.logger.debug(
+            f"Verified test data IDs: {[td.id for td in verified_test_data]}"
+        )
+
+        self.logger.debug(f"=== TEST DATA VERIFICATION END ===")
+
+        return TestDataVerifierOutput(
+            verified_test_data=verified_test_data,
+            verification_results=verification_results,
+            filtered_count=filtered_count,
+            script_ids=script_ids,
+            pass_matrix=pass_matrix,
+        )
+
+    async def _verify_batched(
+        self, inp: TestDataVerifierInput
+    ) -> List[Tuple[List[Dict[str, Any]], bool, List[str]]]:
+        """
+        Load each script once (compiled-function cache) and evaluate it against
+        the whole test data collection in one pass, optionally sharded across
+        the shared process script pool.
+        """
+        contexts = [_build_context(test_data) for test_data in inp.test_data_collection]
+        rows: List[List[Dict[str, Any]]] = [[] for _ in contexts]
+        violations: List[List[str]] = [[] for _ in contexts]
+
+        shard_count = max(1, min(inp.batch_shards, len(contexts)))
+        shard_size = -(-len(contexts) // shard_count) if contexts else 0
+        shards = [
+            contexts[k : k + shard_size] for k in range(0, len(contexts), shard_size or 1)
+        ]
+
+        for script in inp.verification_scripts:
+            base = {
+                "script_id": script.id,
+                "script_type": script.script_type,
+                "constraint_id": script.constraint_id,
+            }
+            try:
+                # Compile here first so a broken script fails once, not once per row
+                load_validation_function(script.validation_code)
+                shard_outcomes = await asyncio.gather(
+                    *[
+                        self._run_shard(script.validation_code, shard, inp.timeout)
+                        for shard in shards
+                    ]
+                )
+                outcomes = [o for shard in shard_outcomes for o in shard]
+            except Exception as e:
+                error = str(e)
+                self.logger.error(f"Script {script.id} execution failed: {error}")
+                for idx in range(len(contexts)):
+                    rows[idx].append({**base, "error": error, "success": False})
+                    violations[idx].append(f"Script {script.id} error: {error}")
+                continue
+
+            for idx, (value, error, timed_out) in enumerate(outcomes):
+                if timed_out:
+                    rows[idx].append({**base, "error": error, "success": False})
+                    violations[idx].append(f"Script {script.id} error: {error}")
+                    continue
+                if error is None:
+                    is_valid = self._interpret_value(value)
+                    raw = str(value)
+                else:
+                    # The script ran but raised: counts as a failed validation
+                    is_valid = False
+                    raw = f"Error executing validation function: {error}"
+                rows[idx].append(
+                    {
+                        **base,
+                        "result": is_valid,
+                        "raw_result": raw,
+                        "stdout": raw,
+                        "success": True,
+                    }
+                )
+                if not is_valid:
+                    violations[idx].append(f"Script {script.id} failed")
+
+        return [
+            (rows[idx], not violations[idx], violations[idx])
+            for idx in range(len(contexts))
+        ]
+
+    async def _run_shard(
+        self, validation_code: str, shard: List[Dict[str, Any]], timeout: Optional[float]
+    ) -> List[Tuple[Any, Optional[str], bool]]:
+        """
+        Evaluate one shard on a single worker process with a per-row timeout.
+
+        A row that exceeds ``timeout`` is reported as timed out; its worker is
+        terminated and replaced, and the rest of the shard keeps running.
+        """
+        pool = get_script_pool("process")
+        rows = await pool.map_rows(_evaluate_row, (validation_code,), shard, timeout)
+        error = _timeout_error(timeout)
+        outcomes: List[Tuple[Any, Optional[str], bool]] = []
+        for outcome, timed_out in rows:
+            if timed_out:
+                outcomes.append((False, error, True))
+            else:
+                value, row_error = outcome
+                outcomes.append((value, row_error, False))
+        return outcomes
+
+    def _interpret_value(self, value: Any) -> bool:
+        """Interpret a validation function's return value as pass/fail."""
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return self._parse_script_result(value, "")
+        return bool(value)
+
+    async def _verify_sequential(
+        self, inp: TestDataVerifierInput
+    ) -> List[Tuple[List[Dict[str, Any]], bool, List[str]]]:
+        """Run every (test data, script) pair as a separate CodeExecutorTool call."""
+        row_outcomes = []
         for i, test_data in enumerate(inp.test_data_collection):
             self.logger.debug(
                 f"Verifying test data {i+1}/{len(inp.test_data_collection)}: {test_data.id}"
@@ -162,18 +371,7 @@ class TestDataVerifierTool(BaseTool):
                     # Execute the prepared script with test data context
                     script_input = CodeExecutorInput(
                         code=prepared_script,
-                        context_variables={
-                            "request": {
-                                "params": test_data.request_params or {},
-                                "headers": test_data.request_headers or {},
-                                "body": test_data.request_body,
-                            },
-                            "response": {
-                                "status_code": test_data.expected_status_code,
-                                "schema": test_data.expected_response_schema,
-                                "contains": test_data.expected_response_contains,
-                            },
-                        },
+                        context_variables=_build_context(test_data),
                         timeout=inp.timeout,
                     )
 
@@ -250,57 +448,8 @@ class TestDataVerifierTool(BaseTool):
                         f"Script {script.id} execution error: {str(e)}"
                     )
 
-            # Determine if test data should be filtered
-            should_filter = False
-            error_message = None
-
-            self.logger.debug(
-                f"Test data {test_data.id} overall validation result: {overall_valid}"
-            )
-            self.logger.debug(
-                f"Test data {test_data.id} constraint violations: {constraint_violations}"
-            )
-
-            # For now, let's be more lenient and not filter based on validation results
-            # The issue might be that valid test data is failing validation scripts incorrectly
-            # Let's allow all test data through for debugging
-            should_filter = False
-
-            # Create verification result
-            verification_result = VerificationResult(
-                test_data_id=test_data.id,
-                is_valid=overall_valid,
-                verification_details={"script_results": script_results},
-                error_message=error_message,
-                constraint_violations=constraint_violations,
-            )
-            verification_results.append(verification_result)
-
-            # Add to verified data if not filtered
-            if not should_filter:
-                verified_test_data.append(test_data)
-                self.logger.debug(f"Test data {test_data.id} passed verification")
-            else:
-                filtered_count += 1
-                self.logger.debug(
-                    f"Test data {test_data.id} filtered out: {error_message}"
-                )
-
-        self.logger.info(
-            f"Verification completed: {len(verified_test_data)} verified, {filtered_count} filtered"
-        )
-
-        self.logger.debug(
-            f"Verified test data IDs: {[td.id for td in verified_test_data]}"
-        )
-
-        self.logger.debug(f"=== TEST DATA VERIFICATION END ===")
-
-        return TestDataVerifierOutput(
-            verified_test_data=verified_test_data,
-            verification_results=verification_results,
-            filtered_count=filtered_count,
-        )
+            row_outcomes.append((script_results, overall_valid, constraint_violations))
+        return row_outcomes
 
     async def cleanup(self) -> None:
         """Clean up resources."""
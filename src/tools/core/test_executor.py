@@ -19,13 +19,13 @@ from schemas.tools.test_executor import (
 )
 from schemas.tools.test_case_generator import TestCase
 from schemas.tools.test_suite_generator import TestSuite
-from schemas.tools.code_executor import CodeExecutorInput
 from schemas.tools.rest_api_caller import RestApiCallerInput, RestRequest
 from schemas.tools.constraint_miner import ApiConstraint
 from tools.core.code_executor import CodeExecutorTool
 from tools.core.rest_api_caller import RestApiCallerTool
 from common.logger import LoggerFactory, LoggerType, LogLevel
-from utils.code_script_utils import prepare_validation_script
+from utils.code_script_utils import load_validation_function
+from utils.script_execution_pool import get_script_pool
 from utils.comprehensive_report_utils import (
     ComprehensiveReportGenerator,
     ReportConfig,
@@ -75,6 +75,8 @@ class TestExecutorTool(BaseTool):
             verbose=verbose,
             cache_enabled=cache_enabled,
         )
+        # Validation functions are called directly on the shared thread pool
+        self._script_pool = get_script_pool("thread")
         self.rest_api_caller = RestApiCallerTool(
             verbose=verbose,
             cache_enabled=cache_enabled,
@@ -410,52 +412,43 @@ class TestExecutorTool(BaseTool):
                     "body": response_body,
                 }
 
-                # Context variables for script execution
-                context_vars = {
-                    "request": request_obj,
-                    "response": response_obj,
-                    "test_case": test_case.model_dump(),
-                    "response_body": response_body,
-                    "response_headers": response_headers,
-                    "status_code": status_code,
-                    "response_time": response_time,
-                    "request_details": request_details,
-                }
-
                 # Execute each validation script
                 for script in test_case.validation_scripts:
                     script_start_time = time.time()
                     try:
                         self.logger.debug(f"Executing validation script: {script.name}")
 
-                        # Prepare the validation script with execution wrapper
-                        prepared_script = prepare_validation_script(
-                            script.validation_code
-                        )
+                        # Compiled once per distinct script, shared across test cases
+                        validate = load_validation_function(script.validation_code)
 
-                        # Execute the prepared script
-                        code_input = CodeExecutorInput(
-                            code=prepared_script,
-                            context_variables=context_vars,
-                            timeout=inp.timeout,
-                        )
+                        script_error = None
+                        try:
+                            value = await self._script_pool.call(
+                                validate,
+                                request_obj,
+                                response_obj,
+                                timeout=inp.timeout,
+                            )
+                            script_passed = self._interpret_validation_value(value)
+                            script_output = str(value)
+                        except asyncio.TimeoutError:
+                            raise
+                        except Exception as e:
+                            # Same outcome as the old wrapper: the script ran but failed
+                            script_passed = False
+                            script_output = f"Error executing validation function: {e}"
+                            script_error = script_output
 
-                        script_result = await self.code_executor.execute(code_input)
                         script_execution_time = time.time() - script_start_time
 
-                        # Parse the script result
-                        script_passed = self._parse_script_result(
-                            script_result, script.name
-                        )
-
                         validation_result = ValidationScriptResult(
                             script_id=script.id,
                             script_name=script.name,
                             passed=script_passed,
-                            result=script_result.stdout,
-                            error=script_result.error,
+                            result=script_output,
+                            error=script_error,
                             description=script.description,
-                            execution_success=script_result.success,
+                            execution_success=True,
                             execution_time=script_execution_time,
                         )
 
@@ -464,14 +457,15 @@ class TestExecutorTool(BaseTool):
                         if not script_passed:
                             validation_passed = False
                             self.logger.warning(
-                                f"Validation script {script.name} failed: {script_result.error or 'Script returned False'}"
+                                f"Validation script {script.name} failed: {script_error or 'Script returned False'}"
                             )
 
                     except Exception as e:
                         script_execution_time = time.time() - script_start_time
-                        error_msg = (
-                            f"Error executing validation script {script.name}: {str(e)}"
-                        )
+                        if isinstance(e, asyncio.TimeoutError):
+                            error_msg = f"Validation script {script.name} timed out after {inp.timeout} seconds"
+                        else:
+                            error_msg = f"Error executing validation script {script.name}: {str(e)}"
                         self.logger.error(error_msg)
 
                         validation_result = ValidationScriptResult(
@@ -533,33 +527,13 @@ class TestExecutorTool(BaseTool):
                 ),
             )
 
-    def _parse_script_result(self, script_result, script_name: str) -> bool:
-        """
-        Parse the result of a validation script execution.
-
-        Args:
-            script_result: The result from code executor
-            script_name: Name of the script for logging
-
-        Returns:
-            bool: True if script passed, False otherwise
-        """
-        if not script_result.success:
-            self.logger.warning(
-                f"Script {script_name} execution failed: {script_result.error}"
-            )
-            return False
-
-        stdout = script_result.stdout.strip() if script_result.stdout else ""
-
-        if not stdout:
-            self.logger.warning(
-                f"Script {script_name} produced no output, defaulting to False"
-            )
-            return False
-
-        # Parse the stdout to determine if the script passed
-        return self._extract_boolean_result(stdout)
+    def _interpret_validation_value(self, value: Any) -> bool:
+        """Interpret the value returned by a validation function as pass/fail."""
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return self._extract_boolean_result(value)
+        return bool(value)
 
     def _extract_boolean_result(self, result_string: str) -> bool:
         """Extract boolean result from script execution output."""
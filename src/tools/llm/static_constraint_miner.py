@@ -1,6 +1,8 @@
 # tools/static_constraint_miner.py
 
-from typing import Dict, List, Optional
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from core.base_tool import BaseTool
 from schemas.tools.constraint_miner import (
@@ -107,11 +109,6 @@ class StaticConstraintMinerTool(BaseTool):
                 f"include_correlation_constraints={inp.include_correlation_constraints}"
             )
 
-        # Initialize result containers
-        request_param_constraints = []
-        request_body_constraints = []
-        response_property_constraints = []
-        request_response_constraints = []
         mining_results = {}
 
         # Check which constraint types to mine
@@ -120,145 +117,122 @@ class StaticConstraintMinerTool(BaseTool):
         mine_response_property = "RESPONSE_PROPERTY" in inp.constraint_types
         mine_request_response = "REQUEST_RESPONSE" in inp.constraint_types
 
-        try:
-            # 1. Mine request parameter constraints
-            if mine_request_param:
-                self.logger.debug("Mining request parameter constraints")
-
-                param_input = RequestParamConstraintMinerInput(
-                    endpoint_info=endpoint,
-                    include_examples=inp.include_examples,
-                    focus_on_validation=True,
-                )
-
-                param_output = await self.request_param_miner.execute(param_input)
-                request_param_constraints = param_output.param_constraints
-                mining_results["param_mining"] = {
-                    "count": len(request_param_constraints),
-                    "status": "success",
-                }
-
-                self.logger.debug(
-                    f"Found {len(request_param_constraints)} parameter constraints"
-                )
-            else:
-                self.logger.debug("Skipping request parameter constraint mining")
-
-        except Exception as e:
-            self.logger.error(f"Error mining parameter constraints: {str(e)}")
-            mining_results["param_mining"] = {
-                "count": 0,
-                "status": "failed",
-                "error": str(e),
-            }
-
-        try:
-            # 2. Mine request body constraints
-            if mine_request_body:
-                self.logger.debug("Mining request body constraints")
-
-                body_input = RequestBodyConstraintMinerInput(
-                    endpoint_info=endpoint,
-                    include_examples=inp.include_examples,
-                    focus_on_schema=inp.include_schema_constraints,
-                )
-
-                body_output = await self.request_body_miner.execute(body_input)
-                request_body_constraints = body_output.body_constraints
-                mining_results["body_mining"] = {
-                    "count": len(request_body_constraints),
-                    "status": "success",
-                }
-
-                self.logger.debug(
-                    f"Found {len(request_body_constraints)} body constraints"
-                )
-            else:
-                self.logger.debug("Skipping request body constraint mining")
-
-        except Exception as e:
-            self.logger.error(f"Error mining body constraints: {str(e)}")
-            mining_results["body_mining"] = {
-                "count": 0,
-                "status": "failed",
-                "error": str(e),
-            }
-
-        try:
-            # 3. Mine response property constraints
-            if mine_response_property:
-                self.logger.debug("Mining response property constraints")
-
-                response_input = ResponsePropertyConstraintMinerInput(
-                    endpoint_info=endpoint,
-                    include_examples=inp.include_examples,
-                    analyze_structure=inp.include_schema_constraints,
-                )
-
-                response_output = await self.response_property_miner.execute(
-                    response_input
-                )
-                response_property_constraints = response_output.response_constraints
-                mining_results["response_mining"] = {
-                    "count": len(response_property_constraints),
-                    "status": "success",
-                }
-
-                self.logger.debug(
-                    f"Found {len(response_property_constraints)} response constraints"
-                )
-            else:
-                self.logger.debug("Skipping response property constraint mining")
-
-        except Exception as e:
-            self.logger.error(f"Error mining response constraints: {str(e)}")
-            mining_results["response_mining"] = {
-                "count": 0,
-                "status": "failed",
-                "error": str(e),
-            }
-
-        try:
-            # 4. Mine request-response correlation constraints
-            if mine_request_response and inp.include_correlation_constraints:
-                self.logger.debug("Mining request-response correlation constraints")
-
-                correlation_input = RequestResponseConstraintMinerInput(
-                    endpoint_info=endpoint,
-                    include_correlations=True,
-                    analyze_status_codes=True,
-                )
-
-                correlation_output = await self.request_response_miner.execute(
-                    correlation_input
-                )
-                request_response_constraints = (
-                    correlation_output.correlation_constraints
-                )
-                mining_results["correlation_mining"] = {
-                    "count": len(request_response_constraints),
-                    "status": "success",
-                }
-
-                self.logger.debug(
-                    f"Found {len(request_response_constraints)} correlation constraints"
-                )
-            else:
-                self.logger.debug(
-                    "Skipping correlation constraints (disabled or not requested)"
-                )
-                mining_results["correlation_mining"] = {
+        async def mine(
+            result_key: str,
+            label: str,
+            run: Callable[[], Awaitable[Any]],
+            extract: Callable[[Any], List],
+        ) -> List:
+            """Run one miner; a failure is recorded and leaves the others intact."""
+            self.logger.debug(f"Mining {label} constraints")
+            start_time = time.perf_counter()
+            try:
+                constraints = extract(await run())
+            except Exception as e:
+                self.logger.error(f"Error mining {label} constraints: {str(e)}")
+                mining_results[result_key] = {
                     "count": 0,
-                    "status": "skipped",
+                    "status": "failed",
+                    "error": str(e),
+                    "duration_seconds": round(time.perf_counter() - start_time, 3),
                 }
+                return []
 
-        except Exception as e:
-            self.logger.error(f"Error mining correlation constraints: {str(e)}")
+            mining_results[result_key] = {
+                "count": len(constraints),
+                "status": "success",
+                "duration_seconds": round(time.perf_counter() - start_time, 3),
+            }
+            self.logger.debug(f"Found {len(constraints)} {label} constraints")
+            return constraints
+
+        async def skipped() -> List:
+            return []
+
+        # The miners are independent LLM calls: run them concurrently. The number
+        # of LLM calls in flight is bounded by the shared limit in llm_utils.
+        if mine_request_param:
+            param_task = mine(
+                "param_mining",
+                "request parameter",
+                lambda: self.request_param_miner.execute(
+                    RequestParamConstraintMinerInput(
+                        endpoint_info=endpoint,
+                        include_examples=inp.include_examples,
+                        focus_on_validation=True,
+                    )
+                ),
+                lambda output: output.param_constraints,
+            )
+        else:
+            self.logger.debug("Skipping request parameter constraint mining")
+            param_task = skipped()
+
+        if mine_request_body:
+            body_task = mine(
+                "body_mining",
+                "request body",
+                lambda: self.request_body_miner.execute(
+                    RequestBodyConstraintMinerInput(
+                        endpoint_info=endpoint,
+                        include_examples=inp.include_examples,
+                        focus_on_schema=inp.include_schema_constraints,
+                    )
+                ),
+                lambda output: output.body_constraints,
+            )
+        else:
+            self.logger.debug("Skipping request body constraint mining")
+            body_task = skipped()
+
+        if mine_response_property:
+            response_task = mine(
+                "response_mining",
+                "response property",
+                lambda: self.response_property_miner.execute(
+                    ResponsePropertyConstraintMinerInput(
+                        endpoint_info=endpoint,
+                        include_examples=inp.include_examples,
+                        analyze_structure=inp.include_schema_constraints,
+                    )
+                ),
+                lambda output: output.response_constraints,
+            )
+        else:
+            self.logger.debug("Skipping response property constraint mining")
+            response_task = skipped()
+
+        if mine_request_response and inp.include_correlation_constraints:
+            correlation_task = mine(
+                "correlation_mining",
+                "request-response correlation",
+                lambda: self.request_response_miner.execute(
+                    RequestResponseConstraintMinerInput(
+                        endpoint_info=endpoint,
+                        include_correlations=True,
+                        analyze_status_codes=True,
+                    )
+                ),
+                lambda output: output.correlation_constraints,
+            )
+        else:
+            self.logger.debug(
+                "Skipping correlation constraints (disabled or not requested)"
+            )
             mining_results["correlation_mining"] = {
                 "count": 0,
-                "status": "failed",
-                "error": str(e),
+                "status": "skipped",
             }
+            correlation_task = skipped()
+
+        mining_start = time.perf_counter()
+        (
+            request_param_constraints,
+            request_body_constraints,
+            response_property_constraints,
+            request_response_constraints,
+        ) = await asyncio.gather(param_task, body_task, response_task, correlation_task)
+        mining_duration = round(time.perf_counter() - mining_start, 3)
 
         # Combine all constraints
         all_constraints = (
@@ -272,7 +246,8 @@ class StaticConstraintMinerTool(BaseTool):
         total_constraints = len(all_constraints)
 
         self.logger.info(
-            f"Constraint mining completed: {total_constraints} total constraints found"
+            f"Constraint mining completed: {total_constraints} total constraints found "
+            f"in {mining_duration}s"
         )
         self.logger.add_context(
             total_constraints=total_constraints,
@@ -295,6 +270,7 @@ class StaticConstraintMinerTool(BaseTool):
             "endpoint": f"{endpoint.method.upper()} {endpoint.path}",
             "total_constraints": total_constraints,
             "mining_results": mining_results,
+            "mining_duration_seconds": mining_duration,
             "status": "success",
             "constraint_breakdown": {
                 "request_param": len(request_param_constraints),
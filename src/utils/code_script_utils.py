@@ -6,8 +6,13 @@ This module provides functions to prepare validation scripts for execution
 by wrapping function definitions with execution code.
 """
 
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import CodeType
+from typing import Callable, Dict, Any, Optional
+import hashlib
 import re
+import threading
 from pydantic import BaseModel
 
 from common.logger import LoggerFactory, LoggerType, LogLevel
@@ -85,6 +90,106 @@ def extract_function_name(code: str) -> Optional[str]:
     return None
 
 
+@dataclass
+class CompiledValidation:
+    """A validation script compiled once and loaded into its own namespace."""
+
+    key: str
+    function_name: str
+    code: CodeType
+    func: Callable[..., Any]
+
+
+class ValidationScriptCache:
+    """
+    Bounded LRU cache of compiled validation functions keyed by a hash of the
+    script source, so identical scripts are parsed and compiled only once
+    across test cases and suites.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledValidation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(validation_code: str) -> str:
+        return hashlib.blake2b(
+            validation_code.encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def get(self, validation_code: str) -> CompiledValidation:
+        """
+        Return the compiled validation function for ``validation_code``.
+
+        Raises SyntaxError if the script does not compile and NameError if it
+        does not define the function it declares. Failures are not cached.
+        """
+        key = self.make_key(validation_code)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = _compile_validation(key, validation_code)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _compile_validation(key: str, validation_code: str) -> CompiledValidation:
+    function_name = extract_function_name(validation_code) or "validate"
+    code = compile(validation_code, f"<validation:{key[:8]}>", "exec")
+
+    # Script-level print() goes to the debug log instead of the shared stdout
+    namespace: Dict[str, Any] = {
+        "print": lambda *args, **kwargs: logger.debug(
+            " ".join(str(a) for a in args)
+        )
+    }
+    exec(code, namespace)
+
+    func = namespace.get(function_name)
+    if not callable(func):
+        raise NameError(f"Validation function '{function_name}' is not defined")
+    return CompiledValidation(key, function_name, code, func)
+
+
+_validation_cache = ValidationScriptCache()
+
+
+def get_validation_cache() -> ValidationScriptCache:
+    """Return the process-wide validation script cache."""
+    return _validation_cache
+
+
+def load_validation_function(validation_code: str) -> Callable[..., Any]:
+    """Compile (or fetch from cache) and return the validation function."""
+    return _validation_cache.get(validation_code).func
+
+
 def normalize_validation_script(script_code: str) -> str:
     """
     Normalize validation script to use correct response schema.
@@ -2,11 +2,15 @@
 
 """LLM utilities for the testing framework."""
 import asyncio
+import contextlib
 import json
 import re
+import threading
 import time
 import uuid
-from typing import Any, Dict, Optional, Type, TypeVar, Union
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
 from pathlib import Path
 import json
@@ -22,9 +26,17 @@ from google.adk.memory import InMemoryMemoryService
 from google.genai import types
 
 from config.settings import settings
-from config.constants import DEFAULT_LLM_TIMEOUT
+from config.constants import (
+    DEFAULT_LLM_TIMEOUT,
+    DEFAULT_LLM_RUNNER_THREADS,
+    DEFAULT_LLM_MAX_CONCURRENCY,
+    DEFAULT_LLM_EXECUTOR_POOL_SIZE,
+    DEFAULT_LLM_EXECUTOR_IDLE_TTL,
+)
 from common.logger import LoggerFactory, LoggerType, LogLevel
 from common.cache.cache_factory import CacheType, CacheFactory
+from common.cache.cache_keys import stable_hash
+from common.cache.cache_metrics import LatencyHistogram
 
 cache_logger = LoggerFactory.get_logger(
     name="llm.cache",
@@ -101,16 +113,8 @@ class LlmSession:
         self.session_service = InMemorySessionService()
         self.artifact_service = InMemoryArtifactService()
         self.memory_service = InMemoryMemoryService()
-        self.session_id = str(uuid.uuid4())
         self.user_id = "system"
-
-        # Initialize session
-        self.session_service.create_session(
-            app_name=app_name,
-            user_id=self.user_id,
-            session_id=self.session_id,
-            state={},
-        )
+        self._create_session()
 
         _general_logger.debug(f"Created LLM session for app: {app_name}")
         _general_logger.add_context(
@@ -119,6 +123,27 @@ class LlmSession:
             user_id=self.user_id,
         )
 
+    def _create_session(self):
+        self.session_id = str(uuid.uuid4())
+        self.session_service.create_session(
+            app_name=self.app_name,
+            user_id=self.user_id,
+            session_id=self.session_id,
+            state={},
+        )
+
+    def reset(self):
+        """Drop the conversation and start a new session on the same services."""
+        try:
+            self.session_service.delete_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=self.session_id,
+            )
+        except Exception as e:
+            _general_logger.debug(f"Failed to delete LLM session {self.session_id}: {e}")
+        self._create_session()
+
 
 def sanitize_instruction_for_adk(instruction: str) -> str:
     """
@@ -238,6 +263,103 @@ def extract_json_from_response(response_text: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+# Upper bounds in seconds for LLM latency histograms; +Inf is implicit
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+_llm_latency = {
+    "time_to_first_token": LatencyHistogram(LLM_LATENCY_BUCKETS),
+    "total": LatencyHistogram(LLM_LATENCY_BUCKETS),
+}
+
+
+def get_llm_latency_metrics() -> Dict[str, Any]:
+    """Time-to-first-token and total latency of LLM responses across all executors."""
+    return {name: histogram.to_dict() for name, histogram in _llm_latency.items()}
+
+
+# asyncio semaphores are bound to one event loop, so there is one per loop
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Shared limit on concurrent LLM executions (DEFAULT_LLM_MAX_CONCURRENCY)."""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(DEFAULT_LLM_MAX_CONCURRENCY)
+        _llm_semaphores[loop] = semaphore
+    return semaphore
+
+
+_runner_pool: Optional[ThreadPoolExecutor] = None
+_runner_pool_lock = threading.Lock()
+
+_STREAM_END = object()
+
+
+def _get_runner_pool() -> ThreadPoolExecutor:
+    """Bounded pool that drains synchronous runner iterators off the event loop."""
+    global _runner_pool
+    with _runner_pool_lock:
+        if _runner_pool is None:
+            _runner_pool = ThreadPoolExecutor(
+                max_workers=DEFAULT_LLM_RUNNER_THREADS,
+                thread_name_prefix="llm-runner",
+            )
+        return _runner_pool
+
+
+async def _iterate_in_thread(iterable):
+    """
+    Iterate a blocking iterable in the runner pool, yielding items as they arrive.
+
+    The event loop stays free while the iterator blocks; when the consumer stops
+    early (timeout, cancellation) the worker stops pulling further items.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+
+    def publish(item, error=None):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+        except RuntimeError:
+            stopped.set()  # event loop already closed
+
+    def pump():
+        try:
+            for item in iterable:
+                if stopped.is_set():
+                    break
+                publish(item)
+        except BaseException as e:
+            publish(_STREAM_END, e)
+            return
+        finally:
+            if stopped.is_set() and hasattr(iterable, "close"):
+                iterable.close()
+        publish(_STREAM_END)
+
+    loop.run_in_executor(_get_runner_pool(), pump)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _STREAM_END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def _event_texts(event) -> list:
+    """Text parts of a runner event."""
+    content = getattr(event, "content", None)
+    parts = getattr(content, "parts", None) if content else None
+    return [part.text for part in parts or () if getattr(part, "text", None)]
+
+
 class LlmExecutor:
     """Handles LLM agent execution with standardized error handling and retries."""
 
@@ -308,6 +430,11 @@ class LlmExecutor:
 
         self.logger.debug("LLM agent and runner created successfully")
 
+    def reset_session(self):
+        """Start a fresh session so the next call carries no previous turns."""
+        self.session.reset()
+        self.logger.add_context(session_id=self.session.session_id)
+
     async def execute(
         self, input_data: Union[str, Dict, BaseModel]
     ) -> Optional[Dict[str, Any]]:
@@ -455,55 +582,57 @@ class LlmExecutor:
         return None
 
     async def _get_llm_response(self, user_input: types.Content) -> Optional[str]:
-        """Get response from LLM with timeout protection."""
+        """
+        Get response from LLM with timeout protection.
+
+        Async runners are consumed directly and synchronous iterators are
+        drained in the runner thread pool, so the event loop is never blocked
+        and the timeout can always fire.
+        """
+        start_time = time.perf_counter()
+        first_token_time = None
 
         async def get_response():
+            nonlocal first_token_time
             try:
                 response_parts = []
 
-                # Check if the runner.run returns an async iterator or regular iterator
-                runner_result = self.runner.run(
-                    session_id=self.session.session_id,
-                    user_id=self.session.user_id,
-                    new_message=user_input,
-                )
+                def collect(event):
+                    nonlocal first_token_time
+                    for text in _event_texts(event):
+                        if first_token_time is None:
+                            first_token_time = time.perf_counter()
+                        response_parts.append(text)
+                        if self.verbose:
+                            self.logger.debug(
+                                f"LLM Response Part received ({len(text)} chars)"
+                            )
+
+                run_async = getattr(self.runner, "run_async", None)
+                if run_async is not None:
+                    runner_result = run_async(
+                        session_id=self.session.session_id,
+                        user_id=self.session.user_id,
+                        new_message=user_input,
+                    )
+                else:
+                    runner_result = self.runner.run(
+                        session_id=self.session.session_id,
+                        user_id=self.session.user_id,
+                        new_message=user_input,
+                    )
 
                 # Handle both async and sync iterators
                 if hasattr(runner_result, "__aiter__"):
-                    # Async iterator
                     async for event in runner_result:
-                        if hasattr(event, "content") and event.content:
-                            if hasattr(event.content, "parts"):
-                                for part in event.content.parts:
-                                    if hasattr(part, "text") and part.text:
-                                        response_parts.append(part.text)
-                                        if self.verbose:
-                                            self.logger.debug(
-                                                f"LLM Response Part received ({len(part.text)} chars)"
-                                            )
+                        collect(event)
                 elif hasattr(runner_result, "__iter__"):
-                    # Regular iterator - convert to async
-                    for event in runner_result:
-                        if hasattr(event, "content") and event.content:
-                            if hasattr(event.content, "parts"):
-                                for part in event.content.parts:
-                                    if hasattr(part, "text") and part.text:
-                                        response_parts.append(part.text)
-                                        if self.verbose:
-                                            self.logger.debug(
-                                                f"LLM Response Part received ({len(part.text)} chars)"
-                                            )
+                    # Regular iterator - drained off the event loop
+                    async for event in _iterate_in_thread(runner_result):
+                        collect(event)
                 else:
                     # Direct result
-                    if hasattr(runner_result, "content"):
-                        if hasattr(runner_result.content, "parts"):
-                            for part in runner_result.content.parts:
-                                if hasattr(part, "text") and part.text:
-                                    response_parts.append(part.text)
-                                    if self.verbose:
-                                        self.logger.debug(
-                                            f"LLM Response Part received ({len(part.text)} chars)"
-                                        )
+                    collect(runner_result)
 
                 full_response = "".join(response_parts) if response_parts else None
 
@@ -531,7 +660,14 @@ class LlmExecutor:
         try:
             result = await asyncio.wait_for(get_response(), timeout=self.timeout)
             if result:
-                self.logger.debug("LLM response received within timeout")
+                total = time.perf_counter() - start_time
+                ttft = first_token_time - start_time
+                _llm_latency["total"].observe(total)
+                _llm_latency["time_to_first_token"].observe(ttft)
+                self.logger.debug(
+                    f"LLM response received within timeout "
+                    f"(ttft={ttft:.2f}s, total={total:.2f}s)"
+                )
             return result
         except asyncio.TimeoutError:
             timeout_msg = f"LLM request timed out after {self.timeout} seconds"
@@ -543,6 +679,11 @@ class LlmExecutor:
                 agent_name=self.agent_name,
                 session_id=self.session.session_id,
                 timeout_seconds=self.timeout,
+                time_to_first_token=(
+                    round(first_token_time - start_time, 2)
+                    if first_token_time is not None
+                    else None
+                ),
                 error_type="timeout",
             )
 
@@ -551,35 +692,214 @@ class LlmExecutor:
             return None
 
 
+def _schema_name(schema: Optional[Type]) -> str:
+    return f"{schema.__module__}.{schema.__qualname__}" if schema else ""
+
+
+class LlmExecutorPool:
+    """
+    Keyed pool of reusable LlmExecutors.
+
+    Executors are keyed by app, agent name, instruction hash, schemas and
+    execution settings, so the agent, runner and services are built once per
+    configuration. A leased executor is used by one call at a time and gets a
+    fresh session on release. At most ``max_size`` executors are kept; idle
+    ones are evicted after ``idle_ttl`` seconds or, when the pool is full, in
+    least-recently-used order. If every pooled executor is leased, an extra
+    executor is built for the call and discarded afterwards.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_LLM_EXECUTOR_POOL_SIZE,
+        idle_ttl: float = DEFAULT_LLM_EXECUTOR_IDLE_TTL,
+    ):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        # key -> [(released_at, executor)], most recently released last
+        self._idle: Dict[str, List[Tuple[float, LlmExecutor]]] = {}
+        self._pooled = 0  # idle + leased executors owned by the pool
+        self._stats = {"created": 0, "reused": 0, "evicted": 0, "overflow": 0}
+
+    @staticmethod
+    def make_key(
+        app_name: str,
+        agent_name: str,
+        instruction: str,
+        input_schema: Optional[Type] = None,
+        output_schema: Optional[Type] = None,
+        **settings: Any,
+    ) -> str:
+        return stable_hash(
+            app_name,
+            agent_name,
+            stable_hash(instruction),
+            _schema_name(input_schema),
+            _schema_name(output_schema),
+            settings,
+        )
+
+    def _evict_expired(self, now: float) -> List[LlmExecutor]:
+        evicted = []
+        for key in list(self._idle):
+            entries = self._idle[key]
+            fresh = [entry for entry in entries if now - entry[0] < self.idle_ttl]
+            evicted.extend(executor for _, executor in entries[: len(entries) - len(fresh)])
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+        return evicted
+
+    def _evict_lru(self) -> Optional[LlmExecutor]:
+        oldest_key = min(self._idle, key=lambda k: self._idle[k][0][0], default=None)
+        if oldest_key is None:
+            return None
+        _, executor = self._idle[oldest_key].pop(0)
+        if not self._idle[oldest_key]:
+            del self._idle[oldest_key]
+        return executor
+
+    def _drop(self, evicted: List[LlmExecutor]):
+        # Called with the lock held
+        self._pooled -= len(evicted)
+        self._stats["evicted"] += len(evicted)
+
+    def acquire(
+        self,
+        app_name: str,
+        agent_name: str,
+        instruction: str,
+        input_schema: Optional[Type] = None,
+        output_schema: Optional[Type] = None,
+        **settings: Any,
+    ) -> Tuple[str, LlmExecutor, bool]:
+        """Lease an executor; returns (key, executor, pooled)."""
+        key = self.make_key(
+            app_name, agent_name, instruction, input_schema, output_schema, **settings
+        )
+        with self._lock:
+            self._drop(self._evict_expired(time.monotonic()))
+            entries = self._idle.get(key)
+            if entries:
+                _, executor = entries.pop()
+                if not entries:
+                    del self._idle[key]
+                self._stats["reused"] += 1
+                return key, executor, True
+
+            if self._pooled >= self.max_size:
+                lru = self._evict_lru()
+                if lru is not None:
+                    self._drop([lru])
+            pooled = self._pooled < self.max_size
+            if pooled:
+                self._pooled += 1
+            self._stats["created" if pooled else "overflow"] += 1
+
+        try:
+            executor = LlmExecutor(
+                session=LlmSession(app_name),
+                agent_name=agent_name,
+                instruction=instruction,
+                input_schema=input_schema,
+                output_schema=output_schema,
+                **settings,
+            )
+        except Exception:
+            if pooled:
+                with self._lock:
+                    self._pooled -= 1
+            raise
+        return key, executor, pooled
+
+    def release(self, key: str, executor: LlmExecutor, pooled: bool = True):
+        """Return a leased executor with a fresh session."""
+        if not pooled:
+            return
+        try:
+            executor.reset_session()
+        except Exception as e:
+            _general_logger.warning(f"Discarding LLM executor after failed session reset: {e}")
+            with self._lock:
+                self._drop([executor])
+            return
+        with self._lock:
+            self._idle.setdefault(key, []).append((time.monotonic(), executor))
+
+    @contextlib.contextmanager
+    def lease(self, *args: Any, **kwargs: Any):
+        """``with pool.lease(...) as executor:`` acquire and always release."""
+        key, executor, pooled = self.acquire(*args, **kwargs)
+        try:
+            yield executor
+        finally:
+            self.release(key, executor, pooled)
+
+    def clear(self):
+        """Drop all idle executors."""
+        with self._lock:
+            evicted = [executor for entries in self._idle.values() for _, executor in entries]
+            self._idle.clear()
+            self._drop(evicted)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._stats,
+                "pooled": self._pooled,
+                "idle": sum(len(entries) for entries in self._idle.values()),
+                "max_size": self.max_size,
+            }
+
+
+_executor_pool = LlmExecutorPool()
+
+
+def get_llm_executor_pool() -> LlmExecutorPool:
+    """Shared executor pool used by create_and_execute_llm_agent."""
+    return _executor_pool
+
+
 # Cache configuration constants
 CACHE_CONFIG = {
     "ttl": 3600,  # 1 hour
     "key_prefix": "llm_agent:",
     "cache_type": CacheType.REDIS,
     "enable_fallback": True,
+    # Small in-process LRU in front of the shared tier
+    "near_max_size": 512,
+    "near_ttl": 300,
+    "write_mode": "write-through",
 }
 
 
 def _get_cache_instance():
-    """Get or create cache instance with fallback to memory cache."""
+    """Get or create tiered cache instance with fallback to memory cache."""
     try:
         return CacheFactory.get_cache(
             name="llm_cache",
-            cache_type=CACHE_CONFIG["cache_type"],
-            **{k: v for k, v in CACHE_CONFIG.items() if k != "cache_type"},
+            cache_type=CacheType.TIERED,
+            far_type=CACHE_CONFIG["cache_type"],
+            far_options={"key_prefix": CACHE_CONFIG["key_prefix"]}
+            if CACHE_CONFIG["cache_type"] == CacheType.REDIS
+            else {},
+            near_max_size=CACHE_CONFIG["near_max_size"],
+            near_ttl=CACHE_CONFIG["near_ttl"],
+            write_mode=CACHE_CONFIG["write_mode"],
         )
     except Exception as e:
+        if not CACHE_CONFIG["enable_fallback"]:
+            raise
         _general_logger.warning(
             f"Failed to create {CACHE_CONFIG['cache_type'].value} cache, falling back to memory: {e}"
         )
         return CacheFactory.get_cache(
             name="llm_cache_fallback",
             cache_type=CacheType.MEMORY,
-            **{
-                k: v
-                for k, v in CACHE_CONFIG.items()
-                if k not in ["cache_type", "key_prefix"]
-            },
+            max_size=CACHE_CONFIG["near_max_size"],
+            default_ttl=CACHE_CONFIG["ttl"],
         )
 
 
@@ -605,29 +925,15 @@ def _generate_cache_key(
     Returns:
         Cache key string
     """
-    import hashlib
-
-    # Normalize input data to string
-    if isinstance(input_data, BaseModel):
-        input_str = input_data.model_dump_json(sort_keys=True)
-    elif isinstance(input_data, dict):
-        input_str = json.dumps(input_data, sort_keys=True)
-    else:
-        input_str = str(input_data)
-
-    # Create a deterministic cache key
-    cache_components = [
+    # Canonical JSON encoding of all parts, hashed with blake2b
+    cache_hash = stable_hash(
         app_name,
         agent_name,
         instruction,
-        input_str,
-        str(input_schema.__name__ if input_schema else ""),
-        str(output_schema.__name__ if output_schema else ""),
-    ]
-
-    # Create hash from components
-    cache_data = "|".join(cache_components)
-    cache_hash = hashlib.md5(cache_data.encode()).hexdigest()
+        input_data,
+        input_schema.__name__ if input_schema else "",
+        output_schema.__name__ if output_schema else "",
+    )
 
     cache_key = f"{CACHE_CONFIG['key_prefix']}{agent_name}:{cache_hash}"
 
@@ -647,6 +953,7 @@ async def create_and_execute_llm_agent(
     retry_delay: float = 1.0,
     verbose: bool = False,
     cache_enabled: bool = True,
+    reuse_executor: bool = True,
 ) -> Optional[Dict[str, Any]]:
     """
     Convenience function to create and execute an LLM agent in one call with caching support.
@@ -663,6 +970,8 @@ async def create_and_execute_llm_agent(
         retry_delay: Delay between retries
         verbose: Whether to print verbose output
         cache_enabled: Whether to enable caching
+        reuse_executor: Lease the agent/runner from the shared executor pool
+            instead of building new ones for this call
 
     Returns:
         Parsed JSON response from LLM or None if failed
@@ -715,24 +1024,37 @@ async def create_and_execute_llm_agent(
         logger.debug("Caching is disabled, proceeding without cache")
 
     try:
-        session = LlmSession(app_name)
-
         # Sanitize instruction to prevent path parameter conflicts
         sanitized_instruction = sanitize_instruction_for_adk(instruction)
 
-        executor = LlmExecutor(
-            session=session,
-            agent_name=agent_name,
-            instruction=sanitized_instruction,
-            input_schema=input_schema,
-            output_schema=output_schema,
+        executor_settings = dict(
             timeout=timeout,
             max_retries=max_retries,
             retry_delay=retry_delay,
             verbose=verbose,
         )
-
-        result = await executor.execute(input_data)
+        # Acquire the concurrency slot before leasing, so waiting calls hold no executor
+        async with get_llm_semaphore():
+            if reuse_executor:
+                with _executor_pool.lease(
+                    app_name,
+                    agent_name,
+                    sanitized_instruction,
+                    input_schema,
+                    output_schema,
+                    **executor_settings,
+                ) as executor:
+                    result = await executor.execute(input_data)
+            else:
+                executor = LlmExecutor(
+                    session=LlmSession(app_name),
+                    agent_name=agent_name,
+                    instruction=sanitized_instruction,
+                    input_schema=input_schema,
+                    output_schema=output_schema,
+                    **executor_settings,
+                )
+                result = await executor.execute(input_data)
 
         if result:
             logger.info("LLM agent execution completed successfully")
@@ -0,0 +1,402 @@
+# utils/script_execution_pool.py
+
+"""
+Worker pool for executing validation / generated Python scripts off the event loop.
+
+Two backends are available:
+- ``thread``: a pre-warmed ThreadPoolExecutor for trusted code. Cheap, shares
+  memory with the caller, but a timed-out script keeps running in its thread.
+- ``process``: a pre-warmed pool of forked worker processes for isolation.
+  Each worker is driven over its own pipe, so a timeout terminates only the
+  worker running that script and starts a replacement; other scripts keep
+  running. ``map_rows`` runs one function over many rows on a single worker
+  with the same per-row guarantee.
+
+Output is captured per invocation by injecting a private ``print`` into the
+script namespace, so concurrent scripts never interleave on sys.stdout.
+"""
+
+import asyncio
+import functools
+import inspect
+import io
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common.logger import LoggerFactory, LoggerType, LogLevel
+
+logger = LoggerFactory.get_logger(
+    name="utils.script_execution_pool",
+    logger_type=LoggerType.STANDARD,
+    level=LogLevel.INFO,
+)
+
+BACKENDS = ("thread", "process")
+
+
+@dataclass
+class ScriptResult:
+    """Outcome of a single script invocation, returned as plain values."""
+
+    success: bool
+    result: Any = None
+    error: Optional[str] = None
+    stdout: str = ""
+    stderr: str = ""
+    execution_time: float = 0.0
+    timed_out: bool = False
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def _make_print(buffer: io.StringIO):
+    """Build a print() that writes to ``buffer`` unless another file is given."""
+
+    def _print(*args, sep=" ", end="\n", file=None, flush=False):
+        print(*args, sep=sep, end=end, file=file if file is not None else buffer)
+
+    return _print
+
+
+def run_script(code: Any, context_vars: Optional[Dict[str, Any]] = None) -> ScriptResult:
+    """Execute ``code`` (source or code object) with ``context_vars``.
+
+    Mirrors the CodeExecutorTool semantics: the value of ``_result`` is used if
+    the script sets it, otherwise the first function defined by the script is
+    called with the context variables matching its parameter names.
+
+    This function is module-level so it can be shipped to worker processes.
+    """
+    context_vars = context_vars or {}
+    stdout = io.StringIO()
+    namespace: Dict[str, Any] = {**context_vars, "print": _make_print(stdout)}
+    start = time.perf_counter()
+
+    try:
+        compiled = code if not isinstance(code, str) else compile(code, "<string>", "exec")
+        exec(compiled, namespace)
+
+        result = namespace.get("_result", None)
+        if result is None:
+            functions = {
+                name: obj
+                for name, obj in namespace.items()
+                if callable(obj)
+                and name not in context_vars
+                and name != "print"
+                and not name.startswith("__")
+            }
+            if functions:
+                _, func = next(iter(functions.items()))
+                params = inspect.signature(func).parameters
+                args = {p: context_vars[p] for p in params if p in context_vars}
+                result = func(**args)
+
+        return ScriptResult(
+            success=True,
+            result=result,
+            stdout=stdout.getvalue(),
+            execution_time=time.perf_counter() - start,
+        )
+    except Exception as e:
+        return ScriptResult(
+            success=False,
+            error=str(e),
+            stdout=stdout.getvalue(),
+            stderr="".join(traceback.format_exception(type(e), e, e.__traceback__)),
+            execution_time=time.perf_counter() - start,
+        )
+
+
+def _run_script_in_process(code: str, context_vars: Optional[Dict[str, Any]]) -> ScriptResult:
+    """Process entry point: make sure the result can travel back to the parent."""
+    outcome = run_script(code, context_vars)
+    try:
+        pickle.dumps(outcome.result)
+    except Exception:
+        outcome.result = repr(outcome.result)
+    return outcome
+
+
+# Tags a map task: (_MAP, func, args, rows) -> one func(*args, row) result sent per row
+_MAP = "map"
+# Placeholder for a map_rows row that did not finish in time
+_TIMED_OUT = object()
+
+
+def _map_in_process(conn, func: Callable[..., Any], args: tuple, rows: List[Any]) -> None:
+    """Worker side of map_rows: send each row's result as soon as it is ready."""
+    for row in rows:
+        try:
+            outcome = func(*args, row)
+            pickle.dumps(outcome)
+        except Exception as e:
+            outcome = _RowError(f"{type(e).__name__}: {e}")
+        conn.send(outcome)
+
+
+def _worker_loop(conn) -> None:
+    """Worker process: run scripts received over ``conn`` until told to stop."""
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        if task[0] == _MAP:
+            _map_in_process(conn, *task[1:])
+        else:
+            conn.send(_run_script_in_process(*task))
+
+
+class _RowError(Exception):
+    """A map_rows function raised (or returned something unpicklable) in the worker."""
+
+
+class _WorkerCrashed(Exception):
+    """The worker process died while running a script."""
+
+
+class _WorkerProcess:
+    """One long-lived worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def run(self, code: str, context_vars: Optional[Dict[str, Any]], timeout: Optional[float]) -> Optional[ScriptResult]:
+        """Result of the script, or None if it did not finish within ``timeout``."""
+        self.conn.send((code, context_vars))  # pickling errors surface here
+        try:
+            if not self.conn.poll(timeout):
+                return None
+            return self.conn.recv()
+        except (EOFError, OSError) as e:
+            raise _WorkerCrashed(str(e) or "worker process exited") from e
+
+    def map(self, func: Callable[..., Any], args: tuple, rows: List[Any], timeout: Optional[float]) -> List[Any]:
+        """Results of the leading rows that finished, stopping at the first row exceeding ``timeout``."""
+        self.conn.send((_MAP, func, args, rows))
+        results: List[Any] = []
+        try:
+            for _ in rows:
+                if not self.conn.poll(timeout):
+                    break
+                results.append(self.conn.recv())
+        except (EOFError, OSError) as e:
+            raise _WorkerCrashed(str(e) or "worker process exited") from e
+        return results
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class ScriptExecutionPool:
+    """Pre-warmed executor for scripts with per-invocation timeout and output capture."""
+
+    def __init__(self, backend: str = "thread", max_workers: Optional[int] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown script execution backend: {backend}")
+        self.backend = backend
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers: "queue.Queue[_WorkerProcess]" = queue.Queue()
+        self._start()
+
+    def _start(self) -> None:
+        if self.backend == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="script-exec"
+            )
+            return
+        # One dispatch thread per worker process: a thread always finds an idle
+        # worker, and blocks on that worker's pipe instead of the event loop
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self._mp_context = multiprocessing.get_context(method)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="script-dispatch"
+        )
+        # Pre-warm so the first real script does not pay worker start-up
+        for _ in range(self.max_workers):
+            self._workers.put(_WorkerProcess(self._mp_context))
+
+    def _dispatch(
+        self, code: str, context_vars: Optional[Dict[str, Any]], timeout: Optional[float]
+    ) -> Optional[ScriptResult]:
+        """Run one script on an idle worker; a hung or crashed worker is replaced."""
+        worker = self._workers.get()
+        try:
+            outcome = worker.run(code, context_vars, timeout)
+        except _WorkerCrashed:
+            worker.kill()
+            worker = _WorkerProcess(self._mp_context)
+            raise
+        else:
+            if outcome is None:
+                worker.kill()
+                worker = _WorkerProcess(self._mp_context)
+            return outcome
+        finally:
+            self._workers.put(worker)
+
+    def _dispatch_map(
+        self, func: Callable[..., Any], args: tuple, rows: List[Any], timeout: Optional[float]
+    ) -> List[Any]:
+        """Run ``func`` over ``rows`` on one worker; a row that hangs yields _TIMED_OUT
+        and the remaining rows continue on a replacement worker."""
+        outcomes: List[Any] = []
+        worker = self._workers.get()
+        try:
+            while len(outcomes) < len(rows):
+                outcomes.extend(worker.map(func, args, rows[len(outcomes):], timeout))
+                if len(outcomes) < len(rows):
+                    outcomes.append(_TIMED_OUT)
+                    worker.kill()
+                    worker = _WorkerProcess(self._mp_context)
+            return outcomes
+        except _WorkerCrashed:
+            worker.kill()
+            worker = _WorkerProcess(self._mp_context)
+            raise
+        finally:
+            self._workers.put(worker)
+
+    async def run(
+        self,
+        code: str,
+        context_vars: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> ScriptResult:
+        """Run ``code`` in the pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        try:
+            if self.backend == "thread":
+                future = loop.run_in_executor(self._executor, run_script, code, context_vars)
+                outcome = await asyncio.wait_for(future, timeout=timeout)
+            else:
+                # The timeout covers the script run itself, not waiting for a worker
+                outcome = await loop.run_in_executor(
+                    self._executor, self._dispatch, code, context_vars, timeout
+                )
+                if outcome is None:
+                    logger.warning(f"Script timed out after {timeout}s, replacing its worker")
+                    raise asyncio.TimeoutError()
+            return outcome
+        except asyncio.TimeoutError:
+            if self.backend == "thread":
+                logger.warning(
+                    f"Script timed out after {timeout}s; thread backend cannot stop it"
+                )
+            return ScriptResult(
+                success=False,
+                error=f"Execution timed out after {timeout} seconds",
+                stderr=f"TimeoutError: Execution exceeded {timeout} seconds",
+                execution_time=time.perf_counter() - start,
+                timed_out=True,
+            )
+        except (_WorkerCrashed, pickle.PicklingError, TypeError, AttributeError) as e:
+            # Unpicklable context or a crashed worker
+            return ScriptResult(
+                success=False,
+                error=f"Script could not be executed in worker: {e}",
+                stderr=str(e),
+                execution_time=time.perf_counter() - start,
+            )
+
+    async def call(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Call an in-process callable (e.g. a cached validation function) in the pool.
+
+        Only the thread backend can run arbitrary callables; raises
+        asyncio.TimeoutError when ``timeout`` is exceeded.
+        """
+        if self.backend != "thread":
+            raise ValueError("call() requires the thread backend")
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args))
+        return await asyncio.wait_for(future, timeout=timeout)
+
+    async def map_rows(
+        self,
+        func: Callable[..., Any],
+        args: tuple,
+        rows: List[Any],
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[Any, bool]]:
+        """Call ``func(*args, row)`` for each row on a single worker process.
+
+        Returns (result, timed_out) per row. ``timeout`` applies to each row: a
+        hung row terminates its worker, which is replaced, and the remaining
+        rows still run. ``func`` must be a module-level (picklable) function;
+        raises RuntimeError if it raises or its result cannot be pickled.
+        Only the process backend can stop a hung row, so it is required here.
+        """
+        if self.backend != "process":
+            raise ValueError("map_rows() requires the process backend")
+        if not rows:
+            return []
+        loop = asyncio.get_running_loop()
+        outcomes = await loop.run_in_executor(
+            self._executor, self._dispatch_map, func, args, rows, timeout
+        )
+        timed_out = sum(1 for outcome in outcomes if outcome is _TIMED_OUT)
+        if timed_out:
+            logger.warning(f"{timed_out} row(s) timed out after {timeout}s, replaced their workers")
+        for outcome in outcomes:
+            if isinstance(outcome, _RowError):
+                raise RuntimeError(str(outcome))
+        return [
+            (None, True) if outcome is _TIMED_OUT else (outcome, False) for outcome in outcomes
+        ]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            while True:
+                try:
+                    self._workers.get_nowait().stop()
+                except queue.Empty:
+                    break
+
+
+_pools: Dict[tuple, ScriptExecutionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_script_pool(backend: str = "thread", max_workers: Optional[int] = None) -> ScriptExecutionPool:
+    """Return a process-wide shared pool for ``backend`` (created on first use)."""
+    key = (backend, max_workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ScriptExecutionPool(backend=backend, max_workers=max_workers)
+            _pools[key] = pool
+        return pool
@@ -0,0 +1,68 @@
+"""
+Tests for running AsyncSequenceRunner from inside a running event loop.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sequence_runner.async_runner import AsyncSequenceRunner
+
+
+class _FakeFiles:
+    def __init__(self, files):
+        self.files = files
+
+    def find_test_case_files(self, endpoint_filter=None):
+        return list(self.files)
+
+    def open_csv_output(self, service_name):
+        return "out"
+
+
+def _runner(files, waves):
+    runner = AsyncSequenceRunner.__new__(AsyncSequenceRunner)
+    runner.service_name = "svc"
+    runner.endpoint_filter = None
+    runner.max_concurrency = 4
+    runner.per_host_limit = 2
+    runner.file = _FakeFiles(files)
+    runner.http = type("Http", (), {"pool_stats": lambda self: {}})()
+    runner.ran = []
+    runner.plan_waves = lambda test_case_files: waves
+
+    async def run_test_case_async(test_case_file):
+        await asyncio.sleep(0)
+        runner.ran.append(test_case_file)
+        return True
+
+    runner.run_test_case_async = run_test_case_async
+    return runner
+
+
+def test_run_all_inside_running_loop():
+    files = [Path("a.json"), Path("b.json"), Path("c.json")]
+    runner = _runner(files, [files[:2], files[2:]])
+
+    async def handler():
+        # A sync caller inside an async route: asyncio.run() would raise here
+        return runner.run_all()
+
+    assert asyncio.run(handler()) == "out"
+    assert sorted(runner.ran[:2]) == files[:2]
+    assert runner.ran[2] == files[2]
+
+
+def test_run_all_async_awaited_in_running_loop():
+    files = [Path("a.json")]
+    runner = _runner(files, [files])
+
+    async def handler():
+        return await runner.run_all_async()
+
+    assert asyncio.run(handler()) == "out"
+    assert runner.ran == files
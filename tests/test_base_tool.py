@@ -0,0 +1,56 @@
+"""
+Regression tests for BaseTool result caching.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.in_memory_cache import InMemoryCache
+from core.base_tool import BaseTool
+from schemas.core import ToolInput, ToolOutput
+
+
+class ItemsInput(ToolInput):
+    count: int
+
+
+class ItemsOutput(ToolOutput):
+    items: List[str]
+
+
+class ItemsTool(BaseTool):
+    def __init__(self, cache):
+        super().__init__(
+            name="items",
+            description="Returns a list of items",
+            input_schema=ItemsInput,
+            output_schema=ItemsOutput,
+            cache_enabled=True,
+            cache=cache,
+        )
+        self.calls = 0
+
+    async def _execute(self, input_data: ItemsInput) -> ItemsOutput:
+        self.calls += 1
+        return ItemsOutput(items=[f"item{i}" for i in range(input_data.count)])
+
+
+def test_local_cache_hits_are_isolated_copies():
+    tool = ItemsTool(InMemoryCache(cleanup_interval=3600))
+
+    async def run():
+        first = await tool.execute({"count": 2})
+        first.items.append("changed by first caller")
+        second = await tool.execute({"count": 2})
+        second.items.clear()
+        return await tool.execute({"count": 2})
+
+    third = asyncio.run(run())
+    assert third.items == ["item0", "item1"]
+    assert tool.calls == 1
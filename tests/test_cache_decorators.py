@@ -0,0 +1,137 @@
+"""
+Regression tests for cache_result with stale-while-revalidate.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.decorators import cache_result
+from common.cache.in_memory_cache import InMemoryCache
+from common.cache.redis_cache import RedisCache
+
+
+class Answer(BaseModel):
+    text: str
+    score: float
+
+
+class JsonRoundTripCache(InMemoryCache):
+    """In-memory cache that stores values as the Redis JSON codec would"""
+
+    def set(self, key, value, ttl=None):
+        plain = json.loads(json.dumps(RedisCache._to_plain(value), default=str))
+        return super().set(key, plain, ttl)
+
+
+def _expected():
+    return Answer(text="ok", score=0.5).model_dump()
+
+
+def test_sync_swr_hit_matches_plain_hit():
+    calls = {"plain": 0, "swr": 0}
+    cache = JsonRoundTripCache(cleanup_interval=3600)
+
+    @cache_result(cache=cache, ttl=60, key_prefix="plain:")
+    def plain():
+        calls["plain"] += 1
+        return Answer(text="ok", score=0.5)
+
+    @cache_result(cache=cache, ttl=60, stale_while_revalidate=30, key_prefix="swr:")
+    def swr():
+        calls["swr"] += 1
+        return Answer(text="ok", score=0.5)
+
+    plain(), swr()
+    assert plain() == _expected()
+    assert swr() == _expected()
+    assert calls == {"plain": 1, "swr": 1}
+
+
+def test_async_swr_hit_matches_plain_hit():
+    calls = {"plain": 0, "swr": 0}
+    cache = JsonRoundTripCache(cleanup_interval=3600)
+
+    @cache_result(cache=cache, ttl=60, key_prefix="plain:")
+    async def plain():
+        calls["plain"] += 1
+        return Answer(text="ok", score=0.5)
+
+    @cache_result(cache=cache, ttl=60, stale_while_revalidate=30, key_prefix="swr:")
+    async def swr():
+        calls["swr"] += 1
+        return Answer(text="ok", score=0.5)
+
+    async def run():
+        await plain(), await swr()
+        return await plain(), await swr()
+
+    assert asyncio.run(run()) == (_expected(), _expected())
+    assert calls == {"plain": 1, "swr": 1}
+
+
+def test_sync_stale_result_is_served_and_refreshed():
+    calls = []
+    cache = InMemoryCache(cleanup_interval=3600)
+
+    @cache_result(cache=cache, ttl=1, stale_while_revalidate=60)
+    def compute():
+        calls.append(time.time())
+        return len(calls)
+
+    assert compute() == 1
+    assert compute() == 1  # fresh hit
+    time.sleep(1.1)
+    assert compute() == 1  # stale value served, refresh started
+    deadline = time.time() + 2
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(calls) == 2
+    assert cache.get(next(iter(cache.keys()))) == 2
+
+
+def test_async_stale_result_is_served_and_refreshed():
+    calls = []
+    cache = InMemoryCache(cleanup_interval=3600)
+
+    @cache_result(cache=cache, ttl=1, stale_while_revalidate=60)
+    async def compute():
+        calls.append(time.time())
+        return len(calls)
+
+    async def run():
+        first = await compute()
+        await asyncio.sleep(1.1)
+        stale = await compute()
+        await asyncio.sleep(0.05)  # let the background refresh finish
+        return first, stale, await compute()
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+
+def test_swr_hit_does_not_query_ttl():
+    ttl_queries = []
+
+    class CountingTtlCache(InMemoryCache):
+        def get_ttl(self, key):
+            ttl_queries.append(key)
+            return super().get_ttl(key)
+
+    cache = CountingTtlCache(cleanup_interval=3600)
+
+    @cache_result(cache=cache, ttl=60, stale_while_revalidate=30)
+    def compute():
+        return "v"
+
+    assert compute() == "v"
+    assert compute() == "v"
+    assert ttl_queries == []
+    assert compute.get_cache_info()["cached_entries"] == 1
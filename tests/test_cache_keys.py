@@ -0,0 +1,46 @@
+"""
+Regression tests for stable_hash key collisions.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.cache_keys import stable_hash
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.mark.parametrize(
+    "left, right",
+    [
+        ({1: "a"}, {"1": "a"}),
+        ({1: "a", "b": 2}, {"1": "a", "b": 2}),
+        ((1, 2), [1, 2]),
+        ({"x": (1,)}, {"x": [1]}),
+        ({"__set__": []}, set()),
+        ({"__obj__": stable_hash(Item(name="a"))}, Item(name="a")),
+        ({"__items__": []}, {}),
+    ],
+)
+def test_distinct_values_do_not_collide(left, right):
+    assert stable_hash(left) != stable_hash(right)
+
+
+def test_hash_is_order_independent():
+    assert stable_hash({1: "a", "b": 2}) == stable_hash({"b": 2, 1: "a"})
+    assert stable_hash({"__x": 1, "y": 2}) == stable_hash({"y": 2, "__x": 1})
+    assert stable_hash({1, 2, 3}) == stable_hash({3, 2, 1})
+
+
+def test_models_hash_by_value():
+    assert stable_hash(Item(name="a")) == stable_hash(Item(name="a"))
+    assert stable_hash(Item(name="a")) != stable_hash(Item(name="b"))
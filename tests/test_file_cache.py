@@ -0,0 +1,101 @@
+"""
+Regression tests for FileCache index upgrades and access-time batching.
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.file_cache import FileCache
+from common.cache.file_cache_index import FileCacheIndex
+
+
+def _write_legacy_file(cache_dir: Path, key: str, value) -> Path:
+    """A cache file as written before entries stored their key"""
+    cache = FileCache(cache_dir=str(cache_dir), cleanup_interval=3600)
+    file_path = Path(cache._make_filename(key))
+    cache._index.close()
+    (cache_dir / FileCache.INDEX_FILENAME).unlink()
+    for suffix in ("-wal", "-shm"):
+        Path(str(cache_dir / FileCache.INDEX_FILENAME) + suffix).unlink(missing_ok=True)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(
+        json.dumps(
+            {"value": value, "created_at": time.time(), "ttl": None, "expires_at": None}
+        )
+    )
+    return file_path
+
+
+def test_legacy_file_still_hits_after_upgrade(tmp_path):
+    _write_legacy_file(tmp_path, "llm_agent:abc", {"answer": 42})
+
+    cache = FileCache(cache_dir=str(tmp_path), cleanup_interval=3600)
+    assert cache.keys() == []
+    assert cache.get_memory_usage()["unindexed_legacy_files"] == 1
+    assert cache.get("llm_agent:abc") == {"answer": 42}
+    assert cache.keys() == ["llm_agent:abc"]
+    assert cache.get_memory_usage()["unindexed_legacy_files"] == 0
+
+    # Adoption survives a restart
+    reopened = FileCache(cache_dir=str(tmp_path), cleanup_interval=3600)
+    assert reopened.get("llm_agent:abc") == {"answer": 42}
+
+
+def test_path_keyed_rows_from_old_index_are_dropped(tmp_path):
+    file_path = _write_legacy_file(tmp_path, "llm_agent:abc", "cached")
+
+    cache = FileCache(cache_dir=str(tmp_path), cleanup_interval=3600)
+    rel_key = str(file_path.relative_to(tmp_path).with_suffix(""))
+    # Simulate an index built by the previous version
+    cache._index.upsert(rel_key, str(file_path), 10, time.time(), None)
+    cache._index.set_meta("version", 1)
+    cache._index.set_meta("legacy_files", 0)
+
+    reopened = FileCache(cache_dir=str(tmp_path), cleanup_interval=3600)
+    assert rel_key not in reopened.keys()
+    assert reopened.get("llm_agent:abc") == "cached"
+
+
+def test_hits_buffer_access_times(tmp_path):
+    cache = FileCache(cache_dir=str(tmp_path), cleanup_interval=3600)
+    cache.set("a", 1)
+    cache._last_touch_flush = time.monotonic()
+    before = cache._index.get("a").last_access
+    for _ in range(10):
+        assert cache.get("a") == 1
+    assert cache._index.get("a").last_access == before
+    assert "a" in cache._pending_touches
+
+
+def test_lru_eviction_sees_buffered_accesses(tmp_path):
+    cache = FileCache(cache_dir=str(tmp_path), cleanup_interval=3600, max_files=2)
+    cache.set("old", 1)
+    time.sleep(0.01)
+    cache.set("new", 2)
+    time.sleep(0.01)
+    cache._last_touch_flush = time.monotonic()
+    cache.get("old")  # buffered, not yet in the index
+    cache.set("third", 3)
+    assert cache.get("old") == 1
+    assert cache.get("new") is None
+
+
+def test_failed_batch_rolls_back_and_index_stays_usable(tmp_path):
+    index = FileCacheIndex(tmp_path / "index.db")
+    with pytest.raises(sqlite3.Error):
+        index.bulk_upsert([("a", "a.json", 1, 0.0, None, 0.0), ("b", "b.json")])
+    assert not index._conn.in_transaction
+    assert index.get("a") is None
+
+    index.bulk_upsert([("c", "c.json", 1, 0.0, None, 0.0)])
+    assert index.get("c") is not None
+    index.close()
@@ -0,0 +1,36 @@
+"""
+Regression tests for byte-budget eviction in the in-memory caches.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.in_memory_cache import InMemoryCache
+from common.cache.sharded_memory_cache import ShardedInMemoryCache
+
+
+def _make(cache_cls):
+    if cache_cls is ShardedInMemoryCache:
+        return ShardedInMemoryCache(max_bytes=3000, shards=1, cleanup_interval=3600)
+    return InMemoryCache(max_bytes=3000, cleanup_interval=3600)
+
+
+@pytest.mark.parametrize("cache_cls", [InMemoryCache, ShardedInMemoryCache])
+def test_overwrite_does_not_evict_unrelated_entry(cache_cls):
+    cache = _make(cache_cls)
+    cache.set("tiny", "t")  # oldest, but highest GDSF priority
+    cache.set("mid", "m" * 700)
+    cache.set("big", "b" * 1200)  # lowest priority
+
+    # Growing "big" needs room; the victim must be "mid", not the LRU-oldest
+    cache.set("big", "b" * 2000)
+    assert cache.get("big") == "b" * 2000
+    assert cache.get("tiny") == "t"
+    assert cache.get("mid") is None
+    assert cache.get_stats().evictions == 1
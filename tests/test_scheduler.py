@@ -0,0 +1,87 @@
+"""
+Tests for build_waves: dependency order, the delete barrier and fallbacks.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sequence_runner import models
+from sequence_runner.scheduler import build_waves
+
+
+def _case(endpoint, uses=None):
+    """A test case targeting ``endpoint``; ``uses`` is an endpoint whose output it reads."""
+    steps = []
+    if uses:
+        steps.append(models.StepModel(step_number=1, endpoint=uses, method=uses.split("-", 1)[0]))
+    steps.append(
+        models.StepModel(
+            step_number=len(steps) + 1,
+            endpoint=endpoint,
+            method=endpoint.split("-", 1)[0],
+            data_dependencies={"id": {"from_step": 1}} if uses else {},
+        )
+    )
+    return models.TestCaseCore(id=endpoint, name=endpoint, endpoint=endpoint, steps=steps)
+
+
+TOPOLIST = ["post-/pets", "get-/pets/{id}", "put-/pets/{id}", "delete-/pets/{id}"]
+
+
+def test_producer_runs_before_consumer():
+    create, read = Path("create.json"), Path("read.json")
+    waves = build_waves(
+        {read: _case("get-/pets/{id}", uses="post-/pets"), create: _case("post-/pets")},
+        TOPOLIST,
+    )
+    assert waves == [[create], [read]]
+
+
+def test_independent_cases_share_a_wave():
+    create, other = Path("create.json"), Path("other.json")
+    waves = build_waves(
+        {create: _case("post-/pets"), other: _case("post-/owners")},
+        TOPOLIST,
+    )
+    assert waves == [[create, other]]
+
+
+def test_deletes_run_after_every_other_case():
+    create = Path("create.json")
+    read = Path("read.json")
+    update = Path("update.json")
+    delete = Path("delete.json")
+    waves = build_waves(
+        {
+            delete: _case("delete-/pets/{id}"),
+            update: _case("put-/pets/{id}"),
+            read: _case("get-/pets/{id}", uses="post-/pets"),
+            create: _case("post-/pets"),
+        },
+        TOPOLIST,
+    )
+    assert waves[-1] == [delete]
+    assert sorted(p for wave in waves[:-1] for p in wave) == [create, read, update]
+
+
+def test_unparsed_cases_run_in_the_last_wave():
+    create, broken = Path("create.json"), Path("broken.json")
+    waves = build_waves({broken: None, create: _case("post-/pets")}, TOPOLIST)
+    assert waves == [[create], [broken]]
+
+
+def test_mutual_dependencies_keep_topolist_order():
+    pets, owners = Path("pets.json"), Path("owners.json")
+    waves = build_waves(
+        {
+            owners: _case("post-/owners", uses="post-/pets"),
+            pets: _case("post-/pets", uses="post-/owners"),
+        },
+        ["post-/pets", "post-/owners"],
+    )
+    # The back edge (owners -> pets) is dropped, so nothing is left unscheduled
+    assert waves == [[pets], [owners]]
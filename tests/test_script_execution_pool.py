@@ -0,0 +1,48 @@
+"""
+Regression tests for ScriptExecutionPool.map_rows per-row timeouts.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from utils.script_execution_pool import ScriptExecutionPool
+
+
+def _scale(factor, row):
+    if row == "hang":
+        time.sleep(30)
+    return row * factor
+
+
+def _fail(row):
+    raise ValueError(row)
+
+
+def test_hung_row_times_out_and_the_rest_of_the_shard_still_runs():
+    pool = ScriptExecutionPool("process", max_workers=1)
+    try:
+        start = time.perf_counter()
+        results = asyncio.run(pool.map_rows(_scale, (2,), [1, "hang", 3], timeout=0.5))
+        assert results == [(2, False), (None, True), (6, False)]
+        assert time.perf_counter() - start < 5
+        # The replacement worker keeps serving later batches
+        assert asyncio.run(pool.map_rows(_scale, (3,), [1], timeout=0.5)) == [(3, False)]
+    finally:
+        pool.shutdown()
+
+
+def test_row_errors_are_raised_in_the_caller():
+    pool = ScriptExecutionPool("process", max_workers=1)
+    try:
+        with pytest.raises(RuntimeError, match="ValueError"):
+            asyncio.run(pool.map_rows(_fail, (), ["boom"], timeout=5))
+    finally:
+        pool.shutdown()
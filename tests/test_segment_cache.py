@@ -0,0 +1,80 @@
+"""
+Regression tests for SegmentCache compaction.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.segment_cache import SegmentCache
+
+
+def _open(cache_dir):
+    return SegmentCache(
+        cache_dir=str(cache_dir), max_segment_bytes=256, cleanup_interval=3600
+    )
+
+
+def test_delete_compact_reopen_does_not_resurrect(tmp_path):
+    cache = _open(tmp_path)
+    cache.set("victim", "old value")
+    # Fill the first segment so the tombstone lands in a later, sealed one
+    for i in range(10):
+        cache.set(f"filler{i}", "x" * 40)
+    cache.delete("victim")
+    for i in range(10):
+        cache.set(f"after{i}", "y" * 40)
+
+    # Compact everything except the oldest segment, which still holds "victim"
+    oldest = min(cache._segments)
+    for seg_id in sorted(cache._segments):
+        if seg_id != oldest:
+            cache._segments[seg_id].live_bytes = 0
+    cache.compact()
+    cache.close()
+
+    reopened = _open(tmp_path)
+    assert reopened.get("victim") is None
+    assert reopened.get("filler0") == "x" * 40
+    reopened.close()
+
+
+def test_expired_value_dropped_by_compaction_stays_gone(tmp_path):
+    cache = _open(tmp_path)
+    cache.set("key", "permanent")
+    for i in range(10):
+        cache.set(f"filler{i}", "x" * 40)
+    cache.set("key", "short lived", ttl=1)
+    for i in range(10):
+        cache.set(f"after{i}", "y" * 40)
+
+    newer = cache._index["key"].segment
+    cache._index["key"].expires_at = 0.5  # already expired
+    cache._segments[newer].live_bytes = 0
+    cache.compact()
+    cache.close()
+
+    reopened = _open(tmp_path)
+    assert reopened.get("key") is None
+    reopened.close()
+
+
+def test_full_compaction_drops_tombstones(tmp_path):
+    cache = _open(tmp_path)
+    cache.set("victim", "old value")
+    for i in range(10):
+        cache.set(f"filler{i}", "x" * 40)
+    cache.delete("victim")
+    cache.set("tail", "z")
+
+    cache.compact(force=True)
+    assert cache.get("victim") is None
+    cache.close()
+
+    reopened = _open(tmp_path)
+    assert reopened.get("victim") is None
+    assert reopened.get("filler9") == "x" * 40
+    reopened.close()
@@ -0,0 +1,28 @@
+"""
+Regression tests for ShardedInMemoryCache capacity split.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.sharded_memory_cache import ShardedInMemoryCache
+
+
+def test_small_max_size_is_not_exceeded():
+    cache = ShardedInMemoryCache(max_size=10, shards=16, cleanup_interval=3600)
+    for i in range(100):
+        cache.set(f"k{i}", i)
+    assert sum(shard.max_size for shard in cache._shards) == 10
+    assert cache.get_size() <= 10
+    cache.close()
+
+
+def test_capacity_split_sums_to_max_size():
+    cache = ShardedInMemoryCache(max_size=100, shards=16, max_bytes=1000, cleanup_interval=3600)
+    assert sum(shard.max_size for shard in cache._shards) == 100
+    assert sum(shard.max_bytes for shard in cache._shards) == 1000
+    cache.close()
@@ -0,0 +1,85 @@
+"""
+Regression tests for TieredCache near-tier promotion.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from common.cache.in_memory_cache import InMemoryCache
+from common.cache.tiered_cache import TieredCache
+
+
+class CountingCache(InMemoryCache):
+    """Records the top-level calls a tier receives, as round trips to a remote far tier"""
+
+    def __init__(self):
+        super().__init__(cleanup_interval=3600)
+        self.calls = []
+
+    def get(self, key, default=None):
+        self.calls.append("get")
+        return super().get(key, default)
+
+    def get_ttl(self, key):
+        self.calls.append("get_ttl")
+        return super().get_ttl(key)
+
+    def get_many(self, keys, default=None):
+        self.calls.append("get_many")
+        return {key: super(CountingCache, self).get(key, default) for key in keys}
+
+    def get_many_with_ttl(self, keys, default=None):
+        self.calls.append("get_many_with_ttl")
+        values = {key: super(CountingCache, self).get(key, default) for key in keys}
+        return {key: (value, super(CountingCache, self).get_ttl(key)) for key, value in values.items()}
+
+    def set(self, key, value, ttl=None):
+        self.calls.append("set")
+        return super().set(key, value, ttl)
+
+    def set_many(self, mapping, ttl=None):
+        self.calls.append("set_many")
+        return all(super(CountingCache, self).set(key, value, ttl) for key, value in mapping.items())
+
+
+def _tiered(near=None, far=None):
+    near = near or InMemoryCache(cleanup_interval=3600)
+    far = far or InMemoryCache(cleanup_interval=3600)
+    return TieredCache(near, far, near_ttl=300), near, far
+
+
+def test_promotion_does_not_outlive_far_entry():
+    cache, near, far = _tiered()
+    far.set("k", "v", ttl=5)
+    assert cache.get("k") == "v"
+    assert near.get_ttl("k") <= 5
+
+
+def test_batch_promotion_does_not_outlive_far_entry():
+    cache, near, far = _tiered()
+    far.set("a", 1, ttl=5)
+    far.set("b", 2)
+    assert cache.get_many(["a", "b"]) == {"a": 1, "b": 2}
+    assert near.get_ttl("a") <= 5
+    assert 5 < near.get_ttl("b") <= 300
+
+
+def test_batch_promotion_uses_one_far_round_trip():
+    cache, near, far = _tiered(near=CountingCache(), far=CountingCache())
+    for i in range(10):
+        InMemoryCache.set(far, f"k{i}", i, ttl=600)
+    assert cache.get_many([f"k{i}" for i in range(10)]) == {f"k{i}": i for i in range(10)}
+    assert far.calls == ["get_many_with_ttl"]
+    assert near.calls == ["get_many", "set_many"]
+
+
+def test_single_get_uses_one_far_round_trip():
+    cache, near, far = _tiered(far=CountingCache())
+    InMemoryCache.set(far, "k", "v", ttl=5)
+    assert cache.get("k") == "v"
+    assert far.calls == ["get_many_with_ttl"]
+    assert near.get_ttl("k") <= 5